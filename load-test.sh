@@ -1,55 +1,24 @@
 #!/bin/bash
+# Load test the deployed API with the async load generator (src/tools/loadgen.py).
+#
+# Usage: ./load-test.sh [REQUESTS] [extra loadgen options...]
+#   ./load-test.sh 1000 --concurrency 32
+#   ./load-test.sh 0 --rate 200 --duration 60 --mix create=80,inbox=15,ack=5
+#
+# Set API_URL to target another deployment. For in-process runs against the ASGI app,
+# call `python -m src.tools.loadgen` directly without --url.
 
-API_URL="https://b6su7oge4f.execute-api.us-east-1.amazonaws.com/prod"
+API_URL=${API_URL:-"https://b6su7oge4f.execute-api.us-east-1.amazonaws.com/prod"}
 
-echo "🚀 Load Test - Creating Multiple Events"
+echo "🚀 Load Test - $API_URL"
 echo "========================================"
 echo ""
 
 COUNT=${1:-10}
-echo "Creating $COUNT events..."
+shift
 
-SUCCESS=0
-FAILED=0
-
-for i in $(seq 1 $COUNT); do
-    RESPONSE=$(curl -s -X POST "$API_URL/v1/events" \
-      -H "Content-Type: application/json" \
-      -d "{
-        \"trigger\": \"load.test\",
-        \"payload\": {
-          \"testNumber\": $i,
-          \"timestamp\": \"$(date -u +%Y-%m-%dT%H:%M:%SZ)\",
-          \"data\": \"Load test event $i\"
-        },
-        \"source\": \"load-test-script\"
-      }")
-    
-    EVENT_ID=$(echo "$RESPONSE" | python3 -c "import sys, json; d=json.load(sys.stdin); print(d.get('event_id', ''))" 2>/dev/null)
-    
-    if [ -n "$EVENT_ID" ] && [ "$EVENT_ID" != "null" ]; then
-        echo "✅ Event $i created: $EVENT_ID"
-        ((SUCCESS++))
-    else
-        echo "❌ Event $i failed: $RESPONSE"
-        ((FAILED++))
-    fi
-    
-    # Small delay to avoid rate limiting
-    sleep 0.1
-done
-
-echo ""
-echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-echo "📊 Load Test Results"
-echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
-echo "Success: $SUCCESS"
-echo "Failed: $FAILED"
-echo "Total: $COUNT"
-echo ""
-
-# Check inbox
-echo "Checking inbox..."
-INBOX=$(curl -s "$API_URL/v1/events/inbox?limit=100")
-TOTAL=$(echo "$INBOX" | python3 -c "import sys, json; d=json.load(sys.stdin); print(d.get('total', 0))" 2>/dev/null)
-echo "Total events in inbox: $TOTAL"
+if [ "$COUNT" -gt 0 ] 2>/dev/null; then
+    python3 -m src.tools.loadgen --url "$API_URL" --requests "$COUNT" --duration 0 "$@"
+else
+    python3 -m src.tools.loadgen --url "$API_URL" "$@"
+fi
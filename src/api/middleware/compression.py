@@ -0,0 +1,233 @@
+"""gzip / brotli response compression as pure ASGI middleware."""
+import zlib
+from typing import List, Optional, Sequence, Tuple
+
+import anyio
+
+try:  # brotli is optional; without it only gzip is offered
+    import brotli
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+Headers = List[Tuple[bytes, bytes]]
+
+
+def _gzip_compressor(level: int):
+    """Create a streaming gzip compressor."""
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def add_vary(headers: Headers) -> Headers:
+    """
+    Add Accept-Encoding to a response's Vary header.
+
+    Responses from compressible paths vary by Accept-Encoding whether or not
+    this one was compressed, so caches must not serve one variant for all.
+    """
+    varied = []
+    found = False
+    for name, value in headers:
+        if name == b"vary":
+            found = True
+            fields = [field.strip().lower() for field in value.split(b",")]
+            if b"accept-encoding" not in fields and b"*" not in fields:
+                value = value + b", Accept-Encoding"
+        varied.append((name, value))
+    if not found:
+        varied.append((b"vary", b"Accept-Encoding"))
+    return varied
+
+
+def choose_encoding(accept_encoding: str, brotli_available: bool = brotli is not None) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+
+    Prefers br over gzip at equal quality and ignores codings with q=0.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+        brotli_available: Whether the brotli module is installed
+
+    Returns:
+        "br", "gzip", or None for identity
+    """
+    offered = {"gzip": 0.0, "br": 0.0}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name == "*":
+            for coding in offered:
+                offered[coding] = max(offered[coding], quality)
+        elif name in offered:
+            offered[name] = quality
+    if not brotli_available:
+        offered["br"] = 0.0
+    best = max(("br", "gzip"), key=lambda coding: offered[coding])
+    return best if offered[best] > 0 else None
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies negotiated through Accept-Encoding.
+
+    Single-message bodies smaller than `minimum_size` are sent as-is, and
+    bodies of at least `offload_size` bytes are compressed in a worker thread
+    so large pages do not stall the event loop. Streaming responses are
+    compressed chunk by chunk. Every response on a compressible path carries
+    `Vary: Accept-Encoding`, compressed or not.
+    """
+
+    def __init__(
+        self,
+        app,
+        paths: Sequence[str] = ("/",),
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        offload_size: int = 65536,
+    ):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            paths: Path prefixes whose responses may be compressed
+            minimum_size: Smallest body worth compressing, in bytes
+            gzip_level: zlib compression level (1-9)
+            brotli_quality: brotli quality (0-11)
+            offload_size: Body size from which compression runs in a thread
+        """
+        self.app = app
+        self.paths = tuple(paths)
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.offload_size = offload_size
+
+    async def __call__(self, scope, receive, send):
+        """Handle an ASGI connection."""
+        if scope["type"] != "http" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+        accept = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept) if accept else None
+        if encoding is None:
+
+            async def send_with_vary(message):
+                """Pass the response through, adding Vary."""
+                if message["type"] == "http.response.start":
+                    message = {**message, "headers": add_vary(message.get("headers", []))}
+                await send(message)
+
+            await self.app(scope, receive, send_with_vary)
+            return
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        """Compress a complete body."""
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        compressor = _gzip_compressor(self.gzip_level)
+        return compressor.compress(body) + compressor.flush()
+
+
+class _CompressingResponder:
+    """ASGI `send` wrapper that compresses one response."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send):
+        """Initialize responder for a negotiated encoding."""
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message = None
+        self.passthrough = False
+        self.compressor = None
+
+    async def __call__(self, message):
+        """Intercept response messages."""
+        if message["type"] == "http.response.start":
+            message = {**message, "headers": add_vary(message.get("headers", []))}
+            headers = message["headers"]
+            status_code = message["status"]
+            if status_code < 200 or status_code in (204, 304) or any(
+                name == b"content-encoding" for name, _ in headers
+            ):
+                self.passthrough = True
+                await self.send(message)
+                return
+            self.start_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None and not more_body:
+            # Whole body in one message: compress it in one go if it is big enough
+            start, self.start_message = self.start_message, None
+            if len(body) < self.middleware.minimum_size:
+                await self.send(start)
+                await self.send(message)
+                return
+            if len(body) >= self.middleware.offload_size:
+                compressed = await anyio.to_thread.run_sync(
+                    self.middleware.compress, self.encoding, body
+                )
+            else:
+                compressed = self.middleware.compress(self.encoding, body)
+            await self.send(self._compressed_start(start, len(compressed)))
+            await self.send({"type": "http.response.body", "body": compressed})
+            return
+
+        if self.start_message is not None:
+            # Streaming response: switch to chunked, incremental compression
+            start, self.start_message = self.start_message, None
+            await self.send(self._compressed_start(start, None))
+            self.compressor = (
+                brotli.Compressor(quality=self.middleware.brotli_quality)
+                if self.encoding == "br"
+                else _gzip_compressor(self.middleware.gzip_level)
+            )
+
+        chunk = self._compress_chunk(body, finish=not more_body)
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _compress_chunk(self, body: bytes, finish: bool) -> bytes:
+        """Compress one streamed chunk, flushing so the client can decode it promptly."""
+        if self.encoding == "br":
+            data = self.compressor.process(body) if body else b""
+            return data + (self.compressor.finish() if finish else self.compressor.flush())
+        data = self.compressor.compress(body)
+        return data + self.compressor.flush(zlib.Z_FINISH if finish else zlib.Z_SYNC_FLUSH)
+
+    def _compressed_start(self, start, content_length: Optional[int]):
+        """Rewrite response headers for the compressed body."""
+        headers: Headers = [
+            (name, value)
+            for name, value in start.get("headers", [])
+            if name not in (b"content-length", b"etag")
+        ]
+        for name, value in start.get("headers", []):
+            if name == b"etag":
+                # A strong validator no longer matches the transformed bytes
+                etag = value if value.startswith(b"W/") else b"W/" + value
+                headers.append((b"etag", etag))
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+        return {**start, "headers": headers}
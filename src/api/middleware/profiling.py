@@ -0,0 +1,91 @@
+"""On-demand request profiling as pure ASGI middleware."""
+import hmac
+import logging
+import random
+from typing import Optional
+
+import anyio
+
+from src.core.profiling import MODES, RequestProfile
+
+logger = logging.getLogger(__name__)
+
+
+class ProfilingMiddleware:
+    """
+    Profile selected requests and write the results to a local directory.
+
+    A request is profiled when it sends `token` in the `header` header, or at
+    random with probability `sample_rate`. Profiled responses carry an
+    `X-Profile-Id` header naming the files written. Only added to the app
+    when profiling is enabled, so unprofiled deployments pay nothing.
+    """
+
+    def __init__(
+        self,
+        app,
+        directory: str,
+        mode: str = "sampling",
+        sample_rate: float = 0.0,
+        header: str = "X-Profile-Token",
+        token: Optional[str] = None,
+        interval_ms: float = 5.0,
+    ):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            directory: Directory profiles are written to
+            mode: "sampling" (collapsed stacks) or "cprofile" (pstats)
+            sample_rate: Fraction of requests profiled without the header
+            header: Request header carrying the profiling token
+            token: Secret that triggers profiling; header triggering is off when unset
+            interval_ms: Sampling interval in milliseconds
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.app = app
+        self.directory = directory
+        self.mode = mode
+        self.sample_rate = sample_rate
+        self.header = header.lower().encode("latin-1")
+        self.token = token.encode("latin-1") if token else None
+        self.interval_ms = interval_ms
+
+    def _selected(self, scope) -> bool:
+        """Decide whether to profile a request."""
+        if self.token is not None:
+            for name, value in scope.get("headers", []):
+                if name == self.header:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        """Handle an ASGI connection."""
+        if scope["type"] != "http" or not self._selected(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(f"{scope['method']} {scope['path']}", self.mode, self.interval_ms)
+        if not profile.start():
+            logger.info(f"Profiler busy; not profiling {profile.label}")
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile.id.encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profile.stop()
+            try:
+                paths = await anyio.to_thread.run_sync(profile.write, self.directory)
+                logger.info(f"Profiled {profile.label} in {profile.duration_ms:.1f}ms: {', '.join(paths)}")
+            except OSError as e:
+                logger.error(f"Failed to write profile {profile.id}: {e}")
@@ -0,0 +1,64 @@
+"""Request tracing as pure ASGI middleware."""
+from src.core.tracing import Tracer
+
+
+class TracingMiddleware:
+    """
+    Open a trace per HTTP request and return its traceparent.
+
+    An incoming W3C `traceparent` header is continued; the response carries a
+    `traceparent` naming the request's root span so callers can correlate.
+    """
+
+    def __init__(self, app, tracer: Tracer):
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            tracer: Tracer that samples and exports finished traces
+        """
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope, receive, send):
+        """Handle an ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        traceparent = None
+        for name, value in scope.get("headers", []):
+            if name == b"traceparent":
+                traceparent = value.decode("latin-1")
+                break
+        root = self.tracer.start_trace(
+            f"{scope['method']} {scope['path']}",
+            traceparent,
+            **{"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        status_code = 500
+
+        async def send_with_traceparent(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"traceparent", root.traceparent().encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, send_with_traceparent)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            route = scope.get("route")
+            if route is not None and getattr(route, "path", None):
+                root.name = f"{scope['method']} {route.path}"
+            root.set_attribute("http.status_code", status_code)
+            if error is None and status_code >= 500:
+                error = f"HTTP {status_code}"
+            self.tracer.finish_trace(root, error)
@@ -1,21 +1,125 @@
 """Event API routes."""
-from datetime import datetime
-from typing import Optional
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Literal, Optional
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
+from src.api.routing import InstrumentedRoute
 from src.core.config import settings
-from src.core.database import db
+from src.core.database import DEFAULT_CONSUMER, LeaseError, db, group_consumer
+from src.core.idempotency import resolve_idempotency_key
+from src.core.ids import timestamp_from_id
+from src.core.rate_limit import enforce_rate_limit, enforce_source_rate_limit
+from src.core.webhooks import dispatcher
 from src.models.event import (
     AcknowledgeResponse,
+    CheckpointRequest,
+    CheckpointResponse,
+    DeadLetterItem,
+    DeadLetterResponse,
+    EventItem,
     EventRequest,
     EventResponse,
     InboxResponse,
+    LeasedEventItem,
+    LeaseRequest,
+    LeaseResponse,
+    ReceiveRequest,
+    ReceiveResponse,
+    RedriveRequest,
+    RedriveResponse,
     StatsResponse,
     ErrorResponse,
 )
 
-router = APIRouter(prefix=f"{settings.api_v1_prefix}/events", tags=["events"])
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix=f"{settings.api_v1_prefix}/events",
+    tags=["events"],
+    dependencies=[Depends(enforce_rate_limit)],
+    route_class=InstrumentedRoute,
+)
+
+# Consumer group names end up in DynamoDB keys
+GROUP_PATTERN = r"^[A-Za-z0-9_.-]{1,64}$"
+
+
+def _group_query(description: str) -> Any:
+    """Declare the optional consumer group query parameter."""
+    return Query(None, pattern=GROUP_PATTERN, description=description)
+
+
+def _version_etag(*parts: Any) -> Optional[str]:
+    """
+    Build an ETag from the request parameters and the data version (see db.data_version).
+
+    It is known before reading, so a matching If-None-Match is answered
+    without querying DynamoDB.
+
+    Returns:
+        Weak ETag, or None if ETags are disabled
+    """
+    if not settings.etag_enabled:
+        return None
+    parts = (*parts, db.data_version())
+    digest = hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _parse_timestamp(value: Optional[str], name: str) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 query parameter.
+
+    Raises:
+        HTTPException: 400 if the value is not ISO 8601
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "validation_error",
+                "message": f"Invalid '{name}' timestamp format. Use ISO 8601 format.",
+            },
+        )
+
+
+def _to_event_item(event: Dict[str, Any]) -> EventItem:
+    """Convert a stored event into its API representation."""
+    return EventItem(
+        id=event["event_id"],  # Map event_id from DB to id field
+        timestamp=event["timestamp"],
+        payload=event["payload"],
+        source=event.get("source"),
+        tags=event.get("tags"),
+        group_key=event.get("group_key"),
+        priority=event.get("priority"),
+        status=event["status"],
+    )
+
+
+def _iso_from_ms(unix_ms: Any) -> str:
+    """Format an epoch-millisecond attribute as an ISO 8601 UTC timestamp."""
+    moment = datetime.fromtimestamp(int(unix_ms) / 1000, tz=timezone.utc)
+    return moment.replace(tzinfo=None).isoformat(timespec="milliseconds") + "Z"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison."""
+    if not if_none_match or not etag:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(
+        tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates
+    )
 
 
 @router.post(
@@ -24,15 +128,29 @@ router = APIRouter(prefix=f"{settings.api_v1_prefix}/events", tags=["events"])
     status_code=status.HTTP_201_CREATED,
     responses={
         400: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
     },
 )
-async def create_event(event_request: EventRequest) -> EventResponse:
+async def create_event(
+    event_request: EventRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias=settings.idempotency_header,
+        description="Client-chosen key; retries with the same key return the original event",
+    ),
+    api_key: Optional[str] = Header(None, alias=settings.api_key_header, include_in_schema=False),
+) -> EventResponse:
     """
     Ingest a new event.
 
-    Creates a new event with a unique ID and stores it in DynamoDB.
+    Creates a new event with a unique ID and stores it in DynamoDB. Requests
+    repeating an Idempotency-Key (or, for sources configured for content
+    hashing, an identical body) from the same API key within the dedup window
+    return the original event with status 200 instead of creating a second one.
     """
+    enforce_source_rate_limit(event_request.source)
     try:
         # Validate payload size (rough check)
         import json
@@ -48,14 +166,50 @@ async def create_event(event_request: EventRequest) -> EventResponse:
                 },
             )
 
-        # Create event in database
-        event = db.create_event(
+        dedup_key = resolve_idempotency_key(
+            idempotency_key,
             payload=event_request.payload,
             source=event_request.source,
             tags=event_request.tags,
             metadata=event_request.metadata,
+            api_key=api_key,
         )
+        if dedup_key:
+            event, created = await run_in_threadpool(
+                db.create_event_idempotent,
+                dedup_key,
+                payload=event_request.payload,
+                source=event_request.source,
+                tags=event_request.tags,
+                metadata=event_request.metadata,
+                group_key=event_request.group_key,
+                priority=event_request.priority,
+                deliver_after=event_request.deliver_after,
+            )
+            if not created:
+                response.status_code = status.HTTP_200_OK
+                response.headers["Idempotent-Replayed"] = "true"
+                return EventResponse(
+                    event_id=event["event_id"],
+                    status="duplicate",
+                    timestamp=event["timestamp"],
+                    message="Event already ingested",
+                )
+        else:
+            # Create event in database
+            event = await run_in_threadpool(
+                db.create_event,
+                payload=event_request.payload,
+                source=event_request.source,
+                tags=event_request.tags,
+                metadata=event_request.metadata,
+                group_key=event_request.group_key,
+                priority=event_request.priority,
+                deliver_after=event_request.deliver_after,
+            )
 
+        # Let webhook workers in this process push it without waiting out their poll
+        dispatcher.wake()
         return EventResponse(
             event_id=event["event_id"],
             status="created",
@@ -79,11 +233,14 @@ async def create_event(event_request: EventRequest) -> EventResponse:
     "/inbox",
     response_model=InboxResponse,
     responses={
+        304: {"description": "Inbox unchanged since the ETag in If-None-Match"},
         400: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
     },
 )
 async def get_inbox(
+    response: Response,
     limit: int = Query(
         default=settings.default_inbox_limit,
         ge=1,
@@ -93,59 +250,115 @@ async def get_inbox(
     offset: int = Query(default=0, ge=0, description="Pagination offset"),
     source: Optional[str] = Query(None, description="Filter by source"),
     since: Optional[str] = Query(None, description="ISO 8601 timestamp filter"),
+    cursor: Optional[str] = Query(
+        None, description="Return events older than this cursor (next_cursor or an event ID)"
+    ),
+    from_checkpoint: bool = Query(
+        False,
+        description=(
+            "Return events after the committed checkpoint, oldest first; cursor then pages forward"
+        ),
+    ),
+    group: Optional[str] = _group_query(
+        "Consumer group; returns the events it has not acknowledged"
+    ),
+    by_priority: bool = Query(
+        False, description="Drain higher priority lanes first (weighted), oldest first per lane"
+    ),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
 ) -> InboxResponse:
     """
     Retrieve undelivered events from inbox.
 
-    Returns pending events with optional filtering and pagination.
+    Returns pending events with optional filtering and pagination. Responses
+    carry an ETag derived from the parameters and the data version; sending it
+    back in If-None-Match returns 304 Not Modified, without reading DynamoDB,
+    until something is written (here, or within ETAG_TTL_SECONDS elsewhere).
+
+    With `from_checkpoint`, events up to the checkpoint committed through
+    `POST /v1/events/checkpoint` are treated as acknowledged and the rest are
+    returned oldest first.
+
+    With `group`, returns every event (whatever its status) that the consumer
+    group has neither checkpointed past nor acknowledged, oldest first;
+    `cursor` pages forward and `offset` is not supported.
+
+    With `by_priority`, the page is shared between the priority lanes by
+    weight, highest first; acknowledge and poll again instead of paging.
     """
+    etag = _version_etag(
+        "inbox", limit, offset, source, since, cursor, from_checkpoint, group, by_priority
+    )
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
     try:
         # Parse since timestamp if provided
-        since_dt = None
-        if since:
-            try:
-                since_dt = datetime.fromisoformat(since.replace("Z", "+00:00"))
-            except ValueError:
+        since_dt = _parse_timestamp(since, "since")
+
+        if group:
+            if offset:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail={
                         "error": "validation_error",
-                        "message": "Invalid 'since' timestamp format. Use ISO 8601 format.",
+                        "message": "'offset' is not supported with 'group'; use 'cursor'",
                     },
                 )
+            events, next_cursor = await run_in_threadpool(
+                db.get_group_events, group, limit, after=cursor, source=source, since=since_dt
+            )
+            if etag:
+                response.headers["ETag"] = etag
+            return InboxResponse(
+                events=[_to_event_item(event) for event in events],
+                total=len(events),
+                limit=limit,
+                offset=0,
+                next_cursor=next_cursor,
+            )
+
+        # Checkpoint mode reads forward from the later of the checkpoint and the cursor
+        after = None
+        if from_checkpoint:
+            checkpoint = await run_in_threadpool(db.get_checkpoint)
+            keys = [int(checkpoint["checkpoint_key"])] if checkpoint else []
+            if cursor:
+                keys.append(await run_in_threadpool(db.cursor_key, cursor))
+            after = str(max(keys)) if keys else None
+            cursor = None
 
-        # Get events from database
-        events, total = db.get_pending_events(
+        # Get events from database (off the event loop so identical polls can coalesce)
+        events, total, next_cursor = await run_in_threadpool(
+            db.get_pending_events,
             limit=limit,
             offset=offset,
             source=source,
             since=since_dt,
+            cursor=cursor,
+            after=after,
+            oldest_first=from_checkpoint,
+            by_priority=by_priority,
         )
-
         # Convert to response models
-        from src.models.event import EventItem
-        
-        event_items = [
-            EventItem(
-                id=event["event_id"],  # Map event_id from DB to id field
-                timestamp=event["timestamp"],
-                payload=event["payload"],
-                source=event.get("source"),
-                tags=event.get("tags"),
-                status=event["status"],
-            )
-            for event in events
-        ]
+        event_items = [_to_event_item(event) for event in events]
 
+        if etag:
+            response.headers["ETag"] = etag
         return InboxResponse(
             events=event_items,
             total=total,
             limit=limit,
             offset=offset,
+            next_cursor=next_cursor,
         )
 
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "validation_error", "message": f"Invalid 'cursor': {e}"},
+        ) from e
     except Exception as e:
         # Log the error for debugging
         import logging
@@ -162,28 +375,314 @@ async def get_inbox(
         )
 
 
+def _ndjson_lines(events: Iterator[Dict[str, Any]]) -> Iterator[str]:
+    """Serialize events one per line."""
+    try:
+        for event in events:
+            yield _to_event_item(event).model_dump_json() + "\n"
+    except Exception as e:
+        logger.error(f"Export aborted: {e}", exc_info=True)
+        raise
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {"application/x-ndjson": {}}, "description": "One event per line"},
+        400: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+    },
+)
+async def export_events(
+    status_filter: Optional[Literal["pending", "acknowledged", "dead_letter"]] = Query(
+        None,
+        alias="status",
+        description="Export one status (oldest first); omit to export the whole table",
+    ),
+    since: Optional[str] = Query(None, description="Inclusive ISO 8601 lower bound"),
+    until: Optional[str] = Query(None, description="Exclusive ISO 8601 upper bound"),
+    segments: int = Query(
+        default=1,
+        ge=1,
+        le=settings.export_max_scan_segments,
+        description="Parallel scan segments for whole-table exports",
+    ),
+) -> StreamingResponse:
+    """
+    Stream events as NDJSON.
+
+    With `status`, walks that partition of the status index page by page in
+    creation order. Without it, scans the whole table, optionally split into
+    parallel segments (output order is then unspecified). Memory use is
+    constant regardless of how many events are exported.
+    """
+    since_dt = _parse_timestamp(since, "since")
+    until_dt = _parse_timestamp(until, "until")
+    page_size = settings.export_page_size
+    if status_filter:
+        events = db.iter_events(status_filter, since=since_dt, until=until_dt, page_size=page_size)
+    else:
+        events = db.scan_events(
+            since=since_dt, until=until_dt, segments=segments, page_size=page_size
+        )
+    return StreamingResponse(_ndjson_lines(events), media_type="application/x-ndjson")
+
+
+@router.post(
+    "/receive",
+    response_model=ReceiveResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def receive_events(receive_request: ReceiveRequest) -> ReceiveResponse:
+    """
+    Receive pending events.
+
+    Atomically leases up to `max_events` pending events, oldest first. Leased
+    events are hidden from other receivers until the visibility timeout
+    passes or they are acknowledged; unacknowledged events become receivable
+    again when their lease expires. Leasing does not change the inbox.
+
+    With `mode` "ack", events are instead acknowledged in the same conditional
+    update that claims them (at-most-once delivery, no separate ack call).
+    """
+    visibility_timeout = (
+        receive_request.visibility_timeout or settings.receive_visibility_timeout_seconds
+    )
+    max_timeout = settings.receive_max_visibility_timeout_seconds
+    if visibility_timeout > max_timeout:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "validation_error",
+                "message": (
+                    f"visibility_timeout ({visibility_timeout}s) exceeds maximum ({max_timeout}s)"
+                ),
+            },
+        )
+    try:
+        if receive_request.mode == "ack":
+            events = await run_in_threadpool(
+                db.receive_and_acknowledge,
+                receive_request.max_events,
+                source=receive_request.source,
+            )
+        else:
+            events = await run_in_threadpool(
+                db.receive_events,
+                receive_request.max_events,
+                visibility_timeout,
+                source=receive_request.source,
+            )
+    except Exception as e:
+        logger.error(f"Error receiving events: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "internal_error", "message": "Failed to receive events"},
+        ) from e
+    return ReceiveResponse(
+        events=[
+            LeasedEventItem(
+                **_to_event_item(event).model_dump(),
+                lease_id=event.get("lease_id"),
+                leased_until=(
+                    _iso_from_ms(event["leased_until"]) if "leased_until" in event else None
+                ),
+                receive_count=int(event.get("receive_count", 1)),
+            )
+            for event in events
+        ]
+    )
+
+
+@router.post(
+    "/{event_id}/lease",
+    response_model=LeaseResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def extend_lease(event_id: str, lease_request: LeaseRequest) -> LeaseResponse:
+    """
+    Extend or release a lease.
+
+    Resets the lease to expire `visibility_timeout` seconds from now; a
+    timeout of 0 makes the event receivable again immediately. Fails with 409
+    once the lease has expired, since another receiver may hold the event.
+    """
+    max_timeout = settings.receive_max_visibility_timeout_seconds
+    if lease_request.visibility_timeout > max_timeout:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "validation_error",
+                "message": (
+                    f"visibility_timeout ({lease_request.visibility_timeout}s) "
+                    f"exceeds maximum ({max_timeout}s)"
+                ),
+            },
+        )
+    try:
+        event = await run_in_threadpool(
+            db.extend_lease, event_id, lease_request.lease_id, lease_request.visibility_timeout
+        )
+    except LeaseError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"error": "lease_conflict", "message": str(e)},
+        ) from e
+    except ValueError as e:
+        error_msg = str(e)
+        if "not found" in error_msg.lower():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"error": "not_found", "message": error_msg},
+            ) from e
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "validation_error", "message": error_msg},
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "internal_error", "message": "Failed to extend lease"},
+        ) from e
+    return LeaseResponse(
+        event_id=event_id,
+        lease_id=lease_request.lease_id,
+        leased_until=_iso_from_ms(event["leased_until"]),
+    )
+
+
+@router.get(
+    "/dead-letters",
+    response_model=DeadLetterResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def get_dead_letters(
+    limit: int = Query(50, ge=1, le=100, description="Maximum number of events to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    source: Optional[str] = Query(None, description="Filter by source"),
+) -> DeadLetterResponse:
+    """
+    List dead-lettered events, oldest first.
+
+    Events leased `MAX_RECEIVE_COUNT` times without being acknowledged are
+    moved out of the pending partition, so they no longer appear in the
+    inbox or receive. Redrive them once the downstream failure is fixed.
+    """
+    try:
+        events, next_cursor = await run_in_threadpool(db.get_dead_letters, limit, cursor, source)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "validation_error", "message": f"Invalid 'cursor': {e}"},
+        ) from e
+    except Exception as e:
+        logger.error(f"Error listing dead letters: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "internal_error", "message": "Failed to list dead letters"},
+        ) from e
+    return DeadLetterResponse(
+        events=[
+            DeadLetterItem(
+                **_to_event_item(event).model_dump(),
+                receive_count=int(event.get("receive_count", 0)),
+                dead_lettered_at=(
+                    _iso_from_ms(int(event["dead_lettered_at"]) * 1000)
+                    if "dead_lettered_at" in event
+                    else None
+                ),
+            )
+            for event in events
+        ],
+        limit=limit,
+        next_cursor=next_cursor,
+    )
+
+
+@router.post(
+    "/dead-letters/redrive",
+    response_model=RedriveResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def redrive_dead_letters(redrive_request: RedriveRequest) -> RedriveResponse:
+    """
+    Move dead-lettered events back to pending.
+
+    Redrives the given `event_ids`, or the oldest `max_events` dead letters
+    (optionally from one `source`). Redriven events get a fresh receive count
+    and return to their original place in delivery order.
+    """
+    try:
+        event_ids = await run_in_threadpool(
+            db.redrive_dead_letters,
+            redrive_request.event_ids,
+            redrive_request.max_events,
+            redrive_request.source,
+        )
+    except Exception as e:
+        logger.error(f"Error redriving dead letters: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "internal_error", "message": "Failed to redrive dead letters"},
+        ) from e
+    return RedriveResponse(redriven=len(event_ids), event_ids=event_ids)
+
+
 @router.post(
     "/{event_id}/ack",
     response_model=AcknowledgeResponse,
     responses={
         400: {"model": ErrorResponse},
         404: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
     },
 )
-async def acknowledge_event(event_id: str) -> AcknowledgeResponse:
+async def acknowledge_event(
+    event_id: str,
+    group: Optional[str] = _group_query("Consumer group acknowledging the event"),
+) -> AcknowledgeResponse:
     """
     Acknowledge receipt of an event.
 
     Updates the event status to 'acknowledged' and records the acknowledgment timestamp.
+    With `group`, records the acknowledgment for that consumer group only and
+    leaves the event untouched.
     """
     try:
+        if group:
+            await run_in_threadpool(db.acknowledge_group_event, event_id, group)
+            return AcknowledgeResponse(
+                event_id=event_id,
+                status="acknowledged",
+                message=f"Event acknowledged for group {group}",
+            )
+
         # Acknowledge event in database
-        updated_event = db.acknowledge_event(event_id)
+        updated_event = await run_in_threadpool(db.acknowledge_event, event_id)
 
         return AcknowledgeResponse(
-            event_id=event_id,
-            status="acknowledged",
+            event_id=updated_event["event_id"],
+            status=updated_event["status"],
             message="Event acknowledged successfully",
         )
 
@@ -205,25 +704,134 @@ async def acknowledge_event(event_id: str) -> AcknowledgeResponse:
         ) from e
 
 
+def _to_checkpoint_response(checkpoint: Dict[str, Any], advanced: bool) -> CheckpointResponse:
+    """Convert a stored checkpoint into its API representation."""
+    event_id = checkpoint["checkpoint_event_id"]
+    return CheckpointResponse(
+        event_id=event_id, timestamp=timestamp_from_id(event_id), advanced=advanced
+    )
+
+
+@router.post(
+    "/checkpoint",
+    response_model=CheckpointResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        404: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def commit_checkpoint(
+    checkpoint_request: CheckpointRequest,
+    group: Optional[str] = _group_query("Consumer group to commit for"),
+) -> CheckpointResponse:
+    """
+    Acknowledge every event up to and including an event ID.
+
+    Commits one checkpoint item instead of updating each event, so a batch
+    costs a single write. The inbox read with `from_checkpoint=true` starts
+    after it. Checkpoints only move forward; committing an older event
+    returns the current checkpoint with `advanced` false.
+
+    With `group`, commits that consumer group's checkpoint, moving it on over
+    any events the group acknowledged one by one right after it; read its
+    events with `GET /v1/events/inbox?group=...`.
+    """
+    try:
+        if group:
+            checkpoint, advanced = await run_in_threadpool(
+                db.commit_group_checkpoint, checkpoint_request.event_id, group
+            )
+        else:
+            checkpoint, advanced = await run_in_threadpool(
+                db.commit_checkpoint, checkpoint_request.event_id
+            )
+    except ValueError as e:
+        error_msg = str(e)
+        if "not found" in error_msg.lower():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail={"error": "not_found", "message": error_msg},
+            ) from e
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "validation_error", "message": error_msg},
+        ) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "internal_error", "message": "Failed to commit checkpoint"},
+        ) from e
+    return _to_checkpoint_response(checkpoint, advanced)
+
+
+@router.get(
+    "/checkpoint",
+    response_model=CheckpointResponse,
+    responses={
+        404: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def get_checkpoint(
+    group: Optional[str] = _group_query("Consumer group whose checkpoint to return"),
+) -> CheckpointResponse:
+    """Get the committed checkpoint."""
+    consumer = group_consumer(group) if group else DEFAULT_CONSUMER
+    try:
+        checkpoint = await run_in_threadpool(db.get_checkpoint, consumer)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "internal_error", "message": "Failed to get checkpoint"},
+        ) from e
+    if not checkpoint:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "not_found", "message": "No checkpoint has been committed"},
+        )
+    return _to_checkpoint_response(checkpoint, advanced=False)
+
+
 @router.get(
     "/stats",
     response_model=StatsResponse,
     responses={
+        304: {"description": "Statistics unchanged since the ETag in If-None-Match"},
+        429: {"model": ErrorResponse},
         500: {"model": ErrorResponse},
     },
 )
-async def get_stats() -> StatsResponse:
+async def get_stats(
+    response: Response,
+    group: Optional[str] = _group_query("Consumer group whose delivery state to count"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
+) -> StatsResponse:
     """
     Get event statistics.
 
-    Returns counts of pending, acknowledged, and total events.
+    Returns counts of pending, acknowledged, and total events, with the same
+    ETag / If-None-Match handling as the inbox. With `group`, pending and
+    acknowledged are counted from that consumer group's point of view.
     """
+    etag = _version_etag("stats", group)
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
     try:
         # Get stats from database
-        stats = db.get_event_stats()
+        if group:
+            stats = await run_in_threadpool(db.get_group_stats, group)
+        else:
+            stats = await run_in_threadpool(db.get_event_stats)
+        if etag:
+            response.headers["ETag"] = etag
         return StatsResponse(
             pending=stats.get("pending", 0),
             acknowledged=stats.get("acknowledged", 0),
+            scheduled=stats.get("scheduled", 0),
+            dead_letter=stats.get("dead_letter", 0),
             total=stats.get("total", 0),
         )
     except Exception as e:
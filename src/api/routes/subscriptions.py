@@ -0,0 +1,176 @@
+"""Webhook subscription API routes."""
+import logging
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+
+from src.api.routing import InstrumentedRoute
+from src.core.config import settings
+from src.core.database import db, subscription_filter, subscription_group
+from src.core.rate_limit import enforce_rate_limit
+from src.core.webhooks import dispatcher
+from src.models.event import ErrorResponse
+from src.models.subscription import (
+    SubscriptionListResponse,
+    SubscriptionRequest,
+    SubscriptionResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix=f"{settings.api_v1_prefix}/subscriptions",
+    tags=["subscriptions"],
+    dependencies=[Depends(enforce_rate_limit)],
+    route_class=InstrumentedRoute,
+)
+
+
+def _to_subscription_response(subscription: Dict[str, Any]) -> SubscriptionResponse:
+    """Convert a stored subscription into its API representation."""
+    subscription_id = subscription["subscription_id"]
+    return SubscriptionResponse(
+        subscription_id=subscription_id,
+        url=subscription["url"],
+        source=subscription.get("source"),
+        filter=subscription_filter(subscription),
+        batch_size=int(subscription["batch_size"]),
+        max_in_flight=int(subscription["max_in_flight"]),
+        group=subscription_group(subscription_id),
+        created_at=subscription["timestamp"],
+        delivery=dispatcher.metrics().get(subscription_id),
+    )
+
+
+@router.post(
+    "",
+    response_model=SubscriptionResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        400: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def create_subscription(subscription_request: SubscriptionRequest) -> SubscriptionResponse:
+    """
+    Register a webhook subscription.
+
+    Events created from now on (from `source`, if set) are POSTed to `url` in
+    batches by the webhook dispatcher (WEBHOOKS_ENABLED). A 2xx response
+    acknowledges the batch for the subscription's consumer group.
+
+    With a `filter`, only events matching it are pushed: each new event is
+    matched against every filter once, at ingest, through a compiled index.
+    """
+    try:
+        subscription = await run_in_threadpool(
+            db.create_subscription,
+            subscription_request.url,
+            subscription_request.source,
+            subscription_request.batch_size,
+            subscription_request.max_in_flight,
+            subscription_request.filter,
+        )
+        if dispatcher.running:
+            await dispatcher.refresh()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": "validation_error", "message": str(e)},
+        ) from e
+    except Exception as e:
+        logger.error(f"Error creating subscription: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "internal_error", "message": "Failed to create subscription"},
+        ) from e
+    return _to_subscription_response(subscription)
+
+
+@router.get(
+    "",
+    response_model=SubscriptionListResponse,
+    responses={
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def list_subscriptions() -> SubscriptionListResponse:
+    """List webhook subscriptions."""
+    try:
+        subscriptions = await run_in_threadpool(db.list_subscriptions)
+    except Exception as e:
+        logger.error(f"Error listing subscriptions: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "internal_error", "message": "Failed to list subscriptions"},
+        ) from e
+    return SubscriptionListResponse(
+        subscriptions=[_to_subscription_response(subscription) for subscription in subscriptions]
+    )
+
+
+@router.get(
+    "/{subscription_id}",
+    response_model=SubscriptionResponse,
+    responses={
+        404: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def get_subscription(subscription_id: str) -> SubscriptionResponse:
+    """
+    Get a webhook subscription.
+
+    Includes delivery metrics (throughput, POST latency and delivery lag
+    percentiles) when this process runs the subscription's worker.
+    """
+    try:
+        subscription = await run_in_threadpool(db.get_subscription, subscription_id)
+    except Exception as e:
+        logger.error(f"Error getting subscription: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "internal_error", "message": "Failed to get subscription"},
+        ) from e
+    if not subscription:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={
+                "error": "not_found",
+                "message": f"Subscription {subscription_id} not found",
+            },
+        )
+    return _to_subscription_response(subscription)
+
+
+@router.delete(
+    "/{subscription_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={
+        404: {"model": ErrorResponse},
+        429: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+)
+async def delete_subscription(subscription_id: str) -> Response:
+    """Delete a webhook subscription and stop pushing to it."""
+    try:
+        await run_in_threadpool(db.delete_subscription, subscription_id)
+        if dispatcher.running:
+            await dispatcher.refresh()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": "not_found", "message": str(e)},
+        ) from e
+    except Exception as e:
+        logger.error(f"Error deleting subscription: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": "internal_error", "message": "Failed to delete subscription"},
+        ) from e
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,136 @@
+"""Route class that instruments the phases of each request."""
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Optional
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.core import tracing
+from src.core.config import settings
+from src.core.timing import RequestTimings, collect_timings
+
+# Phases of the request handled in this context
+_phases: ContextVar[Optional["RequestPhases"]] = ContextVar("request_phases", default=None)
+
+
+class RequestPhases:
+    """
+    Phase boundaries of one request.
+
+    validate: request parsing, dependencies and validation, up to the endpoint
+    handler: the endpoint function
+    serialize: response model validation and rendering after the endpoint
+    """
+
+    def __init__(self):
+        """Start the validate phase."""
+        self.started = time.perf_counter()
+        self.endpoint_started: Optional[float] = None
+        self.endpoint_finished: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._span = tracing.start_span("validate")
+
+    def begin_endpoint(self) -> None:
+        """Mark the end of validation."""
+        self.endpoint_started = time.perf_counter()
+        if self._span is not None:
+            self._span.end()
+
+    def end_endpoint(self, failed: bool = False) -> None:
+        """Mark the start of serialization (there is none if the endpoint raised)."""
+        self.endpoint_finished = time.perf_counter()
+        self._span = None if failed else tracing.start_span("serialize")
+
+    def finish(self, error: Optional[str] = None) -> None:
+        """Mark the end of the request."""
+        self.finished = time.perf_counter()
+        if self._span is not None:
+            self._span.end(error)
+
+    def server_timing(self, timings: RequestTimings) -> str:
+        """
+        Render a Server-Timing header value.
+
+        Example:
+            validate;dur=0.41;desc="parse/validate", db;dur=5.02;desc="PutItem:1 UpdateItem:1",
+            handler;dur=5.37, serialize;dur=0.12, total;dur=5.93
+        """
+        end = self.finished or time.perf_counter()
+        endpoint_started = self.endpoint_started or end
+        endpoint_finished = self.endpoint_finished or end
+        db = f"db;dur={timings.db_ms:.2f}"
+        if timings.db_calls:
+            operations = " ".join(f"{operation}:{count}" for operation, count in sorted(timings.db_calls.items()))
+            db += f';desc="{operations}"'
+        return ", ".join(
+            [
+                f'validate;dur={(endpoint_started - self.started) * 1000:.2f};desc="parse/validate"',
+                db,
+                f"handler;dur={(endpoint_finished - endpoint_started) * 1000:.2f}",
+                f"serialize;dur={(end - endpoint_finished) * 1000:.2f}",
+                f"total;dur={(end - self.started) * 1000:.2f}",
+            ]
+        )
+
+
+def _instrument(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap an async endpoint so it marks its phase boundaries and runs in a "handler" span."""
+    if getattr(endpoint, "__instrumented__", False) or not inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def instrumented(*args: Any, **kwargs: Any) -> Any:
+        phases = _phases.get()
+        if phases is None:
+            return await endpoint(*args, **kwargs)
+        phases.begin_endpoint()
+        try:
+            with tracing.span("handler"):
+                result = await endpoint(*args, **kwargs)
+        except BaseException:
+            phases.end_endpoint(failed=True)
+            raise
+        phases.end_endpoint()
+        return result
+
+    instrumented.__instrumented__ = True  # type: ignore[attr-defined]
+    return instrumented
+
+
+class InstrumentedRoute(APIRoute):
+    """
+    APIRoute recording validate / handler / serialize phases.
+
+    Phases become spans when tracing and, with DynamoDB time from
+    DynamoDBClient, the response's Server-Timing header.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        """Initialize route around an instrumented endpoint."""
+        super().__init__(path, _instrument(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        """Wrap FastAPI's request handler with phase tracking."""
+        handler = super().get_route_handler()
+
+        async def instrumented_handler(request: Request) -> Response:
+            with collect_timings() as timings:
+                phases = RequestPhases()
+                token = _phases.set(phases)
+                try:
+                    response = await handler(request)
+                except Exception as e:
+                    phases.finish(type(e).__name__)
+                    raise
+                finally:
+                    _phases.reset(token)
+                phases.finish()
+            if settings.server_timing_enabled:
+                response.headers.append("Server-Timing", phases.server_timing(timings))
+            return response
+
+        return instrumented_handler
@@ -0,0 +1,91 @@
+"""In-process caches."""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a fixed time-to-live.
+
+    `generation` advances on every delete and clear. A reader that computes a
+    value from the backing store passes the generation it saw before reading
+    to `set`, which drops the value if an invalidation happened meanwhile.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries before the least recently used is evicted
+            ttl_seconds: Seconds an entry stays valid after it is set
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a live entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            generation: `generation` read before the value was computed; the
+                value is not stored if the cache was invalidated since
+        """
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        expires = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self.generation += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and size counters."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
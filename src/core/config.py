@@ -1,5 +1,5 @@
 """Application configuration."""
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -26,12 +26,76 @@ class Settings(BaseSettings):
     api_keys: List[str] = []  # In production, use Secrets Manager
 
     # Rate Limiting
+    rate_limit_enabled: bool = False  # Opt-in
     rate_limit_per_minute: int = 100
+    rate_limit_burst: Optional[int] = None  # Defaults to rate_limit_per_minute
+    rate_limit_per_source_per_minute: int = 0  # 0 disables per-source limiting
+    rate_limit_shared_memory: bool = False  # Share buckets across uvicorn workers
+    rate_limit_shared_memory_name: str = "zapier-triggers-ratelimit"
+    rate_limit_shared_memory_slots: int = 4096
+    rate_limit_trusted_proxies: int = 0  # Proxies appending to X-Forwarded-For in front of the app
 
     # Event Settings
     max_payload_size_kb: int = 256
     default_inbox_limit: int = 50
     max_inbox_limit: int = 100
+    inbox_cache_ttl_seconds: float = 1.0  # 0 disables the inbox page cache
+    inbox_cache_size: int = 1024
+    checkpoint_cache_ttl_seconds: float = 5.0  # How long pending reads reuse the default checkpoint
+    export_page_size: int = 500  # Items per DynamoDB page when exporting
+    export_max_scan_segments: int = 16
+    etag_enabled: bool = True  # ETag / If-None-Match on inbox and stats
+    etag_ttl_seconds: float = 2.0  # Longest an ETag outlives writes made by other workers
+    server_timing_enabled: bool = True  # Server-Timing header on /v1/events responses
+
+    # Response Compression
+    compression_enabled: bool = True
+    compression_paths: str = "/v1/events"  # Comma-separated path prefixes
+    compression_minimum_size: int = 1024  # Bytes
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_offload_size: int = 65536  # Compress in a worker thread from this size
+
+    # Idempotency
+    idempotency_header: str = "Idempotency-Key"
+    idempotency_ttl_seconds: int = 86400  # Lifetime of DynamoDB dedup records
+    idempotency_cache_size: int = 10000  # In-process LRU of recently seen keys
+    idempotency_hash_sources: str = ""  # Comma-separated sources deduped by content hash ("*" for all)
+
+    # Leased receive
+    receive_visibility_timeout_seconds: int = 30  # Default lease length for POST /v1/events/receive
+    receive_max_visibility_timeout_seconds: int = 43200  # 12 hours
+    receive_scan_limit: int = 1000  # Pending events examined per receive before giving up
+    priority_weights: str = "high:6,normal:3,low:1"  # Inbox page share of each priority lane
+    max_receive_count: int = 10  # Leases before an unacked event is dead-lettered (0 = never)
+    max_delivery_delay_seconds: int = 1209600  # Furthest ahead deliver_after may schedule an event
+
+    # Webhook push (the dispatcher runs in the app only when enabled)
+    webhooks_enabled: bool = False
+    webhook_poll_interval_seconds: float = 1.0  # Idle wait before re-reading a subscription
+    webhook_refresh_seconds: float = 30.0  # How often the subscription registry is re-read
+    webhook_timeout_seconds: float = 10.0  # Per-POST timeout
+    webhook_keepalive_seconds: float = 30.0  # Idle pooled connections are closed after this
+    webhook_max_attempts: int = 8  # POSTs per batch before it is retried from the next page
+    webhook_backoff_base_seconds: float = 0.5  # First retry waits up to this (full jitter)
+    webhook_backoff_max_seconds: float = 60.0  # Cap on the retry wait
+    webhook_lease_seconds: float = 30.0  # A subscription's dispatch lease; renewed every third
+    subscription_rules_ttl_seconds: float = 30.0  # How long the compiled filter index is reused
+
+    # Profiling (off unless enabled; then per request by token header or sampling)
+    profiling_enabled: bool = False
+    profiling_mode: str = "sampling"  # "sampling" (collapsed stacks) or "cprofile" (pstats)
+    profiling_sample_rate: float = 0.0  # Fraction of requests profiled without the header
+    profiling_header: str = "X-Profile-Token"
+    profiling_token: Optional[str] = None  # Requests sending this value in profiling_header are profiled
+    profiling_interval_ms: float = 5.0  # Stack sampling interval
+    profiling_dir: str = "/tmp/profiles"
+
+    # Tracing
+    tracing_enabled: bool = False
+    tracing_sink: str = "console"  # "console", "file:<path>" or "package.module:SinkClass"
+    tracing_slow_threshold_ms: float = 0.0  # Always keep slower traces; 0 tracks the rolling p99
+    tracing_fast_sample_rate: float = 0.01  # Fraction of other traces kept
 
     @property
     def cors_origins_list(self) -> List[str]:
@@ -42,6 +106,26 @@ class Settings(BaseSettings):
         origins = [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
         return origins if origins else ["*"]
 
+    @property
+    def compression_paths_list(self) -> List[str]:
+        """Parse COMPRESSION_PATHS string into a list."""
+        return [path.strip() for path in self.compression_paths.split(",") if path.strip()]
+
+    @property
+    def idempotency_hash_sources_list(self) -> List[str]:
+        """Parse IDEMPOTENCY_HASH_SOURCES string into a list."""
+        return [source.strip() for source in self.idempotency_hash_sources.split(",") if source.strip()]
+
+    @property
+    def priority_weights_map(self) -> Dict[str, int]:
+        """Parse PRIORITY_WEIGHTS ("lane:weight,...") into a dict."""
+        weights = {}
+        for entry in self.priority_weights.split(","):
+            lane, _, weight = entry.partition(":")
+            if lane.strip():
+                weights[lane.strip()] = int(weight or 1)
+        return weights
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -1,14 +1,135 @@
 """DynamoDB database client and operations."""
+import itertools
 import json
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
-from uuid import uuid4
+import logging
+import queue
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
 
 import boto3
 from boto3.dynamodb.conditions import Key, Attr
 from botocore.exceptions import ClientError
 
+from src.core.cache import TTLCache
 from src.core.config import settings
+from src.core.ids import (
+    new_event_id,
+    sort_key_at,
+    sort_key_ceiling,
+    sort_key_floor,
+    sort_key_from_id,
+    timestamp_from_id,
+)
+from src.core.matcher import RuleIndex, compile_pattern
+from src.core.singleflight import SingleFlight
+from src.core.timing import current_timings
+from src.core.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+# Checkpoint items are keyed by this prefix plus the consumer name
+CHECKPOINT_PREFIX = "checkpoint#"
+DEFAULT_CONSUMER = "default"
+
+# Lock items serializing delivery within a FIFO group are keyed by this prefix plus the group key
+FIFO_PREFIX = "fifo#"
+
+# Priority levels, highest first. Pending events sit in their level's partition of
+# `lane-created_at-index` (the `lane` attribute is removed when they leave pending)
+PRIORITIES = ("high", "normal", "low")
+LANE_INDEX = "lane-created_at-index"
+
+# Status of events leased MAX_RECEIVE_COUNT times without being acknowledged
+DEAD_LETTER_STATUS = "dead_letter"
+
+# Statuses an event passes through; consumer groups read all of them
+DELIVERED_STATUSES = ("pending", "acknowledged", DEAD_LETTER_STATUS)
+
+# Webhook subscriptions are keyed by this prefix plus their ID and listed from their
+# own partition of the status index
+SUBSCRIPTION_PREFIX = "subscription#"
+SUBSCRIPTION_STATUS = "subscription"
+
+# Entries written for subscriptions with a filter are keyed by this prefix plus the
+# subscription ID and event ID, in the subscription's own partition of the status index
+INBOX_PREFIX = "inbox#"
+
+# Dedup records of bulk-imported lines (see assign_import_ids)
+IMPORT_PREFIX = "import#"
+
+# Lease items naming the one process delivering a subscription's webhooks are keyed by
+# this prefix plus the subscription ID
+DISPATCH_PREFIX = "dispatch#"
+
+
+def group_consumer(group: str) -> str:
+    """Checkpoint consumer name for a consumer group."""
+    return f"group#{group}"
+
+
+def subscription_group(subscription_id: str) -> str:
+    """Consumer group a webhook subscription reads and acknowledges through."""
+    return f"webhook.{subscription_id}"
+
+
+def subscription_inbox_status(subscription_id: str) -> str:
+    """Status index partition holding a filtered subscription's inbox entries."""
+    return f"{INBOX_PREFIX}{subscription_id}"
+
+
+def subscription_filter(subscription: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Filter pattern of a subscription item, or None if it receives every event."""
+    pattern = subscription.get("filter_pattern")
+    return json.loads(pattern) if pattern else None
+
+
+def group_ack_status(group: str) -> str:
+    """Status index partition holding a consumer group's per-event ack records."""
+    return f"ack#{group}"
+
+# Matches pending events nobody holds a live lease on
+_UNLEASED = "(attribute_not_exists(leased_until) OR leased_until < :now)"
+
+
+class LeaseError(ValueError):
+    """Raised when a lease has expired or is held by another receiver."""
+
+
+def due_sort_key() -> int:
+    """
+    Largest `created_at` of an event that is due now.
+
+    Events scheduled with `deliver_after` get sort keys at their delivery
+    time; pending reads stop at this key so they stay hidden until due.
+    """
+    return sort_key_ceiling(datetime.now(timezone.utc))
+
+
+def _cursor_from(item: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Cursor resuming a read after an item (such as a query's LastEvaluatedKey)."""
+    return str(int(item["created_at"])) if item else None
+
+
+def _exhausted(item: Dict[str, Any]) -> bool:
+    """Whether a pending event has used up its deliveries (MAX_RECEIVE_COUNT, 0 = unlimited)."""
+    limit = settings.max_receive_count
+    return limit > 0 and int(item.get("receive_count", 0)) >= limit
+
+
+def _group_ack_record(group: str, event: Dict[str, Any]) -> Dict[str, Any]:
+    """Ack record of an event for a consumer group, sorted with the event."""
+    return {
+        "event_id": f"{group_ack_status(group)}#{event['event_id']}",
+        "status": group_ack_status(group),
+        "created_at": event["created_at"],
+        "acked_event_id": event["event_id"],
+        "acknowledged_at": int(datetime.utcnow().timestamp()),
+    }
 
 
 def convert_floats_to_strings(obj: Any) -> Any:
@@ -49,29 +170,114 @@ class DynamoDBClient:
         self.table = self.dynamodb.Table(settings.dynamodb_table_name)
         # Use table's meta client for queries with reserved keywords (has same config)
         self.dynamodb_client = self.table.meta.client
+        # Recently seen idempotency keys, answered without a DynamoDB call
+        self.idempotency_cache = TTLCache(
+            max_size=settings.idempotency_cache_size,
+            ttl_seconds=settings.idempotency_ttl_seconds,
+        )
+        # Identical concurrent reads share one DynamoDB query
+        self.inflight = SingleFlight()
+        # Short-lived inbox pages, cleared by writes made through this client
+        self.inbox_cache = TTLCache(
+            max_size=settings.inbox_cache_size,
+            ttl_seconds=settings.inbox_cache_ttl_seconds,
+        )
+        # Checkpoint sort keys pending reads start after, dropped by commit_checkpoint
+        self.checkpoint_cache = TTLCache(
+            max_size=64,
+            ttl_seconds=settings.checkpoint_cache_ttl_seconds,
+        )
+        # Bumped by notify_changed; see data_version
+        self._instance = uuid.uuid4().hex
+        self._generations = itertools.count(1)
+        self.data_generation = 0
+        # Filtered subscriptions compiled into a RuleIndex, with the monotonic time it was built
+        self._rules: Optional[Tuple[RuleIndex, float]] = None
+        self._rules_lock = threading.Lock()
+        self._rules_refreshing = False
+        # Compiled filters by pattern text, reused across rebuilds
+        self._compiled: Dict[str, Dict[str, FrozenSet[str]]] = {}
+        # Filter pattern text by subscription ID, as last indexed
+        self._patterns: Dict[str, str] = {}
+        # Time every DynamoDB call into the current request's Server-Timing
+        if settings.server_timing_enabled:
+            events = self.dynamodb.meta.client.meta.events
+            events.register_first("before-call.dynamodb", self._call_started, unique_id="server-timing-start")
+            events.register("after-call.dynamodb", self._call_finished, unique_id="server-timing-end")
+            events.register("after-call-error.dynamodb", self._call_finished, unique_id="server-timing-error")
 
-    def create_event(
+    @staticmethod
+    def _call_started(context: Dict[str, Any], **kwargs: Any) -> None:
+        """botocore hook: note when a DynamoDB call starts."""
+        context["server_timing_started"] = time.perf_counter()
+
+    @staticmethod
+    def _call_finished(model: Any, context: Dict[str, Any], **kwargs: Any) -> None:
+        """botocore hook: add a finished DynamoDB call to the request's timings."""
+        started = context.pop("server_timing_started", None)
+        timings = current_timings()
+        if started is not None and timings is not None:
+            timings.record_db_call(model.name, (time.perf_counter() - started) * 1000)
+
+    def notify_changed(self) -> None:
+        """Invalidate cached reads after a write made through this client."""
+        self.inbox_cache.clear()
+        self.data_generation = next(self._generations)
+
+    def data_version(self) -> Tuple[str, int, int]:
+        """
+        In-process version of the data reads return, for ETags.
+
+        Changes with every write made through this client, and at least every
+        ETAG_TTL_SECONDS, so writes made by other processes and scheduled
+        events falling due show up within that long. Versions of different
+        clients never compare equal.
+        """
+        ttl = settings.etag_ttl_seconds
+        epoch = int(time.time() // ttl) if ttl > 0 else time.time_ns()
+        return self._instance, self.data_generation, epoch
+
+    def build_event(
         self,
         payload: Dict[str, Any],
         source: Optional[str] = None,
         tags: Optional[List[str]] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        status: str = "pending",
+        group_key: Optional[str] = None,
+        priority: str = "normal",
+        deliver_after: Optional[datetime] = None,
     ) -> Dict[str, Any]:
         """
-        Create a new event in DynamoDB.
-
-        Args:
-            payload: Event payload data
-            source: Optional source identifier
-            tags: Optional list of tags
-            metadata: Optional additional metadata
+        Build a new event item ready to be written (pending unless told otherwise).
 
-        Returns:
-            Created event dictionary
+        The ID and `timestamp` record when the event was ingested. Its sort
+        key, `created_at`, is when it becomes available: for an event with a
+        future `deliver_after` that is the delivery time, so it takes its place
+        in delivery order and pending reads, bounded by `due_sort_key`, skip
+        it until then.
         """
-        event_id = str(uuid4())
-        timestamp = datetime.utcnow().isoformat() + "Z"
-        created_at = int(datetime.utcnow().timestamp())
+        if priority not in PRIORITIES:
+            raise ValueError(
+                f"Unknown priority {priority!r}; expected one of {', '.join(PRIORITIES)}"
+            )
+        delay = None
+        if deliver_after is not None:
+            if deliver_after.tzinfo is None:
+                deliver_after = deliver_after.replace(tzinfo=timezone.utc)
+            delay = deliver_after - datetime.now(timezone.utc)
+        if delay is not None and delay > timedelta(0):
+            if delay > timedelta(seconds=settings.max_delivery_delay_seconds):
+                raise ValueError(
+                    f"deliver_after is more than {settings.max_delivery_delay_seconds}s ahead"
+                )
+            event_id = new_event_id()
+            created_at = sort_key_at(deliver_after, event_id)
+        else:
+            event_id = new_event_id()
+            # Sort key derived from the ID: millisecond time plus a per-millisecond counter
+            created_at = sort_key_from_id(event_id)
+        timestamp = timestamp_from_id(event_id)
 
         # Convert floats to strings in payload and metadata for DynamoDB compatibility
         processed_payload = convert_floats_to_strings(payload)
@@ -81,9 +287,12 @@ class DynamoDBClient:
             "event_id": event_id,
             "timestamp": timestamp,
             "payload": processed_payload,
-            "status": "pending",
+            "status": status,
             "created_at": created_at,
+            "priority": priority,
         }
+        if status == "pending":
+            event["lane"] = priority
 
         if source:
             event["source"] = source
@@ -91,21 +300,398 @@ class DynamoDBClient:
             event["tags"] = tags
         if processed_metadata:
             event["metadata"] = processed_metadata
+        if group_key:
+            event["group_key"] = group_key
+        return event
 
+    def _put_event(self, event: Dict[str, Any]) -> Dict[str, Any]:
+        """Write a built event item to DynamoDB."""
         try:
             self.table.put_item(Item=event)
+            self.fan_out([event])
+            self.notify_changed()
             return event
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "")
             if error_code == "ResourceNotFoundException":
                 # Table doesn't exist - for development, we'll still return the event
                 # In production, this should raise an error
-                import logging
-                logger = logging.getLogger(__name__)
                 logger.warning(f"DynamoDB table not found. Event not persisted: {event['event_id']}")
                 return event
             raise Exception(f"Failed to create event: {str(e)}") from e
 
+    @traced("db.create_event")
+    def create_event(
+        self,
+        payload: Dict[str, Any],
+        source: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        group_key: Optional[str] = None,
+        priority: str = "normal",
+        deliver_after: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a new event in DynamoDB.
+
+        Args:
+            payload: Event payload data
+            source: Optional source identifier
+            tags: Optional list of tags
+            metadata: Optional additional metadata
+            group_key: Optional FIFO group; receive delivers a group's events in order
+            priority: Priority lane ("high", "normal" or "low")
+            deliver_after: Optional time before which the event is not delivered
+
+        Returns:
+            Created event dictionary
+
+        Raises:
+            ValueError: If the priority is unknown or deliver_after is too far away
+        """
+        event = self.build_event(
+            payload,
+            source,
+            tags,
+            metadata,
+            group_key=group_key,
+            priority=priority,
+            deliver_after=deliver_after,
+        )
+        return self._put_event(event)
+
+    @traced("db.batch_put_events")
+    def batch_put_events(self, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Write built event items with a single BatchWriteItem call.
+
+        Written events are fanned out to matching filtered subscriptions.
+
+        Args:
+            events: Up to 25 items from build_event
+
+        Returns:
+            Items DynamoDB left unprocessed (to be retried by the caller)
+
+        Raises:
+            ClientError: On throttling or other request failures
+        """
+        table_name = settings.dynamodb_table_name
+        response = self.dynamodb.batch_write_item(
+            RequestItems={table_name: [{"PutRequest": {"Item": event}} for event in events]}
+        )
+        unprocessed = [
+            request["PutRequest"]["Item"]
+            for request in response.get("UnprocessedItems", {}).get(table_name, [])
+        ]
+        skipped = {event["event_id"] for event in unprocessed}
+        self.fan_out([event for event in events if event["event_id"] not in skipped])
+        return unprocessed
+
+    @traced("db.assign_import_ids")
+    def assign_import_ids(
+        self, keys: List[str], events: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Make a batch of imported events safe to write again after a crash.
+
+        `keys` name each event's source record (`events[i]` was built from
+        `keys[i]`). An `import#<key>` record holding the event's ID is written
+        before the events are. A record already holding the ID of an event
+        that was written means the batch is being replayed: that event is
+        written again under its original ID and overwrites itself. Otherwise
+        the event keeps the ID it was built with, so it sorts at ingestion
+        time, behind no checkpoint committed in the meantime. Records expire
+        after IDEMPOTENCY_TTL_SECONDS.
+
+        Args:
+            keys: Dedup key of each event's source record
+            events: Up to 25 items from build_event
+
+        Returns:
+            The events to write, in the same order
+        """
+        records = {
+            item["event_id"]: item["target_event_id"]
+            for item in self._get_events([f"{IMPORT_PREFIX}{key}" for key in keys])
+        }
+        written = {
+            event["event_id"]: event for event in self._get_events(list(set(records.values())))
+        }
+        assigned: List[Dict[str, Any]] = []
+        new_records: List[Dict[str, Any]] = []
+        expires_at = int(time.time()) + settings.idempotency_ttl_seconds
+        for key, event in zip(keys, events):
+            original = written.get(records.get(f"{IMPORT_PREFIX}{key}", ""))
+            if original is not None:
+                event = {
+                    **event,
+                    "event_id": original["event_id"],
+                    "timestamp": original["timestamp"],
+                    "created_at": original["created_at"],
+                }
+            else:
+                new_records.append(
+                    {
+                        "event_id": f"{IMPORT_PREFIX}{key}",
+                        "target_event_id": event["event_id"],
+                        "expires_at": expires_at,
+                    }
+                )
+            assigned.append(event)
+        table_name = settings.dynamodb_table_name
+        requests = [{"PutRequest": {"Item": record}} for record in new_records]
+        for attempt in range(5):
+            if not requests:
+                break
+            response = self.dynamodb.batch_write_item(RequestItems={table_name: requests})
+            requests = response.get("UnprocessedItems", {}).get(table_name, [])
+            if requests:
+                time.sleep(random.uniform(0, 0.05 * 2**attempt))
+        if requests:
+            raise Exception(f"Failed to record {len(requests)} import keys")
+        return assigned
+
+    def subscription_rules(self) -> RuleIndex:
+        """
+        Filtered subscriptions compiled into a RuleIndex keyed by subscription ID.
+
+        Built by the first caller, then rebuilt from the registry in a
+        background thread once older than SUBSCRIPTION_RULES_TTL_SECONDS;
+        callers keep using the previous index meanwhile, so creates never wait
+        for a rebuild. Subscriptions created or deleted through this client
+        rebuild it at once. Subscriptions without a filter are not indexed:
+        they read the event partitions directly.
+        """
+        with self._rules_lock:
+            if self._rules is not None:
+                index, built = self._rules
+                stale = time.monotonic() - built >= settings.subscription_rules_ttl_seconds
+                if stale and not self._rules_refreshing:
+                    self._rules_refreshing = True
+                    threading.Thread(
+                        target=self._refresh_rules, name="subscription-rules", daemon=True
+                    ).start()
+                return index
+        return self._build_rules()
+
+    def _refresh_rules(self) -> None:
+        """Rebuild the rule index in the background, keeping the current one on failure."""
+        try:
+            self._build_rules()
+        except Exception as e:
+            logger.error(f"Failed to rebuild subscription filter index: {e}", exc_info=True)
+        finally:
+            with self._rules_lock:
+                self._rules_refreshing = False
+
+    def _build_rules(self) -> RuleIndex:
+        """
+        Compile the registry's filters into a RuleIndex and store it.
+
+        Compiled patterns are reused, and so is the index itself when no
+        filter changed. A build that started before the stored index was
+        built does not replace it.
+        """
+        started = time.monotonic()
+        patterns = {
+            subscription["subscription_id"]: subscription["filter_pattern"]
+            for subscription in self.list_subscriptions()
+            if subscription.get("filter_pattern")
+        }
+        with self._rules_lock:
+            current, indexed = self._rules, self._patterns
+        if current is not None and patterns == indexed:
+            index = current[0]
+        else:
+            compiled: Dict[str, Dict[str, FrozenSet[str]]] = {}
+            rules = {}
+            for subscription_id, text in patterns.items():
+                try:
+                    fields = self._compiled.get(text) or compile_pattern(json.loads(text))
+                except ValueError as e:
+                    logger.error(f"Ignoring filter of subscription {subscription_id}: {e}")
+                    continue
+                compiled[text] = rules[subscription_id] = fields
+            index = RuleIndex(rules)
+            self._compiled = compiled
+        with self._rules_lock:
+            if self._rules is not None and self._rules[1] > started:
+                return self._rules[0]
+            self._patterns = patterns
+            self._rules = (index, started)
+        return index
+
+    def _reload_rules(self) -> None:
+        """Rebuild the rule index after a subscription change made through this client."""
+        if self._rules is None:
+            return
+        try:
+            self._build_rules()
+        except Exception as e:
+            logger.error(f"Failed to rebuild subscription filter index: {e}", exc_info=True)
+            self._expire_rules()
+
+    def _expire_rules(self) -> None:
+        """Have the next subscription_rules call rebuild the index."""
+        with self._rules_lock:
+            if self._rules is not None:
+                self._rules = (self._rules[0], float("-inf"))
+
+    @traced("db.fan_out")
+    def fan_out(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Write an inbox entry for each filtered subscription each event matches.
+
+        Entries (`inbox#<subscription_id>#<event_id>`) hold only the event's ID
+        and sort key, so fan-out costs the same whatever the payload size, and
+        a subscription reads just the events its filter matched. They have no
+        expiry: entries are deleted once the subscription's checkpoint passes
+        them (see `commit_group_checkpoint`), or with the subscription.
+        Failures are logged, not raised: the events themselves are already
+        written.
+
+        Args:
+            events: Written event items
+
+        Returns:
+            Number of entries written
+        """
+        if not events:
+            return 0
+        try:
+            index = self.subscription_rules()
+            if not len(index):
+                return 0
+            entries = []
+            for event in events:
+                for subscription_id in sorted(index.match(event)):
+                    status = subscription_inbox_status(subscription_id)
+                    entries.append(
+                        {
+                            "event_id": f"{status}#{event['event_id']}",
+                            "status": status,
+                            "created_at": event["created_at"],
+                            "target_event_id": event["event_id"],
+                        }
+                    )
+            table_name = settings.dynamodb_table_name
+            for start in range(0, len(entries), 25):
+                requests = [{"PutRequest": {"Item": entry}} for entry in entries[start : start + 25]]
+                for attempt in range(5):
+                    response = self.dynamodb.batch_write_item(
+                        RequestItems={table_name: requests}
+                    )
+                    requests = response.get("UnprocessedItems", {}).get(table_name, [])
+                    if not requests:
+                        break
+                    time.sleep(random.uniform(0, 0.05 * 2**attempt))
+                if requests:
+                    logger.error(f"Dropped {len(requests)} subscription inbox entries")
+            return len(entries)
+        except Exception as e:
+            logger.error(f"Failed to fan out events to subscriptions: {e}", exc_info=True)
+            return 0
+
+    @traced("db.create_event_idempotent")
+    def create_event_idempotent(
+        self,
+        idempotency_key: str,
+        payload: Dict[str, Any],
+        source: Optional[str] = None,
+        tags: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        group_key: Optional[str] = None,
+        priority: str = "normal",
+        deliver_after: Optional[datetime] = None,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Create an event at most once per idempotency key.
+
+        A dedup record keyed by the idempotency key is claimed with a
+        conditional put before the event is written. The record expires after
+        IDEMPOTENCY_TTL_SECONDS (via the `expires_at` TTL attribute), and
+        recently seen keys are answered from an in-process LRU without a
+        DynamoDB call until then. A key whose record has expired or was
+        removed is claimed again and creates a new event.
+
+        Args:
+            idempotency_key: Deduplication key for the request
+            payload: Event payload data
+            source: Optional source identifier
+            tags: Optional list of tags
+            metadata: Optional additional metadata
+            group_key: Optional FIFO group
+            priority: Priority lane
+            deliver_after: Optional time before which the event is not delivered
+
+        Returns:
+            Tuple of (event, created). When created is False the event holds the
+            `event_id` and `timestamp` of the original event.
+        """
+        cached = self.idempotency_cache.get(idempotency_key)
+        if cached is not None:
+            if cached["expires_at"] > time.time():
+                return {"event_id": cached["event_id"], "timestamp": cached["timestamp"]}, False
+            self.idempotency_cache.delete(idempotency_key)
+
+        event = self.build_event(
+            payload,
+            source,
+            tags,
+            metadata,
+            group_key=group_key,
+            priority=priority,
+            deliver_after=deliver_after,
+        )
+        dedup_id = f"idempotency#{idempotency_key}"
+        # The record can vanish (expire, or be released by a failed create) between the
+        # conditional put failing and reading it; then the key is claimed again
+        for _ in range(3):
+            now = int(time.time())
+            expires_at = now + settings.idempotency_ttl_seconds
+            try:
+                self.table.put_item(
+                    Item={
+                        "event_id": dedup_id,
+                        "target_event_id": event["event_id"],
+                        "timestamp": event["timestamp"],
+                        "expires_at": expires_at,
+                    },
+                    ConditionExpression="attribute_not_exists(event_id) OR expires_at < :now",
+                    ExpressionAttributeValues={":now": now},
+                )
+                break
+            except ClientError as e:
+                error_code = e.response.get("Error", {}).get("Code", "")
+                if error_code == "ResourceNotFoundException":
+                    break
+                if error_code != "ConditionalCheckFailedException":
+                    raise Exception(f"Failed to create event: {str(e)}") from e
+            record = self.table.get_item(Key={"event_id": dedup_id}, ConsistentRead=True)
+            item = record.get("Item")
+            if item and item.get("target_event_id") and int(item["expires_at"]) >= now:
+                original = {"event_id": item["target_event_id"], "timestamp": item["timestamp"]}
+                self.idempotency_cache.set(
+                    idempotency_key, {**original, "expires_at": int(item["expires_at"])}
+                )
+                return original, False
+        else:
+            raise Exception(f"Failed to claim idempotency key {idempotency_key}")
+
+        try:
+            self._put_event(event)
+        except Exception:
+            # Release the claim so a retry of this request can succeed
+            self.table.delete_item(Key={"event_id": dedup_id})
+            raise
+        self.idempotency_cache.set(
+            idempotency_key,
+            {"event_id": event["event_id"], "timestamp": event["timestamp"], "expires_at": expires_at},
+        )
+        return event, True
+
+    @traced("db.get_event")
     def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
         """
         Get an event by ID.
@@ -125,29 +711,144 @@ class DynamoDBClient:
                 return None
             raise Exception(f"Failed to get event: {str(e)}") from e
 
+    def cursor_key(self, cursor: str) -> int:
+        """
+        Resolve a cursor to the sort key reads resume from.
+
+        Accepts `next_cursor` values, which are the stored `created_at` of the
+        last item a read evaluated, and event IDs, which are looked up; IDs
+        minted before time-ordered IDs (uuid4) work as long as the event exists.
+
+        Raises:
+            ValueError: If the cursor is neither, or names an unknown event
+        """
+        if cursor.isdigit():
+            return int(cursor)
+        try:
+            uuid.UUID(cursor)
+        except ValueError as e:
+            raise ValueError(f"{cursor!r} is not a cursor or event ID") from e
+        event = self.get_event(cursor)
+        if event and "payload" in event:
+            return int(event["created_at"])
+        try:
+            return sort_key_from_id(cursor)
+        except ValueError as e:
+            raise ValueError(f"Event {cursor} not found") from e
+
+    @staticmethod
+    def _add_sort_key_range(
+        query_kwargs: Dict[str, Any], lower: Optional[int], upper: Optional[int]
+    ) -> None:
+        """Narrow a status-created_at-index query to an inclusive created_at range."""
+        if lower is not None and upper is not None:
+            query_kwargs["KeyConditionExpression"] += " AND created_at BETWEEN :lower AND :upper"
+            query_kwargs["ExpressionAttributeValues"][":lower"] = lower
+            query_kwargs["ExpressionAttributeValues"][":upper"] = upper
+        elif lower is not None:
+            query_kwargs["KeyConditionExpression"] += " AND created_at >= :lower"
+            query_kwargs["ExpressionAttributeValues"][":lower"] = lower
+        elif upper is not None:
+            query_kwargs["KeyConditionExpression"] += " AND created_at <= :upper"
+            query_kwargs["ExpressionAttributeValues"][":upper"] = upper
+
+    @traced("db.get_pending_events")
     def get_pending_events(
         self,
         limit: int = 50,
         offset: int = 0,
         source: Optional[str] = None,
         since: Optional[datetime] = None,
-    ) -> Tuple[List[Dict[str, Any]], int]:
+        cursor: Optional[str] = None,
+        after: Optional[str] = None,
+        oldest_first: bool = False,
+        by_priority: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
         """
         Get pending events from inbox.
 
+        With `by_priority`, events come from the priority lanes instead (see
+        `_query_priority_lanes`); `offset`, `cursor`, `after` and
+        `oldest_first` do not apply, and there is no next cursor.
+
         Args:
             limit: Maximum number of events to return
             source: Optional source filter
             since: Optional timestamp filter
             offset: Pagination offset
+            cursor: Optional cursor (see cursor_key); only older events are returned
+            after: Optional cursor; only newer events are returned
+            oldest_first: Return events oldest first instead of newest first
+            by_priority: Drain higher priority lanes first
 
         Returns:
-            Tuple of (events list, total count)
+            Tuple of (events list, total count, cursor for the next page or None).
+            The cursor is set whenever the query stopped before the end of the
+            range, even if the source filter left the page short.
+
+        Raises:
+            ValueError: If the cursor or after value is not a cursor or known event ID
         """
+        # Validate the cursors before the broad error handling below swallows them
+        cursor_key = self.cursor_key(cursor) if cursor else None
+        after_key = self.cursor_key(after) if after else None
+        cache_key = (
+            limit,
+            offset,
+            cursor,
+            after,
+            oldest_first,
+            by_priority,
+            source,
+            since.isoformat() if since else None,
+        )
+        # Reads started before a write must neither be joined nor cached after it
+        generation = self.inbox_cache.generation
+        cached = self.inbox_cache.get(cache_key)
+        if cached is not None:
+            return list(cached[0]), cached[1], cached[2]
+        if by_priority:
+            events, total = self.inflight.do(
+                ("priority_lanes", generation) + cache_key,
+                self._query_priority_lanes,
+                limit,
+                source,
+                since,
+                cache_key,
+                generation,
+            )
+            return list(events), total, None
+        events, total, next_cursor = self.inflight.do(
+            ("pending_events", generation) + cache_key,
+            self._query_pending_events,
+            limit,
+            offset,
+            source,
+            since,
+            cursor_key,
+            after_key,
+            oldest_first,
+            cache_key,
+            generation,
+        )
+        return list(events), total, next_cursor
+
+    def _query_pending_events(
+        self,
+        limit: int,
+        offset: int,
+        source: Optional[str],
+        since: Optional[datetime],
+        cursor_key: Optional[int],
+        after_key: Optional[int],
+        oldest_first: bool,
+        cache_key: Tuple[Any, ...],
+        generation: int,
+    ) -> Tuple[List[Dict[str, Any]], int, Optional[str]]:
+        """Run the pending-events GSI query behind get_pending_events."""
         try:
             # Query GSI for pending events
             gsi_name = "status-created_at-index"
-            from boto3.dynamodb.conditions import Attr
 
             # Use resource API with string-based KeyConditionExpression for reserved keyword
             # Build query using table.query() with string expression
@@ -157,26 +858,31 @@ class DynamoDBClient:
                 "ExpressionAttributeNames": {"#status": "status"},
                 "ExpressionAttributeValues": {":pending_status": "pending"},
                 "Limit": limit + offset,
-                "ScanIndexForward": False,
+                "ScanIndexForward": oldest_first,
             }
 
+            # Seek on the sort key for the checkpoint, cursor and timestamp filters
+            lower = self._pending_floor()
+            if since:
+                lower = max(lower, sort_key_floor(since))
+            if after_key is not None:
+                lower = max(lower, after_key + 1)
+            upper = due_sort_key()
+            if cursor_key is not None:
+                upper = min(upper, cursor_key - 1)
+            if lower is not None and lower > upper:
+                return [], 0, None
+            self._add_sort_key_range(query_kwargs, lower, upper)
+
             # Apply source filter if provided
             if source:
                 query_kwargs["FilterExpression"] = Attr("source").eq(source)
 
-            # Apply timestamp filter if provided
-            if since:
-                since_timestamp = int(since.timestamp())
-                if "FilterExpression" in query_kwargs:
-                    query_kwargs["FilterExpression"] = (
-                        query_kwargs["FilterExpression"] & Attr("created_at").gte(since_timestamp)
-                    )
-                else:
-                    query_kwargs["FilterExpression"] = Attr("created_at").gte(since_timestamp)
-
             response = self.table.query(**query_kwargs)
             events = response.get("Items", [])
             total = response.get("Count", 0)
+            # Resume after the last item evaluated, which the filter may have dropped
+            next_cursor = _cursor_from(response.get("LastEvaluatedKey"))
 
             # Apply offset
             if offset > 0:
@@ -185,25 +891,230 @@ class DynamoDBClient:
             # Limit results
             events = events[:limit]
 
-            return events, total
+            self.inbox_cache.set(cache_key, (events, total, next_cursor), generation)
+            return events, total, next_cursor
 
         except ClientError as e:
             error_code = e.response.get("Error", {}).get("Code", "")
             # If table or GSI doesn't exist, return empty list (for development)
             if error_code == "ResourceNotFoundException":
-                return [], 0
+                return [], 0, None
             # Log the error but don't crash - return empty list for development
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"DynamoDB query error: {e}. Returning empty list.")
-            return [], 0
+            return [], 0, None
         except Exception as e:
             # Catch any other errors and return empty list for development
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Unexpected error getting pending events: {e}", exc_info=True)
+            return [], 0, None
+
+    def _query_priority_lanes(
+        self,
+        limit: int,
+        source: Optional[str],
+        since: Optional[datetime],
+        cache_key: Tuple[Any, ...],
+        generation: int,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Fill an inbox page from the priority lanes, highest priority first.
+
+        Each lane is one key range query (oldest first) on
+        `lane-created_at-index`. The page is split between non-empty lanes by
+        PRIORITY_WEIGHTS, with at least one slot per lane so low priorities
+        keep moving under a steady stream of urgent events; slots a lane
+        cannot fill go to the highest priorities with events left.
+        """
+        weights = settings.priority_weights_map
+        lanes: Dict[str, List[Dict[str, Any]]] = {}
+        total = 0
+        lower = self._pending_floor()
+        if since:
+            lower = max(lower, sort_key_floor(since))
+        upper = due_sort_key()
+        if lower is not None and lower > upper:
             return [], 0
+        for lane in PRIORITIES:
+            query_kwargs: Dict[str, Any] = {
+                "IndexName": LANE_INDEX,
+                "KeyConditionExpression": "#lane = :lane",
+                "ExpressionAttributeNames": {"#lane": "lane"},
+                "ExpressionAttributeValues": {":lane": lane},
+                "Limit": limit,
+                "ScanIndexForward": True,
+            }
+            self._add_sort_key_range(query_kwargs, lower, upper)
+            if source:
+                query_kwargs["FilterExpression"] = Attr("source").eq(source)
+            response = self.table.query(**query_kwargs)
+            lanes[lane] = response.get("Items", [])
+            total += response.get("Count", 0)
+
+        active = [lane for lane in PRIORITIES if lanes[lane]]
+        weight_sum = sum(weights.get(lane, 1) for lane in active) or 1
+        quotas = {
+            lane: min(len(lanes[lane]), max(1, limit * weights.get(lane, 1) // weight_sum))
+            for lane in active
+        }
+        # With more lanes than slots, the lowest priorities give theirs up
+        for lane in reversed(active):
+            excess = sum(quotas.values()) - limit
+            if excess <= 0:
+                break
+            quotas[lane] -= min(excess, quotas[lane])
+        spare = limit - sum(quotas.values())
+        for lane in active:
+            extra = min(spare, len(lanes[lane]) - quotas[lane])
+            quotas[lane] += extra
+            spare -= extra
+
+        events = [event for lane in active for event in lanes[lane][: quotas[lane]]]
+        self.inbox_cache.set(cache_key, (events, total), generation)
+        return events, total
+
+    def iter_events(
+        self,
+        status: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        page_size: int = 500,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every event with a status, oldest first.
+
+        Walks `status-created_at-index` one page at a time, so memory use does
+        not depend on how many events match.
+
+        Args:
+            status: Event status partition to read
+            since: Optional inclusive lower bound on creation time
+            until: Optional exclusive upper bound on creation time
+            page_size: Items requested per query page
+
+        Yields:
+            Event dictionaries
+        """
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "status-created_at-index",
+            "KeyConditionExpression": "#status = :status",
+            "ExpressionAttributeNames": {"#status": "status"},
+            "ExpressionAttributeValues": {":status": status},
+            "Limit": page_size,
+            "ScanIndexForward": True,
+        }
+        lower = sort_key_floor(since) if since else None
+        upper = sort_key_floor(until) - 1 if until else None
+        self._add_sort_key_range(query_kwargs, lower, upper)
+        while True:
+            response = self.table.query(**query_kwargs)
+            yield from response.get("Items", [])
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            query_kwargs["ExclusiveStartKey"] = last_key
+
+    def _scan_filter(
+        self, since: Optional[datetime], until: Optional[datetime]
+    ) -> Dict[str, Any]:
+        """Build scan arguments selecting event items in a creation-time range."""
+        # Only event items carry a payload; skip dedup, checkpoint and other records
+        condition = Attr("payload").exists()
+        if since:
+            condition = condition & Attr("created_at").gte(sort_key_floor(since))
+        if until:
+            condition = condition & Attr("created_at").lt(sort_key_floor(until))
+        return {"FilterExpression": condition}
+
+    def _scan_segment(
+        self,
+        segment: int,
+        total_segments: int,
+        scan_kwargs: Dict[str, Any],
+        page_size: int,
+    ) -> Iterator[Dict[str, Any]]:
+        """Iterate over the event items in one parallel-scan segment."""
+        kwargs = dict(scan_kwargs, Limit=page_size)
+        if total_segments > 1:
+            kwargs.update(Segment=segment, TotalSegments=total_segments)
+        while True:
+            response = self.table.scan(**kwargs)
+            yield from response.get("Items", [])
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return
+            kwargs["ExclusiveStartKey"] = last_key
+
+    def scan_events(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        segments: int = 1,
+        page_size: int = 500,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every event in the table, in no particular order.
+
+        With more than one segment, a thread per segment runs a parallel Scan
+        and hands items over through a bounded queue, so memory stays constant
+        while the segments are read concurrently.
+
+        Args:
+            since: Optional inclusive lower bound on creation time
+            until: Optional exclusive upper bound on creation time
+            segments: Number of parallel scan segments
+            page_size: Items requested per scan page
+
+        Yields:
+            Event dictionaries
+        """
+        scan_kwargs = self._scan_filter(since, until)
+        if segments <= 1:
+            yield from self._scan_segment(0, 1, scan_kwargs, page_size)
+            return
+
+        items: "queue.Queue[Any]" = queue.Queue(maxsize=page_size * 2)
+        stop = threading.Event()
+        done = object()
 
+        def offer(value: Any) -> bool:
+            """Queue a value unless the consumer has stopped reading."""
+            while not stop.is_set():
+                try:
+                    items.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def worker(segment: int) -> None:
+            try:
+                for item in self._scan_segment(segment, segments, scan_kwargs, page_size):
+                    if not offer(item):
+                        return
+                offer(done)
+            except Exception as e:
+                offer(e)
+
+        threads = [
+            threading.Thread(target=worker, args=(segment,), daemon=True)
+            for segment in range(segments)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            remaining = segments
+            while remaining:
+                item = items.get()
+                if item is done:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            # Consumer finished or went away: release workers blocked on the queue
+            stop.set()
+
+    @traced("db.acknowledge_event")
     def acknowledge_event(self, event_id: str) -> Dict[str, Any]:
         """
         Acknowledge an event (update status to acknowledged).
@@ -215,20 +1126,28 @@ class DynamoDBClient:
             Updated event dictionary
 
         Raises:
-            ValueError: If event not found or already acknowledged
+            ValueError: If event not found, already acknowledged or not yet due
         """
         # Update event status atomically with condition check
         acknowledged_at = int(datetime.utcnow().timestamp())
+        due = due_sort_key()
         try:
             response = self.table.update_item(
                 Key={"event_id": event_id},
-                UpdateExpression="SET #status = :status, acknowledged_at = :ack_at",
-                ConditionExpression="attribute_exists(event_id) AND #status = :pending_status",
+                UpdateExpression=(
+                    "SET #status = :status, acknowledged_at = :ack_at "
+                    "REMOVE leased_until, lease_id, lane"
+                ),
+                ConditionExpression=(
+                    "attribute_exists(event_id) AND #status = :pending_status "
+                    "AND created_at <= :due"
+                ),
                 ExpressionAttributeNames={"#status": "status"},
                 ExpressionAttributeValues={
                     ":status": "acknowledged",
                     ":ack_at": acknowledged_at,
                     ":pending_status": "pending",
+                    ":due": due,
                 },
                 ReturnValues="ALL_NEW",
             )
@@ -237,7 +1156,9 @@ class DynamoDBClient:
             updated_event = response.get("Attributes", {})
             if not updated_event:
                 raise ValueError(f"Event {event_id} not found")
-            
+            self._settle_group_event(updated_event)
+            self.notify_changed()
+
             return updated_event
 
         except ClientError as e:
@@ -250,56 +1171,1085 @@ class DynamoDBClient:
                 event = self.get_event(event_id)
                 if not event:
                     raise ValueError(f"Event {event_id} not found")
+                elif event.get("status") == "pending" and int(event["created_at"]) > due:
+                    raise ValueError(f"Event {event_id} is scheduled and not yet due")
                 else:
                     raise ValueError(f"Event {event_id} is not pending (status: {event.get('status')})")
             raise Exception(f"Failed to acknowledge event: {str(e)}") from e
 
-    def get_acknowledged_count(self, limit: int = 1000) -> int:
+    @traced("db.receive_events")
+    def receive_events(
+        self,
+        max_events: int,
+        visibility_timeout: int,
+        source: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
         """
-        Get count of acknowledged events.
+        Lease up to `max_events` pending events, oldest first.
+
+        Each event is claimed with a conditional update of `leased_until`, so
+        concurrent receivers never lease the same event; a leased event is
+        skipped by other receivers until its lease expires or it is
+        acknowledged. Events sharing a `group_key` are leased in creation
+        order, one batch per group at a time (see `_claim_pending`).
 
         Args:
-            limit: Maximum number to count (default 1000)
-            
+            max_events: Maximum number of events to lease
+            visibility_timeout: Lease length in seconds
+            source: Optional source filter
+
         Returns:
-            Number of acknowledged events
+            Leased events, each with `lease_id` and `leased_until` (epoch ms)
         """
-        try:
-            # Use client API directly (same as AWS CLI which works)
-            gsi_name = "status-created_at-index"
-            client = self.table.meta.client
-            response = client.query(
-                TableName=settings.dynamodb_table_name,
-                IndexName=gsi_name,
-                KeyConditionExpression="#status = :ack_status",
-                ExpressionAttributeNames={"#status": "status"},
-                ExpressionAttributeValues={":ack_status": {"S": "acknowledged"}},
-                Limit=limit,
-                ScanIndexForward=False
-            )
-            # Convert DynamoDB format to count
-            return len(response.get("Items", []))
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Error getting acknowledged count: {e}", exc_info=True)
-            return 0
+        now = int(time.time() * 1000)
+        leased_until = now + visibility_timeout * 1000
+        return self._claim_pending(
+            max_events,
+            now,
+            leased_until,
+            source,
+            lambda event_id, fifo_lock: self._lease_event(event_id, now, leased_until, fifo_lock),
+            hold_locks=True,
+        )
 
-    def get_event_stats(self) -> Dict[str, int]:
+    @traced("db.receive_and_acknowledge")
+    def receive_and_acknowledge(
+        self, max_events: int, source: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Get event statistics (counts by status).
+        Acknowledge and return up to `max_events` pending events, oldest first.
 
-        Returns:
-            Dictionary with 'pending', 'acknowledged', and 'total' counts
+        At-most-once delivery: each event moves from pending to acknowledged
+        in the conditional update that claims it, so concurrent callers never
+        get the same event and no separate ack is needed. Events leased by
+        another receiver are skipped, as are FIFO groups with a batch in
+        flight.
+
+        Args:
+            max_events: Maximum number of events to return
+            source: Optional source filter
+
+        Returns:
+            Acknowledged events
+        """
+        now = int(time.time() * 1000)
+        acknowledged_at = int(datetime.utcnow().timestamp())
+        events = self._claim_pending(
+            max_events,
+            now,
+            now + settings.receive_visibility_timeout_seconds * 1000,
+            source,
+            lambda event_id, fifo_lock: self._acknowledge_unleased(event_id, now, acknowledged_at),
+            hold_locks=False,
+        )
+        if events:
+            self.notify_changed()
+        return events
+
+    def _claim_pending(
+        self,
+        max_events: int,
+        now: int,
+        lock_until: int,
+        source: Optional[str],
+        claim: Callable[[str, Optional[str]], Optional[Dict[str, Any]]],
+        hold_locks: bool,
+    ) -> List[Dict[str, Any]]:
+        """
+        Claim up to `max_events` unleased pending events, oldest first.
+
+        Candidates are read from the status index a few at a time and claimed
+        in random order to spread contention between receivers polling at
+        once. `claim` makes the conditional update for one event (given the
+        FIFO lock it is claimed under, if any) and returns None when another
+        receiver got there first. Candidates already received
+        MAX_RECEIVE_COUNT times are moved to the dead-letter partition instead.
+
+        Events with a `group_key` are claimed only after taking the group's
+        lock item (`fifo#<group_key>`) and in creation order, stopping at the
+        first one that cannot be claimed; groups locked by another receiver
+        are skipped. With `hold_locks` the lock stays held until every event
+        claimed under it is acknowledged or released, or `lock_until` passes;
+        otherwise it is dropped before returning.
+        """
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "status-created_at-index",
+            "KeyConditionExpression": (
+                "#status = :pending_status AND created_at BETWEEN :floor AND :due"
+            ),
+            "FilterExpression": _UNLEASED,
+            "ProjectionExpression": "event_id, group_key, receive_count",
+            "ExpressionAttributeNames": {"#status": "status"},
+            "ExpressionAttributeValues": {
+                ":pending_status": "pending",
+                ":now": now,
+                ":floor": self._pending_floor(),
+                ":due": due_sort_key(),
+            },
+            "ScanIndexForward": True,
+        }
+        if source:
+            query_kwargs["FilterExpression"] += " AND #source = :source"
+            query_kwargs["ExpressionAttributeNames"]["#source"] = "source"
+            query_kwargs["ExpressionAttributeValues"][":source"] = source
+
+        claimed: List[Dict[str, Any]] = []
+        # group_key -> lock ID held by this call, and how many events were claimed under it
+        locks: Dict[str, str] = {}
+        in_flight: Dict[str, int] = {}
+        # Groups locked elsewhere, or whose next event could not be claimed
+        skipped = set()
+        examined = 0
+        dead_lettered = 0
+        try:
+            while len(claimed) < max_events and examined < settings.receive_scan_limit:
+                # Over-fetch so losing a few races does not cost another round trip
+                query_kwargs["Limit"] = min(
+                    max(2 * (max_events - len(claimed)), 10), settings.receive_scan_limit - examined
+                )
+                response = self.table.query(**query_kwargs)
+                examined += response.get("ScannedCount", 0)
+                # Ungrouped events are claimed one by one; a FIFO group's events together, in order
+                units: List[Tuple[Optional[str], List[str]]] = []
+                grouped: Dict[str, List[str]] = {}
+                for item in response.get("Items", []):
+                    if _exhausted(item):
+                        dead_lettered += self._dead_letter(item["event_id"], now)
+                        continue
+                    group_key = item.get("group_key")
+                    if group_key is None:
+                        units.append((None, [item["event_id"]]))
+                    elif group_key not in skipped:
+                        if group_key not in grouped:
+                            grouped[group_key] = []
+                            units.append((group_key, grouped[group_key]))
+                        grouped[group_key].append(item["event_id"])
+                random.shuffle(units)
+                for group_key, event_ids in units:
+                    if group_key is not None and group_key not in locks:
+                        lock_id = self._lock_group(group_key, now, lock_until)
+                        if lock_id is None:
+                            skipped.add(group_key)
+                            continue
+                        locks[group_key] = lock_id
+                        in_flight[group_key] = 0
+                    for event_id in event_ids:
+                        if len(claimed) == max_events:
+                            break
+                        event = claim(event_id, locks.get(group_key) if group_key else None)
+                        if event is not None:
+                            claimed.append(event)
+                            if group_key is not None:
+                                in_flight[group_key] += 1
+                        elif group_key is not None:
+                            skipped.add(group_key)
+                            break
+                last_key = response.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                query_kwargs["ExclusiveStartKey"] = last_key
+        finally:
+            for group_key, lock_id in locks.items():
+                if hold_locks and in_flight[group_key]:
+                    self._set_group_in_flight(group_key, lock_id, in_flight[group_key])
+                else:
+                    self._unlock_group(group_key, lock_id)
+            if dead_lettered:
+                logger.warning(f"Moved {dead_lettered} event(s) to {DEAD_LETTER_STATUS}")
+                self.notify_changed()
+        claimed.sort(key=lambda event: event["created_at"])
+        return claimed
+
+    def _dead_letter(self, event_id: str, now: int) -> bool:
+        """Move an unleased pending event out of the pending partition; False if it moved on."""
+        try:
+            self.table.update_item(
+                Key={"event_id": event_id},
+                UpdateExpression=(
+                    "SET #status = :dead, dead_lettered_at = :at "
+                    "REMOVE leased_until, lease_id, fifo_lock, lane"
+                ),
+                ConditionExpression=(
+                    f"#status = :pending_status AND {_UNLEASED} AND receive_count >= :max"
+                ),
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={
+                    ":dead": DEAD_LETTER_STATUS,
+                    ":at": now // 1000,
+                    ":pending_status": "pending",
+                    ":now": now,
+                    ":max": settings.max_receive_count,
+                },
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def _lock_group(self, group_key: str, now: int, lock_until: int) -> Optional[str]:
+        """Take a FIFO group's lock; returns its lock ID, or None if another receiver holds it."""
+        lock_id = uuid.uuid4().hex
+        try:
+            self.table.update_item(
+                Key={"event_id": f"{FIFO_PREFIX}{group_key}"},
+                UpdateExpression="SET leased_until = :until, lease_id = :lock, in_flight = :zero",
+                ConditionExpression=_UNLEASED,
+                ExpressionAttributeValues={
+                    ":until": lock_until,
+                    ":lock": lock_id,
+                    ":zero": 0,
+                    ":now": now,
+                },
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return None
+            raise
+        return lock_id
+
+    def _set_group_in_flight(self, group_key: str, lock_id: str, count: int) -> None:
+        """Record how many events were leased under a FIFO group lock."""
+        try:
+            self.table.update_item(
+                Key={"event_id": f"{FIFO_PREFIX}{group_key}"},
+                UpdateExpression="SET in_flight = :count",
+                ConditionExpression="lease_id = :lock",
+                ExpressionAttributeValues={":count": count, ":lock": lock_id},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
+    def _unlock_group(self, group_key: str, lock_id: str) -> None:
+        """Drop a FIFO group lock unless it has since been taken over."""
+        try:
+            self.table.delete_item(
+                Key={"event_id": f"{FIFO_PREFIX}{group_key}"},
+                ConditionExpression="lease_id = :lock",
+                ExpressionAttributeValues={":lock": lock_id},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
+    def _extend_group_lock(self, group_key: str, lock_id: str, lock_until: int) -> None:
+        """Keep a FIFO group locked at least as long as an event leased under the lock."""
+        try:
+            self.table.update_item(
+                Key={"event_id": f"{FIFO_PREFIX}{group_key}"},
+                UpdateExpression="SET leased_until = :until",
+                ConditionExpression="lease_id = :lock AND leased_until < :until",
+                ExpressionAttributeValues={":until": lock_until, ":lock": lock_id},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
+    def _settle_group_event(self, event: Dict[str, Any]) -> None:
+        """
+        Count an event leased under a FIFO group lock as no longer in flight.
+
+        Drops the lock once nothing leased under it is in flight, letting the
+        group's next batch be received. Does nothing if the event was not
+        leased under a lock, or the lock expired and was taken over.
+        """
+        group_key, lock_id = event.get("group_key"), event.get("fifo_lock")
+        if not group_key or not lock_id:
+            return
+        try:
+            response = self.table.update_item(
+                Key={"event_id": f"{FIFO_PREFIX}{group_key}"},
+                UpdateExpression="ADD in_flight :minus_one",
+                ConditionExpression="lease_id = :lock",
+                ExpressionAttributeValues={":minus_one": -1, ":lock": lock_id},
+                ReturnValues="UPDATED_NEW",
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return
+            logger.error(f"Failed to update FIFO group {group_key}: {e}")
+            return
+        if response["Attributes"]["in_flight"] <= 0:
+            self._unlock_group(group_key, lock_id)
+
+    def _lease_event(
+        self, event_id: str, now: int, leased_until: int, fifo_lock: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Claim one pending event; returns None if another receiver got there first."""
+        values: Dict[str, Any] = {
+            ":until": leased_until,
+            ":lease": uuid.uuid4().hex,
+            ":one": 1,
+            ":pending_status": "pending",
+            ":now": now,
+        }
+        if fifo_lock:
+            update = "SET leased_until = :until, lease_id = :lease, fifo_lock = :fifo"
+            values[":fifo"] = fifo_lock
+        else:
+            update = "SET leased_until = :until, lease_id = :lease REMOVE fifo_lock"
+        try:
+            response = self.table.update_item(
+                Key={"event_id": event_id},
+                UpdateExpression=f"{update} ADD receive_count :one",
+                ConditionExpression=f"#status = :pending_status AND {_UNLEASED}",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues=values,
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return None
+            raise
+        return response["Attributes"]
+
+    def _acknowledge_unleased(
+        self, event_id: str, now: int, acknowledged_at: int
+    ) -> Optional[Dict[str, Any]]:
+        """Acknowledge one unleased pending event; None if another receiver got there first."""
+        try:
+            response = self.table.update_item(
+                Key={"event_id": event_id},
+                UpdateExpression=(
+                    "SET #status = :status, acknowledged_at = :ack_at "
+                    "REMOVE leased_until, lease_id, fifo_lock, lane ADD receive_count :one"
+                ),
+                ConditionExpression=f"#status = :pending_status AND {_UNLEASED}",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={
+                    ":status": "acknowledged",
+                    ":ack_at": acknowledged_at,
+                    ":one": 1,
+                    ":pending_status": "pending",
+                    ":now": now,
+                },
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return None
+            raise
+        return response["Attributes"]
+
+    @traced("db.extend_lease")
+    def extend_lease(self, event_id: str, lease_id: str, visibility_timeout: int) -> Dict[str, Any]:
+        """
+        Extend (or, with a timeout of 0, release) a lease held on an event.
+
+        Args:
+            event_id: Event UUID
+            lease_id: Lease ID returned when the event was received
+            visibility_timeout: New lease length in seconds, counted from now
+
+        Returns:
+            Updated event dictionary
+
+        Raises:
+            ValueError: If the event is not found or is not pending
+            LeaseError: If the lease has expired or belongs to another receiver
+
+        For an event in a FIFO group the group lock is extended with it;
+        releasing the event counts it as no longer in flight for the group.
+        """
+        now = int(time.time() * 1000)
+        leased_until = now + visibility_timeout * 1000
+        try:
+            response = self.table.update_item(
+                Key={"event_id": event_id},
+                UpdateExpression="SET leased_until = :until",
+                ConditionExpression=(
+                    "#status = :pending_status AND lease_id = :lease AND leased_until >= :now"
+                ),
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={
+                    ":until": leased_until,
+                    ":lease": lease_id,
+                    ":pending_status": "pending",
+                    ":now": now,
+                },
+                ReturnValues="ALL_NEW",
+            )
+            event = response["Attributes"]
+            if visibility_timeout == 0:
+                self._settle_group_event(event)
+            elif event.get("fifo_lock"):
+                self._extend_group_lock(event["group_key"], event["fifo_lock"], leased_until)
+            return event
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise Exception(f"Failed to extend lease: {str(e)}") from e
+        event = self.get_event(event_id)
+        if not event:
+            raise ValueError(f"Event {event_id} not found")
+        if event.get("status") != "pending":
+            raise ValueError(f"Event {event_id} is not pending (status: {event.get('status')})")
+        if event.get("lease_id") != lease_id:
+            raise LeaseError(f"Lease on event {event_id} is held by another receiver")
+        raise LeaseError(f"Lease on event {event_id} has expired")
+
+    @traced("db.get_dead_letters")
+    def get_dead_letters(
+        self, limit: int = 50, after: Optional[str] = None, source: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get dead-lettered events, oldest first.
+
+        Args:
+            limit: Maximum number of events to return
+            after: Only return events after this cursor (a previous next_cursor)
+            source: Optional source filter
+
+        Returns:
+            Tuple of (events, next_cursor); next_cursor is None on the last page
+        """
+        lower = self.cursor_key(after) + 1 if after else 0
+        items, last_key = self._query_window(
+            DEAD_LETTER_STATUS, lower, due_sort_key(), limit, source
+        )
+        return items, _cursor_from(last_key)
+
+    @traced("db.redrive_dead_letters")
+    def redrive_dead_letters(
+        self,
+        event_ids: Optional[List[str]] = None,
+        max_events: int = 100,
+        source: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Move dead-lettered events back to pending with a fresh receive count.
+
+        Redriven events keep their IDs, so they return to their original
+        place in delivery order (and to their priority lane).
+
+        Args:
+            event_ids: Events to redrive; the oldest `max_events` dead letters if None
+            max_events: Maximum number of events to redrive when no IDs are given
+            source: Only redrive dead letters from this source (when no IDs are given)
+
+        Returns:
+            IDs of the events redriven; given IDs that are not dead-lettered are skipped
+        """
+        if event_ids is None:
+            event_ids = []
+            after = None
+            while len(event_ids) < max_events:
+                items, after = self.get_dead_letters(max_events - len(event_ids), after, source)
+                event_ids.extend(item["event_id"] for item in items)
+                if after is None:
+                    break
+
+        redriven = []
+        for event_id in event_ids:
+            try:
+                self.table.update_item(
+                    Key={"event_id": event_id},
+                    UpdateExpression=(
+                        "SET #status = :pending_status, receive_count = :zero, "
+                        "lane = if_not_exists(priority, :normal) REMOVE dead_lettered_at"
+                    ),
+                    ConditionExpression="#status = :dead",
+                    ExpressionAttributeNames={"#status": "status"},
+                    ExpressionAttributeValues={
+                        ":pending_status": "pending",
+                        ":zero": 0,
+                        ":normal": "normal",
+                        ":dead": DEAD_LETTER_STATUS,
+                    },
+                )
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                    continue
+                raise
+            redriven.append(event_id)
+        if redriven:
+            self.notify_changed()
+        return redriven
+
+    @traced("db.get_checkpoint")
+    def get_checkpoint(self, consumer: str = DEFAULT_CONSUMER) -> Optional[Dict[str, Any]]:
+        """
+        Get a consumer's checkpoint.
+
+        Args:
+            consumer: Consumer name
+
+        Returns:
+            Checkpoint item (`checkpoint_event_id`, `checkpoint_key`,
+            `updated_at`), or None if the consumer has not committed one
+        """
+        response = self.table.get_item(
+            Key={"event_id": f"{CHECKPOINT_PREFIX}{consumer}"}, ConsistentRead=True
+        )
+        return response.get("Item")
+
+    @traced("db.commit_checkpoint")
+    def commit_checkpoint(
+        self, event_id: str, consumer: str = DEFAULT_CONSUMER
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Acknowledge every event up to and including `event_id` in one write.
+
+        The checkpoint is a single item per consumer holding the sort key of
+        the last acknowledged event; the inbox read with `after` set to it
+        starts at the next event. Events themselves are not rewritten, so
+        acknowledging a batch costs one write instead of one per event (and
+        its status index move). Checkpoints only move forward: committing an
+        older event leaves the current checkpoint in place.
+
+        The default consumer's checkpoint applies to every pending read (see
+        `_pending_floor`): events up to it keep status "pending" in storage
+        but are reported as acknowledged and never returned or leased.
+
+        Args:
+            event_id: Newest event to acknowledge
+            consumer: Consumer name
+
+        Returns:
+            Tuple of (checkpoint item, whether it advanced)
+
+        Raises:
+            ValueError: If the event ID is not time-ordered, or the event is not
+                found or not yet due
+        """
+        event = self.get_event(event_id)
+        if not event or "payload" not in event:
+            raise ValueError(f"Event {event_id} not found")
+        checkpoint_key = int(event["created_at"])
+        if checkpoint_key > due_sort_key():
+            raise ValueError(f"Event {event_id} is scheduled and not yet due")
+        try:
+            response = self.table.update_item(
+                Key={"event_id": f"{CHECKPOINT_PREFIX}{consumer}"},
+                UpdateExpression=(
+                    "SET checkpoint_key = :key, checkpoint_event_id = :id, updated_at = :now"
+                ),
+                ConditionExpression="attribute_not_exists(checkpoint_key) OR checkpoint_key < :key",
+                ExpressionAttributeValues={
+                    ":key": checkpoint_key,
+                    ":id": event_id,
+                    ":now": int(datetime.utcnow().timestamp()),
+                },
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise Exception(f"Failed to commit checkpoint: {str(e)}") from e
+            return self.get_checkpoint(consumer) or {}, False
+        self.checkpoint_cache.delete(consumer)
+        self.notify_changed()
+        return response["Attributes"], True
+
+    def _checkpoint_key(self, consumer: str) -> int:
+        """Sort key of a consumer's checkpoint, or 0 if none is committed."""
+        checkpoint = self.get_checkpoint(consumer)
+        return int(checkpoint["checkpoint_key"]) if checkpoint else 0
+
+    def _pending_floor(self) -> int:
+        """
+        Lowest sort key pending reads return: the default consumer has acknowledged the rest.
+
+        Cached for CHECKPOINT_CACHE_TTL_SECONDS, so pending reads do not each
+        read the checkpoint item first. Checkpoints committed through this
+        client apply at once, ones committed elsewhere within the TTL.
+        """
+        generation = self.checkpoint_cache.generation
+        floor = self.checkpoint_cache.get(DEFAULT_CONSUMER)
+        if floor is None:
+            floor = self._checkpoint_key(DEFAULT_CONSUMER) + 1
+            self.checkpoint_cache.set(DEFAULT_CONSUMER, floor, generation)
+        return floor
+
+    def _query_window(
+        self, status: str, lower: int, upper: int, limit: int, source: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Read up to `limit` items of a status partition in a sort key range, oldest first."""
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "status-created_at-index",
+            "KeyConditionExpression": "#status = :status AND created_at BETWEEN :lower AND :upper",
+            "ExpressionAttributeNames": {"#status": "status"},
+            "ExpressionAttributeValues": {":status": status, ":lower": lower, ":upper": upper},
+            "Limit": limit,
+            "ScanIndexForward": True,
+        }
+        if source:
+            query_kwargs["FilterExpression"] = Attr("source").eq(source)
+        response = self.table.query(**query_kwargs)
+        return response.get("Items", []), response.get("LastEvaluatedKey")
+
+    def _count(
+        self, status: str, lower: int = 0, upper: Optional[int] = None, limit: int = 1000
+    ) -> int:
+        """Count up to `limit` items of a status partition in a sort key range."""
+        if upper is None:
+            upper = due_sort_key()
+        if lower > upper:
+            return 0
+        response = self.table.query(
+            IndexName="status-created_at-index",
+            KeyConditionExpression="#status = :status AND created_at BETWEEN :lower AND :upper",
+            ExpressionAttributeNames={"#status": "status"},
+            ExpressionAttributeValues={":status": status, ":lower": lower, ":upper": upper},
+            Select="COUNT",
+            Limit=limit,
+        )
+        return response.get("Count", 0)
+
+    @traced("db.get_group_events")
+    def get_group_events(
+        self,
+        group: str,
+        limit: int = 50,
+        after: Optional[str] = None,
+        source: Optional[str] = None,
+        since: Optional[datetime] = None,
+        statuses: Tuple[str, ...] = DELIVERED_STATUSES,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get the events a consumer group has not acknowledged, oldest first.
+
+        Groups see every event whatever its `status`: the pending and
+        acknowledged partitions of the status index are read from the group's
+        checkpoint and merged in creation order, and events the group acked
+        one by one are dropped using its ack record partition, reading on
+        until `limit` unacked events are found or the range ends. Event items
+        are never written on a group's behalf.
+
+        Args:
+            group: Consumer group name
+            limit: Maximum number of events to return
+            after: Optional cursor (see cursor_key); only newer events are returned
+            source: Optional source filter
+            since: Optional timestamp filter
+            statuses: Status partitions to read; a filtered subscription's group
+                reads its inbox entries (`subscription_inbox_status`) instead,
+                and gets the events they point to
+
+        Returns:
+            Tuple of (events list, cursor for the next page or None)
+
+        Raises:
+            ValueError: If `after` is not a cursor or known event ID
+        """
+        lower = self._checkpoint_key(group_consumer(group)) + 1
+        if after:
+            lower = max(lower, self.cursor_key(after) + 1)
+        if since:
+            lower = max(lower, sort_key_floor(since))
+        upper = due_sort_key()
+
+        # Windows of acked events are skipped until `limit` unacked ones are found
+        events: List[Dict[str, Any]] = []
+        next_cursor: Optional[str] = None
+        while len(events) < limit and lower <= upper:
+            window, boundary = self._group_window(statuses, lower, upper, limit, source)
+            if window:
+                acked = self._group_acks(group, lower, window[-1]["created_at"])
+                for event in window:
+                    if event["event_id"] not in acked:
+                        events.append(event)
+                        if len(events) == limit:
+                            # Resume right after the last event returned
+                            boundary = event
+                            break
+            next_cursor = _cursor_from(boundary)
+            if boundary is None:
+                break
+            lower = int(boundary["created_at"]) + 1
+        if any(status.startswith(INBOX_PREFIX) for status in statuses):
+            events = self._get_events([event["event_id"] for event in events])
+        return events, next_cursor
+
+    def _group_window(
+        self,
+        statuses: Tuple[str, ...],
+        lower: int,
+        upper: int,
+        limit: int,
+        source: Optional[str] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Read up to `limit` events from several status partitions, merged oldest first.
+
+        Inbox entries are returned as `{"event_id", "created_at"}` of the event
+        they point to.
+
+        Returns:
+            Tuple of (events, key of the last item read, or None if the range was exhausted)
         """
+        events: List[Dict[str, Any]] = []
+        boundary: Optional[Dict[str, Any]] = None
+        for status in statuses:
+            items, last_key = self._query_window(status, lower, upper, limit, source)
+            if status.startswith(INBOX_PREFIX):
+                items = [
+                    {"event_id": item["target_event_id"], "created_at": item["created_at"]}
+                    for item in items
+                ]
+            events.extend(items)
+            # Past the end of a truncated partition the other one may be ahead of it
+            if last_key and (boundary is None or last_key["created_at"] < boundary["created_at"]):
+                boundary = last_key
+        if boundary is not None:
+            events = [event for event in events if event["created_at"] <= boundary["created_at"]]
+        events.sort(key=lambda event: event["created_at"])
+        if len(events) > limit:
+            events = events[:limit]
+            boundary = events[-1]
+        return events, boundary
+
+    def _group_acks(self, group: str, lower: int, upper: int) -> Dict[str, str]:
+        """Map each event a group acked in a sort key range to its ack record's key."""
+        acked: Dict[str, str] = {}
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "status-created_at-index",
+            "KeyConditionExpression": "#status = :status AND created_at BETWEEN :lower AND :upper",
+            "ExpressionAttributeNames": {"#status": "status"},
+            "ExpressionAttributeValues": {
+                ":status": group_ack_status(group),
+                ":lower": lower,
+                ":upper": upper,
+            },
+            "ProjectionExpression": "event_id, acked_event_id",
+        }
+        while True:
+            response = self.table.query(**query_kwargs)
+            for item in response.get("Items", []):
+                acked[item["acked_event_id"]] = item["event_id"]
+            if not response.get("LastEvaluatedKey"):
+                return acked
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    def _get_events(self, event_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch events by ID with BatchGetItem, in the given order.
+
+        Events that no longer exist are left out.
+        """
+        table_name = settings.dynamodb_table_name
+        found: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(event_ids), 100):
+            request: Dict[str, Any] = {
+                table_name: {
+                    "Keys": [{"event_id": event_id} for event_id in event_ids[start : start + 100]],
+                    "ConsistentRead": True,
+                }
+            }
+            for attempt in range(5):
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get("Responses", {}).get(table_name, []):
+                    found[item["event_id"]] = item
+                request = response.get("UnprocessedKeys") or {}
+                if not request:
+                    break
+                time.sleep(random.uniform(0, 0.05 * 2**attempt))
+            if request:
+                raise Exception(f"Failed to read {len(request[table_name]['Keys'])} events")
+        return [found[event_id] for event_id in event_ids if event_id in found]
+
+    @traced("db.acknowledge_group_event")
+    def acknowledge_group_event(
+        self,
+        event_id: str,
+        group: str,
+        statuses: Tuple[str, ...] = DELIVERED_STATUSES,
+        source: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Acknowledge an event for one consumer group.
+
+        Writes a small ack record (`ack#<group>#<event_id>`) in the group's
+        partition of the status index instead of updating the event, so
+        every group tracks delivery independently. When the event is the
+        first one after the group's checkpoint, the checkpoint then moves over
+        it and every acked event right after it (see
+        `_advance_group_checkpoint`), and every ack record at or below it is
+        deleted. Ack records have no expiry: they are only removed once a
+        checkpoint covers them, however it got there.
+
+        Args:
+            event_id: Event UUID
+            group: Consumer group name
+            statuses: Partitions the group reads (as passed to get_group_events)
+            source: Source the group reads, if it reads only one; other events
+                do not hold its checkpoint back
+
+        Returns:
+            Ack record
+
+        Raises:
+            ValueError: If the event is not found or not yet due, or the group
+                already acknowledged it
+        """
+        event = self.get_event(event_id)
+        if not event or "payload" not in event:
+            raise ValueError(f"Event {event_id} not found")
+        if int(event["created_at"]) > due_sort_key():
+            raise ValueError(f"Event {event_id} is scheduled and not yet due")
+        checkpoint_key = self._checkpoint_key(group_consumer(group))
+        if event["created_at"] <= checkpoint_key:
+            raise ValueError(f"Event {event_id} already acknowledged by group {group}")
+        record = _group_ack_record(group, event)
+        try:
+            self.table.put_item(Item=record, ConditionExpression="attribute_not_exists(event_id)")
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                raise ValueError(f"Event {event_id} already acknowledged by group {group}")
+            raise Exception(f"Failed to acknowledge event: {str(e)}") from e
+        try:
+            checkpoint = self._advance_group_checkpoint(group, checkpoint_key, statuses, source)
+            if checkpoint:
+                self._release_group_records(group, int(checkpoint["checkpoint_key"]), statuses)
+        except Exception as e:
+            # The ack is recorded; a later ack retries the advance
+            logger.error(f"Failed to advance checkpoint of group {group}: {e}")
+        self.notify_changed()
+        return record
+
+    @traced("db.acknowledge_group_events")
+    def acknowledge_group_events(
+        self,
+        events: List[Dict[str, Any]],
+        group: str,
+        statuses: Tuple[str, ...] = DELIVERED_STATUSES,
+        source: Optional[str] = None,
+    ) -> int:
+        """
+        Acknowledge several events for one consumer group.
+
+        Like `acknowledge_group_event`, but takes the events as returned by
+        get_group_events, writes their ack records with BatchWriteItem and
+        advances the checkpoint once. Events the group already acknowledged
+        are not rejected: ones behind the checkpoint are left out and existing
+        ack records are overwritten.
+
+        Args:
+            events: Events with their `event_id` and `created_at`
+            group: Consumer group name
+            statuses: Partitions the group reads (as passed to get_group_events)
+            source: Source the group reads, if it reads only one
+
+        Returns:
+            Number of ack records written
+        """
+        checkpoint_key = self._checkpoint_key(group_consumer(group))
+        records = [
+            _group_ack_record(group, event)
+            for event in events
+            if int(event["created_at"]) > checkpoint_key
+        ]
+        if not records:
+            return 0
+        try:
+            with self.table.batch_writer() as batch:
+                for record in records:
+                    batch.put_item(Item=record)
+        except ClientError as e:
+            raise Exception(f"Failed to acknowledge events: {str(e)}") from e
+        try:
+            checkpoint = self._advance_group_checkpoint(group, checkpoint_key, statuses, source)
+            if checkpoint:
+                self._release_group_records(group, int(checkpoint["checkpoint_key"]), statuses)
+        except Exception as e:
+            logger.error(f"Failed to advance checkpoint of group {group}: {e}")
+        self.notify_changed()
+        return len(records)
+
+    @traced("db.commit_group_checkpoint")
+    def commit_group_checkpoint(
+        self,
+        event_id: str,
+        group: str,
+        statuses: Tuple[str, ...] = DELIVERED_STATUSES,
+        source: Optional[str] = None,
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Acknowledge everything a consumer group read up to an event with one checkpoint write.
+
+        If the group acked events right after it one by one, the checkpoint
+        then moves over them as well (see `_advance_group_checkpoint`);
+        otherwise that costs one COUNT query on the group's ack record
+        partition. Ack records and inbox entries the checkpoint passed are
+        deleted.
+
+        Args:
+            event_id: Newest event the group has processed
+            group: Consumer group name
+            statuses: Partitions the group reads (as passed to get_group_events)
+            source: Source the group reads, if it reads only one
+
+        Returns:
+            Tuple of (checkpoint item, whether it advanced)
+
+        Raises:
+            ValueError: As commit_checkpoint
+        """
+        checkpoint, advanced = self.commit_checkpoint(event_id, group_consumer(group))
+        if advanced:
+            try:
+                checkpoint_key = int(checkpoint["checkpoint_key"])
+                if self._count(group_ack_status(group), checkpoint_key + 1, limit=1):
+                    checkpoint = (
+                        self._advance_group_checkpoint(group, checkpoint_key, statuses, source)
+                        or checkpoint
+                    )
+                self._release_group_records(group, int(checkpoint["checkpoint_key"]), statuses)
+            except Exception as e:
+                logger.error(f"Failed to advance checkpoint of group {group}: {e}")
+        return checkpoint, advanced
+
+    def _advance_group_checkpoint(
+        self,
+        group: str,
+        checkpoint_key: int,
+        statuses: Tuple[str, ...],
+        source: Optional[str],
+        page_size: int = 100,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Move a group's checkpoint over the acked events right after it.
+
+        Reads the group's events from the checkpoint on and stops at the first
+        one it has not acked; the first read is a single event, so acks that
+        do not fill the gap after the checkpoint cost one query per partition.
+        Events of other sources, when the group reads one source, are passed
+        over.
+
+        Returns:
+            The group's checkpoint item after the commit, or None if there was
+            nothing to move over
+        """
+        lower, upper = checkpoint_key + 1, due_sort_key()
+        limit = 1
+        newest: Optional[Dict[str, Any]] = None
+        while lower <= upper:
+            window, boundary = self._group_window(statuses, lower, upper, limit)
+            if not window:
+                break
+            acked = self._group_acks(group, lower, window[-1]["created_at"])
+            for event in window:
+                if event["event_id"] not in acked and not (source and event.get("source") != source):
+                    boundary = None
+                    break
+                newest = event
+            if boundary is None:
+                break
+            lower, limit = int(boundary["created_at"]) + 1, page_size
+        if newest is None:
+            return None
+        checkpoint, _ = self.commit_checkpoint(newest["event_id"], group_consumer(group))
+        return checkpoint
+
+    def _release_group_records(
+        self, group: str, checkpoint_key: int, statuses: Tuple[str, ...]
+    ) -> None:
+        """Delete a group's ack records and inbox entries at or below its checkpoint."""
+        self._delete_partition(group_ack_status(group), checkpoint_key)
+        for status in statuses:
+            if status.startswith(INBOX_PREFIX):
+                self._delete_partition(status, checkpoint_key)
+
+    def _delete_partition(self, status: str, upper: Optional[int] = None) -> int:
+        """
+        Delete the items of a status partition, up to a sort key if given.
+
+        Returns:
+            Number of items deleted
+        """
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "status-created_at-index",
+            "KeyConditionExpression": "#status = :status",
+            "ExpressionAttributeNames": {"#status": "status"},
+            "ExpressionAttributeValues": {":status": status},
+            "ProjectionExpression": "event_id",
+        }
+        if upper is not None:
+            query_kwargs["KeyConditionExpression"] += " AND created_at <= :upper"
+            query_kwargs["ExpressionAttributeValues"][":upper"] = upper
+        deleted = 0
+        with self.table.batch_writer() as batch:
+            while True:
+                response = self.table.query(**query_kwargs)
+                for item in response.get("Items", []):
+                    batch.delete_item(Key={"event_id": item["event_id"]})
+                    deleted += 1
+                if not response.get("LastEvaluatedKey"):
+                    return deleted
+                query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    @traced("db.get_group_stats")
+    def get_group_stats(self, group: str) -> Dict[str, int]:
+        """
+        Get event statistics for one consumer group.
+
+        Counts, like get_event_stats, stop at 1000 per partition.
+
+        Returns:
+            Dictionary with 'pending', 'acknowledged', and 'total' counts
+        """
+        key = ("group_stats", group, self.inbox_cache.generation)
+        return dict(self.inflight.do(key, self._compute_group_stats, group))
+
+    def _compute_group_stats(self, group: str) -> Dict[str, int]:
+        """Count the status partitions behind get_group_stats."""
+        lower = self._checkpoint_key(group_consumer(group)) + 1
+        total = sum(self._count(status) for status in DELIVERED_STATUSES)
+        unacked = sum(self._count(status, lower) for status in DELIVERED_STATUSES)
+        pending = max(unacked - self._count(group_ack_status(group), lower), 0)
+        return {"pending": pending, "acknowledged": total - pending, "total": total}
+
+    def get_acknowledged_count(self, limit: int = 1000) -> int:
+        """
+        Get count of acknowledged events.
+
+        Args:
+            limit: Maximum number to count (default 1000)
+            
+        Returns:
+            Number of acknowledged events
+        """
+        try:
+            # Use client API directly (same as AWS CLI which works)
+            gsi_name = "status-created_at-index"
+            client = self.table.meta.client
+            response = client.query(
+                TableName=settings.dynamodb_table_name,
+                IndexName=gsi_name,
+                KeyConditionExpression="#status = :ack_status",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={":ack_status": {"S": "acknowledged"}},
+                Limit=limit,
+                ScanIndexForward=False
+            )
+            # Convert DynamoDB format to count
+            return len(response.get("Items", []))
+        except Exception as e:
+            logger.error(f"Error getting acknowledged count: {e}", exc_info=True)
+            return 0
+
+    @traced("db.get_event_stats")
+    def get_event_stats(self) -> Dict[str, int]:
+        """
+        Get event statistics (counts by status).
+
+        Concurrent calls share a single set of queries, unless one arrives
+        after a write made through this client.
+
+        Returns:
+            Dictionary with 'pending', 'acknowledged', 'scheduled' (pending
+            but not yet due), 'dead_letter' and 'total' counts
+        """
+        key = ("event_stats", self.inbox_cache.generation)
+        return dict(self.inflight.do(key, self._compute_event_stats))
+
+    def _compute_event_stats(self) -> Dict[str, int]:
+        """Query the status partitions behind get_event_stats."""
         # Get pending count - use get_pending_events
         pending = 0
         try:
-            events, _ = self.get_pending_events(limit=1000, offset=0)
+            events, _, _ = self.get_pending_events(limit=1000, offset=0)
             pending = len(events)
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Error getting pending count: {e}", exc_info=True)
             pending = 0
         
@@ -317,16 +2267,220 @@ class DynamoDBClient:
             }
             response = self.table.query(**query_kwargs)
             acknowledged = len(response.get("Items", []))
+            # Pending events up to the checkpoint are acknowledged without being rewritten
+            checkpointed = self._pending_floor() - 1
+            if checkpointed:
+                acknowledged += self._count("pending", 0, checkpointed)
         except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.error(f"Error getting acknowledged count in stats: {e}", exc_info=True)
             acknowledged = 0
+
+        scheduled = 0
+        try:
+            response = self.table.query(
+                IndexName="status-created_at-index",
+                KeyConditionExpression="#status = :pending_status AND created_at > :due",
+                ExpressionAttributeNames={"#status": "status"},
+                ExpressionAttributeValues={":pending_status": "pending", ":due": due_sort_key()},
+                Select="COUNT",
+                Limit=1000,
+            )
+            scheduled = response.get("Count", 0)
+        except Exception as e:
+            logger.error(f"Error getting scheduled count in stats: {e}", exc_info=True)
+            scheduled = 0
         
+        dead_letter = 0
+        try:
+            dead_letter = self._count(DEAD_LETTER_STATUS)
+        except Exception as e:
+            logger.error(f"Error getting dead letter count in stats: {e}", exc_info=True)
+
         return {
             "pending": pending,
             "acknowledged": acknowledged,
-            "total": pending + acknowledged,
+            "scheduled": scheduled,
+            "dead_letter": dead_letter,
+            "total": pending + acknowledged + scheduled + dead_letter,
+        }
+
+    @traced("db.create_subscription")
+    def create_subscription(
+        self,
+        url: str,
+        source: Optional[str] = None,
+        batch_size: int = 10,
+        max_in_flight: int = 4,
+        filter_pattern: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Register a webhook subscription.
+
+        The subscription reads events through its own consumer group
+        (`subscription_group`), starting with events created after it. With a
+        `filter_pattern` (see `matcher.compile_pattern`) it reads only the
+        inbox entries fan_out writes for the events the pattern matches.
+
+        Args:
+            url: Endpoint events are POSTed to
+            source: Only push events from this source
+            batch_size: Maximum events per POST
+            max_in_flight: Maximum concurrent POSTs to the endpoint
+            filter_pattern: Optional pattern over source, tags, priority, group_key and payload
+
+        Returns:
+            Subscription item
+
+        Raises:
+            ValueError: If the filter pattern is malformed
+        """
+        if filter_pattern is not None:
+            if source:
+                if "source" in filter_pattern:
+                    raise ValueError("Set source either on the subscription or in its filter")
+                filter_pattern = {**filter_pattern, "source": [source]}
+            compile_pattern(filter_pattern)
+        subscription_id = new_event_id()
+        subscription = {
+            "event_id": f"{SUBSCRIPTION_PREFIX}{subscription_id}",
+            "subscription_id": subscription_id,
+            "status": SUBSCRIPTION_STATUS,
+            "created_at": sort_key_from_id(subscription_id),
+            "timestamp": timestamp_from_id(subscription_id),
+            "url": url,
+            "batch_size": batch_size,
+            "max_in_flight": max_in_flight,
+        }
+        if source:
+            subscription["source"] = source
+        if filter_pattern is not None:
+            # JSON text, as DynamoDB has no float type
+            subscription["filter_pattern"] = json.dumps(filter_pattern, sort_keys=True)
+        self.table.put_item(Item=subscription)
+        # Start the group at the subscription, not at the beginning of the table
+        self.table.put_item(
+            Item={
+                "event_id": f"{CHECKPOINT_PREFIX}{group_consumer(subscription_group(subscription_id))}",
+                "checkpoint_key": subscription["created_at"],
+                "checkpoint_event_id": subscription_id,
+                "updated_at": int(time.time()),
+            }
+        )
+        self._reload_rules()
+        return subscription
+
+    @traced("db.get_subscription")
+    def get_subscription(self, subscription_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a webhook subscription.
+
+        Args:
+            subscription_id: Subscription ID
+
+        Returns:
+            Subscription item, or None if not found
+        """
+        response = self.table.get_item(Key={"event_id": f"{SUBSCRIPTION_PREFIX}{subscription_id}"})
+        return response.get("Item")
+
+    @traced("db.list_subscriptions")
+    def list_subscriptions(self) -> List[Dict[str, Any]]:
+        """List every webhook subscription, oldest first."""
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": "status-created_at-index",
+            "KeyConditionExpression": "#status = :status",
+            "ExpressionAttributeNames": {"#status": "status"},
+            "ExpressionAttributeValues": {":status": SUBSCRIPTION_STATUS},
+        }
+        subscriptions: List[Dict[str, Any]] = []
+        while True:
+            response = self.table.query(**query_kwargs)
+            subscriptions.extend(response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return subscriptions
+            query_kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    @traced("db.delete_subscription")
+    def delete_subscription(self, subscription_id: str) -> None:
+        """
+        Delete a webhook subscription.
+
+        Its inbox entries are deleted with it; its consumer group checkpoint
+        and ack records are left to be ignored.
+
+        Raises:
+            ValueError: If the subscription is not found
+        """
+        try:
+            self.table.delete_item(
+                Key={"event_id": f"{SUBSCRIPTION_PREFIX}{subscription_id}"},
+                ConditionExpression="attribute_exists(event_id)",
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                raise ValueError(f"Subscription {subscription_id} not found")
+            raise
+        self._reload_rules()
+        self._delete_partition(subscription_inbox_status(subscription_id))
+
+    def hold_dispatch_lease(self, subscription_id: str, owner: str, seconds: float) -> bool:
+        """
+        Take or renew the lease on delivering a subscription's webhooks.
+
+        The lease item (`dispatch#<subscription_id>`) is taken with a
+        conditional update when it is free or expired, and renewed by its
+        owner, so one dispatcher delivers each subscription however many
+        processes run one.
+
+        Args:
+            subscription_id: Subscription ID
+            owner: ID of the worker asking for the lease
+            seconds: Lease length from now
+
+        Returns:
+            Whether `owner` holds the lease
+        """
+        now = int(time.time() * 1000)
+        try:
+            self.table.update_item(
+                Key={"event_id": f"{DISPATCH_PREFIX}{subscription_id}"},
+                UpdateExpression="SET leased_until = :until, lease_id = :owner",
+                ConditionExpression=f"{_UNLEASED} OR lease_id = :owner",
+                ExpressionAttributeValues={
+                    ":until": now + int(seconds * 1000),
+                    ":owner": owner,
+                    ":now": now,
+                },
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+        return True
+
+    def release_dispatch_lease(self, subscription_id: str, owner: str) -> None:
+        """Drop a subscription's dispatch lease unless another worker has since taken it."""
+        try:
+            self.table.delete_item(
+                Key={"event_id": f"{DISPATCH_PREFIX}{subscription_id}"},
+                ConditionExpression="lease_id = :owner",
+                ExpressionAttributeValues={":owner": owner},
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
+    def cache_metrics(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get in-process cache and request-coalescing counters.
+
+        Returns:
+            Counters for each cache and for coalesced reads
+        """
+        return {
+            "inbox_cache": self.inbox_cache.stats(),
+            "idempotency_cache": self.idempotency_cache.stats(),
+            "inflight": self.inflight.stats(),
         }
 
 
@@ -1,5 +1,5 @@
 """Custom exception classes."""
-from typing import Optional
+from typing import Dict, Optional
 
 from fastapi import HTTPException, status
 
@@ -13,6 +13,7 @@ class APIException(HTTPException):
         error_type: str,
         message: str,
         details: Optional[dict] = None,
+        headers: Optional[Dict[str, str]] = None,
     ):
         """Initialize API exception."""
         super().__init__(
@@ -22,6 +23,7 @@ class APIException(HTTPException):
                 "message": message,
                 "details": details or {},
             },
+            headers=headers,
         )
 
 
@@ -72,6 +74,7 @@ class RateLimitError(APIException):
             error_type="rate_limit_exceeded",
             message=message,
             details={"retry_after": retry_after},
+            headers={"Retry-After": str(retry_after)},
         )
 
 
@@ -0,0 +1,69 @@
+"""Log-linear latency histogram."""
+from typing import Dict, Optional, Tuple
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram.
+
+    Values (microseconds) are bucketed by their highest set bit and the next
+    `precision_bits - 1` bits, bounding the relative error of any reported
+    percentile to about 2 ** -(precision_bits - 1) while using memory that
+    grows only with the logarithm of the value range.
+    """
+
+    def __init__(self, precision_bits: int = 8):
+        """Initialize an empty histogram."""
+        self.precision_bits = precision_bits
+        self.counts: Dict[Tuple[int, int], int] = {}
+        self.total = 0
+        self.sum = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def record(self, value_us: int) -> None:
+        """Record one latency in microseconds."""
+        value_us = max(0, int(value_us))
+        shift = max(0, value_us.bit_length() - self.precision_bits)
+        key = (shift, value_us >> shift)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.total += 1
+        self.sum += value_us
+        self.min = value_us if self.min is None else min(self.min, value_us)
+        self.max = max(self.max, value_us)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's counts to this one."""
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> int:
+        """Return the latency at a percentile (0-100), in microseconds."""
+        if not self.total:
+            return 0
+        target = max(1, int(round(self.total * percent / 100.0)))
+        seen = 0
+        for shift, mantissa in sorted(self.counts, key=lambda key: key[1] << key[0]):
+            seen += self.counts[(shift, mantissa)]
+            if seen >= target:
+                # Report the top of the bucket, never under-stating latency
+                return min(self.max, ((mantissa + 1) << shift) - 1)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """Return count, mean and percentile latencies in milliseconds."""
+        return {
+            "count": self.total,
+            "mean_ms": (self.sum / self.total / 1000.0) if self.total else 0.0,
+            "min_ms": (self.min or 0) / 1000.0,
+            "p50_ms": self.percentile(50) / 1000.0,
+            "p90_ms": self.percentile(90) / 1000.0,
+            "p99_ms": self.percentile(99) / 1000.0,
+            "p999_ms": self.percentile(99.9) / 1000.0,
+            "max_ms": self.max / 1000.0,
+        }
@@ -0,0 +1,131 @@
+"""Time-ordered event identifiers (UUIDv7)."""
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Tuple
+from uuid import UUID
+
+# Layout (RFC 9562): 48-bit unix_ts_ms | 4-bit version | 12-bit counter | 2-bit variant | 62 random bits
+_COUNTER_BITS = 12
+_RANDOM_BITS = 62
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+_RANDOM_MASK = (1 << _RANDOM_BITS) - 1
+# Sort keys drop the fixed version and variant bits: 48 + 12 + 62 = 122 bits,
+# 37 decimal digits, which fits DynamoDB's 38-digit number precision.
+_MS_SHIFT = _COUNTER_BITS + _RANDOM_BITS
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Sort keys of any time after the epoch are at least this; unix seconds never are
+LEGACY_SORT_KEY_LIMIT = 1 << _MS_SHIFT
+
+
+class UUIDv7Generator:
+    """
+    Generator of UUIDv7 strings that sort in creation order.
+
+    Within a millisecond, IDs from this process are ordered by a 12-bit
+    counter that starts at a random value below half its range. If the
+    counter overflows or the wall clock steps backwards, the generator keeps
+    using the last millisecond it issued so IDs never go backwards. IDs from
+    different workers are kept unique by the 62 random bits.
+    """
+
+    def __init__(self):
+        """Initialize generator state."""
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+
+    def _next(self) -> Tuple[int, int]:
+        """Reserve the next (millisecond, counter) pair."""
+        now_ms = time.time_ns() // 1_000_000
+        with self._lock:
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._counter = int.from_bytes(os.urandom(2), "big") & (_COUNTER_MAX >> 1)
+            elif self._counter < _COUNTER_MAX:
+                self._counter += 1
+            else:
+                self._last_ms += 1
+                self._counter = 0
+            return self._last_ms, self._counter
+
+    def new(self) -> str:
+        """Return a new UUIDv7 string."""
+        unix_ms, counter = self._next()
+        rand_b = int.from_bytes(os.urandom(8), "big") & _RANDOM_MASK
+        value = (unix_ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | rand_b
+        return str(UUID(int=value))
+
+
+_generator = UUIDv7Generator()
+
+
+def new_event_id() -> str:
+    """Return a new time-ordered event ID."""
+    return _generator.new()
+
+
+def sort_key_from_id(event_id: str) -> int:
+    """
+    Convert a UUIDv7 event ID into its numeric sort key.
+
+    Sort keys order exactly like the IDs and are stored as `created_at`, the
+    range key of `status-created_at-index`.
+
+    Raises:
+        ValueError: If the ID is not a UUIDv7
+    """
+    value = UUID(event_id).int
+    if (value >> 76) & 0xF != 0x7:
+        raise ValueError(f"Event ID {event_id} is not time-ordered")
+    unix_ms = value >> 80
+    counter = (value >> 64) & _COUNTER_MAX
+    return (unix_ms << _MS_SHIFT) | (counter << _RANDOM_BITS) | (value & _RANDOM_MASK)
+
+
+def legacy_sort_key(created_at: int, event_id: str) -> int:
+    """
+    Sort key for an event stored with `created_at` in unix seconds (and any UUID).
+
+    It sorts at the start of that second, ahead of every UUIDv7 event issued
+    later, with the ID's low bits keeping keys unique. Seconds-resolution
+    events had no order within the second to preserve.
+    """
+    return ((created_at * 1000) << _MS_SHIFT) | (UUID(event_id).int & _RANDOM_MASK)
+
+
+def sort_key_at(moment: datetime, event_id: str) -> int:
+    """
+    Sort key placing an event at `moment` instead of its ID's time.
+
+    The counter and random bits come from the ID, so the key is unique and
+    the same every time it is computed for that event.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return sort_key_floor(moment) | (sort_key_from_id(event_id) & ((1 << _MS_SHIFT) - 1))
+
+
+def sort_key_floor(moment: datetime) -> int:
+    """Return the smallest sort key for IDs issued at or after `moment`."""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return ((moment - _EPOCH) // timedelta(milliseconds=1)) << _MS_SHIFT
+
+
+def sort_key_ceiling(moment: datetime) -> int:
+    """Return the largest sort key for IDs issued at or before `moment`."""
+    return sort_key_floor(moment + timedelta(milliseconds=1)) - 1
+
+
+def unix_ms_from_sort_key(sort_key: int) -> int:
+    """Return the unix millisecond encoded in a sort key."""
+    return sort_key >> _MS_SHIFT
+
+
+def timestamp_from_id(event_id: str) -> str:
+    """Return the ISO 8601 creation time encoded in a UUIDv7 event ID."""
+    unix_ms = UUID(event_id).int >> 80
+    moment = datetime.fromtimestamp(unix_ms / 1000, tz=timezone.utc)
+    return moment.replace(tzinfo=None).isoformat(timespec="microseconds") + "Z"
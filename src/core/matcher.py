@@ -0,0 +1,175 @@
+"""Subscription filter rules compiled into an index over `field=value` keys."""
+from decimal import Decimal
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, Optional, Set, Tuple
+
+# Top-level event fields a pattern may match on
+PATTERN_FIELDS = ("source", "tags", "priority", "group_key", "payload")
+
+# Bounds keeping one pattern's index footprint small
+MAX_PATTERN_DEPTH = 8
+MAX_PATTERN_VALUES = 100
+
+
+def match_value(value: Any) -> str:
+    """
+    Canonical text of a scalar for matching.
+
+    Numbers compare by value whatever their type (5, 5.0 and Decimal("5")
+    agree), and a number matches its string form, since float payload values
+    are stored as strings.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, (int, float, Decimal)):
+        number = Decimal(str(value)).normalize()
+        return format(number, "f") if number == number.to_integral_value() else str(number)
+    if isinstance(value, str):
+        try:
+            return match_value(Decimal(value)) if value.strip() else value
+        except ArithmeticError:
+            return value
+    raise ValueError(f"Cannot match on {type(value).__name__} values")
+
+
+def compile_pattern(pattern: Mapping[str, Any]) -> Dict[str, FrozenSet[str]]:
+    """
+    Compile an EventBridge-style pattern into the values allowed per field path.
+
+    A pattern mirrors the event: leaves are lists of allowed values, nested
+    objects match nested payload fields, e.g.
+    `{"source": ["shop"], "payload": {"customer": {"tier": ["gold", "platinum"]}}}`.
+    An event matches when every listed field has one of its values; for list
+    fields (such as `tags`) any element may match. An empty pattern matches
+    every event.
+
+    Returns:
+        Mapping of dotted field path (e.g. "payload.customer.tier") to allowed values
+
+    Raises:
+        ValueError: If the pattern is malformed
+    """
+    if not isinstance(pattern, Mapping):
+        raise ValueError("Filter pattern must be an object")
+    unknown = set(pattern) - set(PATTERN_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown filter field(s) {', '.join(sorted(unknown))}; "
+            f"expected {', '.join(PATTERN_FIELDS)}"
+        )
+    fields: Dict[str, FrozenSet[str]] = {}
+
+    def walk(node: Any, path: str, depth: int) -> None:
+        if isinstance(node, Mapping):
+            if depth >= MAX_PATTERN_DEPTH:
+                raise ValueError(f"Filter pattern nested deeper than {MAX_PATTERN_DEPTH} at {path}")
+            if not node:
+                raise ValueError(f"Empty object in filter pattern at {path}")
+            for key, child in node.items():
+                if not isinstance(key, str) or not key or "." in key:
+                    raise ValueError(f"Invalid field name {key!r} in filter pattern at {path}")
+                walk(child, f"{path}.{key}", depth + 1)
+        elif isinstance(node, list):
+            if not node:
+                raise ValueError(f"Empty value list in filter pattern at {path}")
+            if any(isinstance(value, (Mapping, list)) for value in node):
+                raise ValueError(f"Filter values at {path} must be strings, numbers or booleans")
+            fields[path] = frozenset(match_value(value) for value in node)
+        else:
+            raise ValueError(f"Filter pattern at {path} must be a list of values or an object")
+
+    for name, node in pattern.items():
+        if name != "payload" and not isinstance(node, list):
+            raise ValueError(f"Filter pattern at {name} must be a list of values")
+        walk(node, name, 0)
+    if sum(len(values) for values in fields.values()) > MAX_PATTERN_VALUES:
+        raise ValueError(f"Filter pattern lists more than {MAX_PATTERN_VALUES} values")
+    return fields
+
+
+class RuleIndex:
+    """
+    Find the rules matching an event without evaluating every rule.
+
+    Each rule is posted under the `path=value` keys of one field, its anchor:
+    the field whose values the fewest rules share. Matching collects the
+    event's own `path=value` keys (walking only payload paths some rule
+    uses), looks them up, and checks the candidates' other fields against
+    the same key set. The cost grows with the event's keys and the rules
+    anchored on them, not with the number of rules.
+
+    The index is immutable once built; build a new one when rules change.
+    """
+
+    def __init__(self, rules: Optional[Mapping[str, Dict[str, FrozenSet[str]]]] = None):
+        """
+        Build the index.
+
+        Args:
+            rules: Rule ID to its compile_pattern output
+        """
+        rules = rules or {}
+        # Rules listing no fields match every event
+        self._match_all = frozenset(rule_id for rule_id, fields in rules.items() if not fields)
+        # Field paths used by some rule, and their prefixes, to prune the payload walk
+        self._paths: Set[str] = set()
+        self._prefixes: Set[str] = set()
+        shared: Dict[str, int] = {}
+        for fields in rules.values():
+            for path, values in fields.items():
+                self._paths.add(path)
+                parts = path.split(".")
+                self._prefixes.update(".".join(parts[:n]) for n in range(1, len(parts)))
+                for value in values:
+                    key = f"{path}={value}"
+                    shared[key] = shared.get(key, 0) + 1
+
+        # "path=value" -> rules anchored on it, with the keys of their other fields
+        self._postings: Dict[str, List[Tuple[str, Tuple[FrozenSet[str], ...]]]] = {}
+        for rule_id, fields in rules.items():
+            if not fields:
+                continue
+            keys = {
+                path: frozenset(f"{path}={value}" for value in values)
+                for path, values in sorted(fields.items())
+            }
+            anchor = min(keys, key=lambda path: sum(shared[key] for key in keys[path]))
+            others = tuple(field_keys for path, field_keys in keys.items() if path != anchor)
+            for key in keys[anchor]:
+                self._postings.setdefault(key, []).append((rule_id, others))
+        self._size = len(rules)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def match(self, event: Mapping[str, Any]) -> Set[str]:
+        """Return the IDs of the rules an event (as stored) matches."""
+        keys = set(self._event_keys(event))
+        matched = set(self._match_all)
+        for key in keys:
+            for rule_id, others in self._postings.get(key, ()):
+                if all(not keys.isdisjoint(field_keys) for field_keys in others):
+                    matched.add(rule_id)
+        return matched
+
+    def _event_keys(self, event: Mapping[str, Any]) -> Iterator[str]:
+        for name in PATTERN_FIELDS:
+            if name in event and (name in self._paths or name in self._prefixes):
+                yield from self._walk(event[name], name)
+
+    def _walk(self, node: Any, path: str) -> Iterator[str]:
+        if isinstance(node, list):
+            for element in node:
+                yield from self._walk(element, path)
+        elif isinstance(node, Mapping):
+            if path in self._prefixes:
+                for key, child in node.items():
+                    child_path = f"{path}.{key}"
+                    if child_path in self._paths or child_path in self._prefixes:
+                        yield from self._walk(child, child_path)
+        elif path in self._paths:
+            try:
+                yield f"{path}={match_value(node)}"
+            except ValueError:
+                pass
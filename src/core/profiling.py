@@ -0,0 +1,237 @@
+"""Per-request profiling with DynamoDB call markers."""
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+MODES = ("sampling", "cprofile")
+
+# Profile of the request being handled in this context, if it is profiled
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+# cProfile supports one active profiler per thread, so deterministic profiles run one at a time
+_cprofile_lock = threading.Lock()
+
+
+def _frame_label(frame: Any) -> str:
+    """Collapsed-stack label for a frame: module:function."""
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+class RequestProfile:
+    """
+    Profile of a single request.
+
+    In "sampling" mode a background thread records the stacks of the event
+    loop thread, and of worker threads while they make DynamoDB calls for
+    this request, every `interval_ms`; output is collapsed stacks for flame
+    graph tools. In "cprofile" mode the event loop thread runs under
+    cProfile and output is a pstats file. Both modes record every DynamoDB
+    call made for the request as a marker.
+
+    The event loop thread is shared by all in-flight requests, so its stacks
+    (and cProfile data) also include other requests handled concurrently.
+    """
+
+    def __init__(self, label: str, mode: str = "sampling", interval_ms: float = 5.0):
+        """
+        Initialize profile.
+
+        Args:
+            label: Request description, such as "GET /v1/events/inbox"
+            mode: "sampling" or "cprofile"
+            interval_ms: Sampling interval in milliseconds
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.id = uuid.uuid4().hex[:16]
+        self.label = label
+        self.mode = mode
+        self.interval = interval_ms / 1000
+        self.samples: Counter = Counter()
+        self.markers: List[Dict[str, Any]] = []
+        self.started = 0.0
+        self.duration_ms = 0.0
+        self._lock = threading.Lock()
+        # thread id -> name, for threads whose stacks are sampled
+        self._threads: Dict[int, str] = {}
+        # thread id -> stack of (operation, start) for DynamoDB calls in progress
+        self._calls: Dict[int, List[Tuple[str, float]]] = {}
+        self._profiler: Optional[cProfile.Profile] = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._token: Any = None
+
+    def start(self) -> bool:
+        """
+        Start profiling the current thread and context.
+
+        Returns:
+            False if the profile could not start (another cProfile run is active)
+        """
+        if self.mode == "cprofile":
+            if not _cprofile_lock.acquire(blocking=False):
+                return False
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            self._threads[threading.get_ident()] = "event-loop"
+            self._sampler = threading.Thread(target=self._sample, name=f"profile-{self.id}", daemon=True)
+            self._sampler.start()
+        self.started = time.perf_counter()
+        self._token = _current.set(self)
+        return True
+
+    def stop(self) -> None:
+        """Stop profiling; must be called from the thread and context that started it."""
+        self.duration_ms = (time.perf_counter() - self.started) * 1000
+        _current.reset(self._token)
+        if self._profiler is not None:
+            self._profiler.disable()
+            _cprofile_lock.release()
+        else:
+            self._stop.set()
+            if self._sampler is not None:
+                self._sampler.join()
+
+    def _sample(self) -> None:
+        """Sampler thread: record the stacks of watched threads."""
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                watched = list(self._threads.items())
+                calls = {thread_id: [operation for operation, _ in stack] for thread_id, stack in self._calls.items()}
+            for thread_id, name in watched:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.samples[self._collapse(name, frame, calls.get(thread_id, []))] += 1
+
+    @staticmethod
+    def _collapse(name: str, frame: Any, operations: List[str]) -> str:
+        """Render a stack root-first, marking botocore API calls with their DynamoDB operation."""
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        labels.append(name)
+        labels.reverse()
+        pending = list(operations)
+        marked = []
+        for label in labels:
+            marked.append(label)
+            if label == "botocore.client:_make_api_call" and pending:
+                marked.append(f"[DynamoDB {pending.pop(0)}]")
+        return ";".join(marked)
+
+    def call_started(self, operation: str) -> None:
+        """Record the start of a DynamoDB call on the current thread."""
+        thread_id = threading.get_ident()
+        with self._lock:
+            self._calls.setdefault(thread_id, []).append((operation, time.perf_counter()))
+            if self.mode == "sampling":
+                self._threads.setdefault(thread_id, "worker")
+
+    def call_finished(self, operation: str, error: Optional[str] = None) -> None:
+        """Record the end of the innermost DynamoDB call on the current thread."""
+        thread_id = threading.get_ident()
+        now = time.perf_counter()
+        with self._lock:
+            stack = self._calls.get(thread_id)
+            if not stack:
+                return
+            _, start = stack.pop()
+            if not stack:
+                del self._calls[thread_id]
+                if self._threads.get(thread_id) == "worker":
+                    del self._threads[thread_id]
+            self.markers.append(
+                {
+                    "operation": operation,
+                    "thread": thread_id,
+                    "start_ms": round((start - self.started) * 1000, 3),
+                    "duration_ms": round((now - start) * 1000, 3),
+                    "error": error,
+                }
+            )
+
+    def write(self, directory: str) -> List[str]:
+        """
+        Write the profile and its markers.
+
+        Files are named `<time>-<id>-<method>-<path>` with a `.collapsed`
+        (sampling) or `.pstats` (cprofile) extension, plus a `.json` summary
+        holding the DynamoDB markers.
+
+        Returns:
+            Paths written
+        """
+        os.makedirs(directory, exist_ok=True)
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", self.label).strip("-")[:80]
+        base = os.path.join(directory, f"{time.strftime('%Y%m%dT%H%M%S')}-{self.id}-{slug}")
+        paths = []
+        if self._profiler is not None:
+            self._profiler.dump_stats(f"{base}.pstats")
+            paths.append(f"{base}.pstats")
+        else:
+            with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+                for stack, count in self.samples.most_common():
+                    f.write(f"{stack} {count}\n")
+            paths.append(f"{base}.collapsed")
+        summary = {
+            "id": self.id,
+            "request": self.label,
+            "mode": self.mode,
+            "duration_ms": round(self.duration_ms, 3),
+            "samples": sum(self.samples.values()),
+            "dynamodb_calls": len(self.markers),
+            "dynamodb_ms": round(sum(marker["duration_ms"] for marker in self.markers), 3),
+            "markers": sorted(self.markers, key=lambda marker: marker["start_ms"]),
+        }
+        with open(f"{base}.json", "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+        paths.append(f"{base}.json")
+        return paths
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Return the profile of the request handled in this context, if any."""
+    return _current.get()
+
+
+def _on_call_start(model: Any, **kwargs: Any) -> None:
+    profile = _current.get()
+    if profile is not None:
+        profile.call_started(model.name)
+
+
+def _on_call_end(model: Any, http_response: Any = None, **kwargs: Any) -> None:
+    profile = _current.get()
+    if profile is not None:
+        status = getattr(http_response, "status_code", 200)
+        profile.call_finished(model.name, error=f"HTTP {status}" if status >= 300 else None)
+
+
+def _on_call_error(model: Any, exception: Any = None, **kwargs: Any) -> None:
+    profile = _current.get()
+    if profile is not None:
+        profile.call_finished(model.name, error=type(exception).__name__)
+
+
+def install_dynamodb_hooks(client: Any) -> None:
+    """
+    Record DynamoDB calls made through a botocore client as profile markers.
+
+    Only installed when profiling is enabled; calls made outside a profiled
+    request cost one context variable lookup.
+    """
+    events = client.meta.events
+    events.register("before-parameter-build.dynamodb", _on_call_start, unique_id="profiling-call-start")
+    events.register("after-call.dynamodb", _on_call_end, unique_id="profiling-call-end")
+    events.register("after-call-error.dynamodb", _on_call_error, unique_id="profiling-call-error")
@@ -0,0 +1,253 @@
+"""Token-bucket rate limiting for the event routes."""
+import fcntl
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from fastapi import Request
+
+from src.core.config import settings
+from src.core.exceptions import RateLimitError
+
+logger = logging.getLogger(__name__)
+
+
+class LocalBucketStore:
+    """Token buckets held in a dictionary private to this process."""
+
+    def __init__(self):
+        """Initialize an empty bucket store."""
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> float:
+        """
+        Take `cost` tokens from the bucket for `key`.
+
+        Args:
+            key: Bucket identifier
+            rate: Refill rate in tokens per second
+            capacity: Maximum number of tokens the bucket can hold
+            cost: Number of tokens to take
+
+        Returns:
+            0.0 if the tokens were taken, otherwise seconds until they will be available
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [capacity, now]
+                self._buckets[key] = bucket
+            tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return 0.0
+            bucket[0] = tokens
+            return (cost - tokens) / rate
+
+
+def _shared_memory_dir() -> str:
+    """Directory for the bucket table file: tmpfs when available."""
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+class SharedMemoryBucketStore:
+    """
+    Token buckets held in a memory-mapped file shared by the host's workers.
+
+    Every uvicorn worker on the host maps the same file (on tmpfs where
+    available), so a key gets one budget per machine instead of one per
+    worker. The table has a fixed name and size and is reused as-is by
+    later workers, so nothing is left behind per process, even after a
+    crash. It is an open-addressing hash table of fixed-size slots guarded
+    by an advisory lock on the file; time.monotonic() uses CLOCK_MONOTONIC,
+    which is shared between processes on Linux.
+    """
+
+    _SLOT = struct.Struct("<Qdd")
+    _MAX_PROBES = 8
+
+    def __init__(self, name: str, slots: int):
+        """
+        Attach to (or create) the shared bucket table.
+
+        Args:
+            name: Bucket table file name
+            slots: Number of bucket slots in the table
+        """
+        self._slots = slots
+        size = slots * self._SLOT.size
+        self._lock_fd = os.open(
+            os.path.join(_shared_memory_dir(), name), os.O_RDWR | os.O_CREAT, 0o600
+        )
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            # Zero-filled when created or grown, and zero marks an empty slot
+            if os.fstat(self._lock_fd).st_size < size:
+                os.ftruncate(self._lock_fd, size)
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        self._map = mmap.mmap(self._lock_fd, size)
+        self._thread_lock = threading.Lock()
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        """Hash a bucket key to a non-zero 64-bit integer (zero marks an empty slot)."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little") or 1
+
+    def acquire(self, key: str, rate: float, capacity: float, cost: float = 1.0) -> float:
+        """Take `cost` tokens from the shared bucket for `key` (see LocalBucketStore.acquire)."""
+        key_hash = self._hash(key)
+        buf = self._map
+        with self._thread_lock:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                now = time.monotonic()
+                home = key_hash % self._slots
+                offset = None
+                tokens, updated = capacity, now
+                for probe in range(self._MAX_PROBES):
+                    candidate = ((home + probe) % self._slots) * self._SLOT.size
+                    slot_hash, slot_tokens, slot_updated = self._SLOT.unpack_from(buf, candidate)
+                    if slot_hash == key_hash:
+                        offset, tokens, updated = candidate, slot_tokens, slot_updated
+                        break
+                    if slot_hash == 0 and offset is None:
+                        offset = candidate
+                if offset is None:
+                    # Probe window is full: recycle the home slot with a fresh bucket
+                    offset = home * self._SLOT.size
+
+                tokens = min(capacity, tokens + (now - updated) * rate)
+                wait = 0.0
+                if tokens >= cost:
+                    tokens -= cost
+                else:
+                    wait = (cost - tokens) / rate
+                self._SLOT.pack_into(buf, offset, key_hash, tokens, now)
+                return wait
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """Per-API-key and per-source token-bucket limiter."""
+
+    def __init__(
+        self,
+        per_minute: int,
+        burst: Optional[int] = None,
+        per_source_per_minute: int = 0,
+        store=None,
+    ):
+        """
+        Initialize rate limiter.
+
+        Args:
+            per_minute: Sustained requests per minute for each API key
+            burst: Bucket capacity (defaults to per_minute)
+            per_source_per_minute: Sustained events per minute for each source (0 disables)
+            store: Bucket store (defaults to a process-local store)
+        """
+        self.per_minute = per_minute
+        self.burst = burst or per_minute
+        self.per_source_per_minute = per_source_per_minute
+        self.store = store or LocalBucketStore()
+
+    def _check(self, key: str, per_minute: int, capacity: int) -> None:
+        """Take one token for `key`, raising RateLimitError when the bucket is empty."""
+        wait = self.store.acquire(key, per_minute / 60.0, float(capacity))
+        if wait > 0:
+            raise RateLimitError(retry_after=max(1, math.ceil(wait)))
+
+    def check_key(self, api_key: str) -> None:
+        """
+        Enforce the per-API-key limit.
+
+        Raises:
+            RateLimitError: If the key has no tokens left
+        """
+        if self.per_minute > 0:
+            self._check(f"key:{api_key}", self.per_minute, self.burst)
+
+    def check_source(self, source: Optional[str]) -> None:
+        """
+        Enforce the per-source limit.
+
+        Raises:
+            RateLimitError: If the source has no tokens left
+        """
+        if source and self.per_source_per_minute > 0:
+            self._check(
+                f"source:{source}", self.per_source_per_minute, self.per_source_per_minute
+            )
+
+
+def _build_rate_limiter() -> RateLimiter:
+    """Create the rate limiter described by application settings."""
+    store = None
+    if settings.rate_limit_shared_memory:
+        try:
+            store = SharedMemoryBucketStore(
+                settings.rate_limit_shared_memory_name,
+                settings.rate_limit_shared_memory_slots,
+            )
+        except OSError as e:
+            logger.warning(f"Shared-memory rate limiting unavailable, using local buckets: {e}")
+    return RateLimiter(
+        per_minute=settings.rate_limit_per_minute,
+        burst=settings.rate_limit_burst,
+        per_source_per_minute=settings.rate_limit_per_source_per_minute,
+        store=store,
+    )
+
+
+# Global rate limiter instance
+rate_limiter = _build_rate_limiter()
+
+
+def client_address(request: Request) -> str:
+    """
+    Address of the caller, seen through RATE_LIMIT_TRUSTED_PROXIES proxies.
+
+    Each trusted proxy appends the address it was connected from to
+    X-Forwarded-For, so with N of them the caller is the N-th entry from the
+    end. Entries further left are client-supplied and ignored.
+    """
+    hops = settings.rate_limit_trusted_proxies
+    forwarded = request.headers.get("x-forwarded-for")
+    if hops > 0 and forwarded:
+        addresses = [address.strip() for address in forwarded.split(",") if address.strip()]
+        if addresses:
+            return addresses[-min(hops, len(addresses))]
+    return request.client.host if request.client else "unknown"
+
+
+async def enforce_rate_limit(request: Request) -> None:
+    """
+    Route dependency applying the per-API-key limit.
+
+    Callers without an API key are bucketed by client address (see client_address).
+    """
+    if not settings.rate_limit_enabled:
+        return
+    api_key = request.headers.get(settings.api_key_header)
+    if not api_key:
+        api_key = f"anonymous:{client_address(request)}"
+    rate_limiter.check_key(api_key)
+
+
+def enforce_source_rate_limit(source: Optional[str]) -> None:
+    """Apply the per-source limit if rate limiting is enabled."""
+    if settings.rate_limit_enabled:
+        rate_limiter.check_source(source)
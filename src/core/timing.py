@@ -0,0 +1,42 @@
+"""Per-request timing collected for the Server-Timing header."""
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Timings of the request handled in this context
+_current: ContextVar[Optional["RequestTimings"]] = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """DynamoDB time and call counts of one request."""
+
+    def __init__(self):
+        """Initialize empty timings."""
+        self.db_ms = 0.0
+        self.db_calls: Counter = Counter()
+        # DynamoDB calls may run on threadpool workers for the same request
+        self._lock = threading.Lock()
+
+    def record_db_call(self, operation: str, elapsed_ms: float) -> None:
+        """Add one DynamoDB call."""
+        with self._lock:
+            self.db_ms += elapsed_ms
+            self.db_calls[operation] += 1
+
+
+@contextmanager
+def collect_timings() -> Iterator[RequestTimings]:
+    """Collect timings for the request handled inside the block."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Return the timings of the request handled in this context, if any."""
+    return _current.get()
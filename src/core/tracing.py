@@ -0,0 +1,390 @@
+"""Lightweight request tracing with W3C traceparent propagation and tail sampling."""
+import functools
+import importlib
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_FLAG_SAMPLED = 0x01
+
+# Span that new spans in this context are children of
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, int]]:
+    """
+    Parse a W3C traceparent header.
+
+    Returns:
+        (trace_id, parent span id, flags), or None if absent or invalid
+    """
+    if not header:
+        return None
+    match = _TRACEPARENT.match(header.strip().lower())
+    if not match:
+        return None
+    version, trace_id, span_id, flags = match.groups()
+    if version == "ff" or trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return trace_id, span_id, int(flags, 16)
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "error", "_token")
+
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Optional[Dict[str, Any]] = None):
+        """Start a span now."""
+        self.trace = trace
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes or {}
+        self.error: Optional[str] = None
+        self._token: Any = None
+        trace.spans.append(self)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def end(self, error: Optional[str] = None) -> None:
+        """End the span (later calls are ignored)."""
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            if error:
+                self.error = error
+
+    def traceparent(self) -> str:
+        """Return a traceparent header naming this span as the parent."""
+        return f"00-{self.trace.trace_id}-{self.span_id}-{self.trace.flags:02x}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_unix_nano": self.start_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class Trace:
+    """All spans recorded for one request, buffered until the sampling decision."""
+
+    def __init__(self, trace_id: Optional[str] = None, remote_parent_id: Optional[str] = None, flags: int = _FLAG_SAMPLED):
+        """Initialize trace, continuing an upstream trace when its IDs are given."""
+        self.trace_id = trace_id or _new_id(16)
+        self.remote_parent_id = remote_parent_id
+        self.flags = flags
+        self.spans: List[Span] = []
+
+    def to_dict(self, root: Span, reason: str) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "remote_parent_span_id": self.remote_parent_id,
+            "name": root.name,
+            "duration_ms": round(root.duration_ms, 3),
+            "kept": reason,
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+
+class TailSampler:
+    """
+    Keep-or-drop decision made when a trace ends.
+
+    Errors and traces at least as slow as the threshold are always kept;
+    other traces are kept with probability `fast_sample_rate`. With no fixed
+    threshold, the threshold is the p99 of the last `window` trace durations.
+    """
+
+    def __init__(self, slow_threshold_ms: float = 0.0, fast_sample_rate: float = 0.01, window: int = 1024):
+        """
+        Initialize sampler.
+
+        Args:
+            slow_threshold_ms: Fixed threshold; 0 tracks the rolling p99
+            fast_sample_rate: Fraction of fast, successful traces kept
+            window: Recent durations used for the rolling p99
+        """
+        self.slow_threshold_ms = slow_threshold_ms
+        self.fast_sample_rate = fast_sample_rate
+        self._durations: Deque[float] = deque(maxlen=window)
+        self._recompute_every = max(1, window // 8)
+        self._since_recompute = 0
+        self._p99: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def threshold_ms(self) -> Optional[float]:
+        """Current slow threshold (None while the rolling p99 is warming up)."""
+        return self.slow_threshold_ms or self._p99
+
+    def decide(self, duration_ms: float, error: bool = False) -> Optional[str]:
+        """
+        Decide whether to keep a finished trace.
+
+        Returns:
+            Reason it is kept ("error", "slow" or "sampled"), or None to drop it
+        """
+        if not self.slow_threshold_ms:
+            with self._lock:
+                self._durations.append(duration_ms)
+                self._since_recompute += 1
+                if self._since_recompute >= self._recompute_every and len(self._durations) >= 100:
+                    ordered = sorted(self._durations)
+                    self._p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+                    self._since_recompute = 0
+        if error:
+            return "error"
+        threshold = self.threshold_ms
+        if threshold is not None and duration_ms >= threshold:
+            return "slow"
+        if self.fast_sample_rate > 0 and random.random() < self.fast_sample_rate:
+            return "sampled"
+        return None
+
+
+class ConsoleSink:
+    """Print kept traces as indented span trees."""
+
+    def __init__(self, stream: TextIO = sys.stderr):
+        """Initialize with an output stream."""
+        self.stream = stream
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        children: Dict[Optional[str], List[Dict[str, Any]]] = {}
+        for span in trace["spans"]:
+            children.setdefault(span["parent_span_id"], []).append(span)
+        lines = [f"trace {trace['trace_id']} {trace['name']} {trace['duration_ms']:.1f}ms ({trace['kept']})"]
+
+        def walk(parent_id: Optional[str], depth: int) -> None:
+            for span in sorted(children.get(parent_id, []), key=lambda span: span["start_unix_nano"]):
+                error = f" error={span['error']}" if span["error"] else ""
+                lines.append(f"{'  ' * depth}{span['name']} {span['duration_ms']:.2f}ms{error}")
+                walk(span["span_id"], depth + 1)
+
+        walk(trace["remote_parent_span_id"], 1)
+        print("\n".join(lines), file=self.stream, flush=True)
+
+
+class FileSink:
+    """Append kept traces to a JSONL file, one trace per line."""
+
+    def __init__(self, path: str):
+        """Initialize with the output path."""
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, trace: Dict[str, Any]) -> None:
+        line = json.dumps(trace, default=str)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def load_sink(spec: str) -> Any:
+    """
+    Build a sink from TRACING_SINK.
+
+    Accepts "console", "file:<path>", or "package.module:ClassName" for a
+    custom class whose instances have an `export(trace: dict)` method.
+    """
+    if spec == "console":
+        return ConsoleSink()
+    if spec.startswith("file:"):
+        return FileSink(spec[len("file:"):])
+    module_name, _, class_name = spec.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown tracing sink {spec!r}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class Tracer:
+    """Creates traces, applies tail sampling and exports kept traces off the request path."""
+
+    def __init__(self, sink: Any, sampler: TailSampler, queue_size: int = 1000):
+        """
+        Initialize tracer.
+
+        Args:
+            sink: Object with an `export(trace: dict)` method
+            sampler: Tail sampler deciding which traces are exported
+            queue_size: Kept traces buffered for export before new ones are dropped
+        """
+        self.sink = sink
+        self.sampler = sampler
+        self.dropped = 0
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=queue_size)
+        self._exporter: Optional[threading.Thread] = None
+        self._exporter_lock = threading.Lock()
+
+    def start_trace(self, name: str, traceparent: Optional[str] = None, **attributes: Any) -> Span:
+        """
+        Start a trace and make its root span current.
+
+        Args:
+            name: Root span name
+            traceparent: Incoming W3C traceparent header, continued if valid
+            **attributes: Root span attributes
+
+        Returns:
+            Root span; pass it to finish_trace when the request completes
+        """
+        parent = parse_traceparent(traceparent)
+        trace = Trace(*parent) if parent else Trace()
+        root = Span(trace, name, trace.remote_parent_id, attributes)
+        root._token = _current_span.set(root)
+        return root
+
+    def finish_trace(self, root: Span, error: Optional[str] = None) -> None:
+        """End the root span, reset the context and export the trace if the sampler keeps it."""
+        root.end(error)
+        _current_span.reset(root._token)
+        reason = self.sampler.decide(root.duration_ms, error=bool(root.error))
+        if reason is None:
+            return
+        self._ensure_exporter()
+        try:
+            self._queue.put_nowait(root.trace.to_dict(root, reason))
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_exporter(self) -> None:
+        if self._exporter is not None:
+            return
+        with self._exporter_lock:
+            if self._exporter is None:
+                self._exporter = threading.Thread(target=self._export_loop, name="trace-exporter", daemon=True)
+                self._exporter.start()
+
+    def _export_loop(self) -> None:
+        while True:
+            trace = self._queue.get()
+            try:
+                self.sink.export(trace)
+            except Exception as e:
+                logger.error(f"Trace export failed: {e}")
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Wait until queued traces are exported (for tests and shutdown)."""
+        deadline = time.monotonic() + timeout
+        while not self._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+
+def current_span() -> Optional[Span]:
+    """Return the current span, or None outside a traced request."""
+    return _current_span.get()
+
+
+def start_span(name: str, **attributes: Any) -> Optional[Span]:
+    """Start a child of the current span without making it current (None outside a trace)."""
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Run a block in a child span of the current span (a no-op outside a trace)."""
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator running a function in a span named `name` when called inside a trace."""
+
+    def decorate(function: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current_span.get() is None:
+                return function(*args, **kwargs)
+            with span(name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def outgoing_headers() -> Dict[str, str]:
+    """Headers propagating the current trace to an outbound HTTP call."""
+    current = _current_span.get()
+    return {"traceparent": current.traceparent()} if current is not None else {}
+
+
+def _on_call_start(model: Any, **kwargs: Any) -> None:
+    parent = _current_span.get()
+    if parent is not None:
+        call = Span(parent.trace, f"DynamoDB {model.name}", parent.span_id, {"aws.operation": model.name})
+        call._token = _current_span.set(call)
+
+
+def _on_call_end(model: Any, http_response: Any = None, exception: Any = None, **kwargs: Any) -> None:
+    call = _current_span.get()
+    if call is None or call.name != f"DynamoDB {model.name}" or call._token is None:
+        return
+    _current_span.reset(call._token)
+    status = getattr(http_response, "status_code", None)
+    if status is not None:
+        call.set_attribute("http.status_code", status)
+    error = type(exception).__name__ if exception is not None else (f"HTTP {status}" if status and status >= 300 else None)
+    call.end(error)
+
+
+def install_dynamodb_hooks(client: Any) -> None:
+    """Record each DynamoDB API call made through a botocore client as a span."""
+    events = client.meta.events
+    # Registered first so the span opens before any handler that answers the call
+    events.register_first("before-call.dynamodb", _on_call_start, unique_id="tracing-call-start")
+    events.register("after-call.dynamodb", _on_call_end, unique_id="tracing-call-end")
+    events.register("after-call-error.dynamodb", _on_call_end, unique_id="tracing-call-error")
+
+
+tracer = Tracer(
+    sink=load_sink(settings.tracing_sink) if settings.tracing_enabled else ConsoleSink(),
+    sampler=TailSampler(settings.tracing_slow_threshold_ms, settings.tracing_fast_sample_rate),
+)
@@ -0,0 +1,442 @@
+"""Webhook push delivery: each subscription's events POSTed to its URL in batches."""
+import asyncio
+import logging
+import random
+import time
+import uuid
+from contextlib import suppress
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from src.core import tracing
+from src.core.config import settings
+from src.core.database import (
+    DELIVERED_STATUSES,
+    DynamoDBClient,
+    db,
+    subscription_filter,
+    subscription_group,
+    subscription_inbox_status,
+)
+from src.core.histogram import LatencyHistogram
+from src.core.ids import unix_ms_from_sort_key
+from src.models.event import EventItem
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, base: float, cap: float, rng: Any = random) -> float:
+    """
+    Full-jitter exponential backoff.
+
+    Returns a delay drawn uniformly from [0, min(cap, base * 2 ** attempt)], so
+    subscribers failing together do not retry in lockstep.
+    """
+    return rng.uniform(0, min(cap, base * 2**attempt))
+
+
+def _retry_after(response: Optional[httpx.Response]) -> Optional[float]:
+    """Seconds asked for by a numeric Retry-After header, if any."""
+    if response is None:
+        return None
+    try:
+        return max(0.0, float(response.headers["retry-after"]))
+    except (KeyError, ValueError):
+        return None
+
+
+def _event_body(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Render a stored event as it appears in a webhook POST (the inbox representation)."""
+    return EventItem(
+        id=event["event_id"],
+        timestamp=event["timestamp"],
+        payload=event["payload"],
+        source=event.get("source"),
+        tags=event.get("tags"),
+        group_key=event.get("group_key"),
+        priority=event.get("priority"),
+        status=event["status"],
+    ).model_dump(mode="json")
+
+
+class DeliveryStats:
+    """Delivery counters and latency histograms for one subscription."""
+
+    def __init__(self):
+        """Initialize counters."""
+        self.started = time.monotonic()
+        self.delivered = 0
+        self.batches = 0
+        self.failed = 0
+        self.retries = 0
+        self.status_codes: Dict[str, int] = {}
+        # One POST, request sent to response read
+        self.request_latency = LatencyHistogram()
+        # Event availability (creation, or deliver_after) to its successful POST
+        self.delivery_lag = LatencyHistogram()
+
+    def record_attempt(self, status_code: Optional[int], latency_us: int) -> None:
+        """Record one POST (status_code None for transport errors)."""
+        self.request_latency.record(latency_us)
+        key = str(status_code) if status_code is not None else "error"
+        self.status_codes[key] = self.status_codes.get(key, 0) + 1
+
+    def record_delivery(self, batch: List[Dict[str, Any]]) -> None:
+        """Record a batch acknowledged by the subscriber."""
+        now_ms = time.time() * 1000
+        self.batches += 1
+        self.delivered += len(batch)
+        for event in batch:
+            available_ms = unix_ms_from_sort_key(int(event["created_at"]))
+            self.delivery_lag.record(int((now_ms - available_ms) * 1000))
+
+    def summary(self) -> Dict[str, Any]:
+        """Return counters, throughput and latency percentiles (milliseconds)."""
+        elapsed = time.monotonic() - self.started
+        return {
+            "delivered": self.delivered,
+            "batches": self.batches,
+            "failed": self.failed,
+            "retries": self.retries,
+            "status_codes": dict(self.status_codes),
+            "elapsed_s": round(elapsed, 3),
+            "events_per_second": round(self.delivered / elapsed, 1) if elapsed else 0.0,
+            "request_latency": {
+                key: round(value, 3) for key, value in self.request_latency.summary().items()
+            },
+            "delivery_lag": {
+                key: round(value, 3) for key, value in self.delivery_lag.summary().items()
+            },
+        }
+
+
+class SubscriberWorker:
+    """
+    Push one subscription's events to its URL.
+
+    Events are read oldest first through the subscription's consumer group,
+    a page of `batch_size * max_in_flight` at a time, and POSTed as up to
+    `max_in_flight` concurrent batches over one pooled keep-alive client.
+    Failed POSTs (transport errors, 408, 429 and 5xx) are retried with
+    full-jitter exponential backoff; a batch still failing after
+    WEBHOOK_MAX_ATTEMPTS, or rejected with another 4xx, stays unacknowledged
+    and the next page, after WEBHOOK_POLL_INTERVAL_SECONDS, starts from it.
+
+    A 2xx acknowledges the batch for the group: the delivered prefix of a
+    page with one cumulative checkpoint write, and batches delivered after a
+    failed one with one batch of ack records.
+
+    A subscription with a filter reads the inbox entries written for it at
+    ingest instead of every event partition.
+
+    Only the worker holding the subscription's dispatch lease delivers (see
+    `DynamoDBClient.hold_dispatch_lease`); it renews the lease every third of
+    WEBHOOK_LEASE_SECONDS, and workers in other processes retry as often
+    until it lapses.
+    """
+
+    def __init__(
+        self,
+        subscription: Dict[str, Any],
+        database: Optional[DynamoDBClient] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            subscription: Subscription item from the registry
+            database: Client to read and acknowledge through (default: the global `db`)
+            transport: Optional httpx transport (for tests); default is the network
+        """
+        self.id = subscription["subscription_id"]
+        self.url = subscription["url"]
+        self.source = subscription.get("source")
+        self.statuses = DELIVERED_STATUSES
+        if subscription_filter(subscription) is not None:
+            # The filter already covers the source
+            self.source = None
+            self.statuses = (subscription_inbox_status(self.id),)
+        self.batch_size = int(subscription.get("batch_size", 10))
+        self.max_in_flight = int(subscription.get("max_in_flight", 4))
+        self.group = subscription_group(self.id)
+        self.db = database or db
+        self.stats = DeliveryStats()
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_in_flight,
+                max_keepalive_connections=self.max_in_flight,
+                keepalive_expiry=settings.webhook_keepalive_seconds,
+            ),
+            timeout=settings.webhook_timeout_seconds,
+            transport=transport,
+        )
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._wakeup = asyncio.Event()
+        self._random = random.Random()
+        self._cursor: Optional[str] = None
+        self.owner = uuid.uuid4().hex
+        self.leased = False
+        self._renew_at = 0.0
+
+    def wake(self) -> None:
+        """Cut the idle wait short, e.g. after an event was created in this process."""
+        if self.leased:
+            self._wakeup.set()
+
+    async def run(self) -> None:
+        """
+        Deliver until cancelled while holding the dispatch lease.
+
+        Waits WEBHOOK_POLL_INTERVAL_SECONDS when idle, and a third of
+        WEBHOOK_LEASE_SECONDS between attempts to take the lease.
+        """
+        try:
+            while True:
+                self._wakeup.clear()
+                try:
+                    busy = await self.hold_lease() and await self._deliver_leased()
+                except Exception as e:
+                    logger.error(f"Webhook {self.id}: delivery failed: {e}", exc_info=True)
+                    busy = False
+                if not busy:
+                    with suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(
+                            self._wakeup.wait(),
+                            settings.webhook_poll_interval_seconds
+                            if self.leased
+                            else settings.webhook_lease_seconds / 3,
+                        )
+        finally:
+            if self.leased:
+                with suppress(Exception):
+                    await asyncio.to_thread(self.db.release_dispatch_lease, self.id, self.owner)
+            await self.client.aclose()
+
+    async def hold_lease(self) -> bool:
+        """
+        Take the dispatch lease, or renew it once a third of it has run.
+
+        Returns:
+            Whether this worker holds the lease
+        """
+        if self.leased and time.monotonic() < self._renew_at:
+            return True
+        self._renew_at = time.monotonic() + settings.webhook_lease_seconds / 3
+        leased = await asyncio.to_thread(
+            self.db.hold_dispatch_lease, self.id, self.owner, settings.webhook_lease_seconds
+        )
+        if leased and not self.leased:
+            # Another process may have delivered past the cursor held from an earlier lease
+            self._cursor = None
+            logger.info(f"Webhook {self.id}: delivering from this process")
+        elif self.leased and not leased:
+            logger.warning(f"Webhook {self.id}: dispatch lease taken over by another process")
+        self.leased = leased
+        return leased
+
+    async def _deliver_leased(self) -> bool:
+        """Deliver the next page, renewing the lease while it is in flight."""
+
+        async def renew() -> None:
+            while self.leased:
+                await asyncio.sleep(max(self._renew_at - time.monotonic(), 0))
+                try:
+                    await self.hold_lease()
+                except Exception as e:
+                    logger.error(f"Webhook {self.id}: failed to renew dispatch lease: {e}")
+
+        renewal = asyncio.create_task(renew())
+        try:
+            return await self.deliver_page()
+        finally:
+            renewal.cancel()
+            # Not suppress(CancelledError): that would also swallow this task's own cancellation
+            await asyncio.gather(renewal, return_exceptions=True)
+
+    async def deliver_page(self) -> bool:
+        """
+        Deliver the next page of events.
+
+        Returns:
+            Whether to read again at once (False when caught up or a batch failed)
+        """
+        events, next_cursor = await asyncio.to_thread(
+            self.db.get_group_events,
+            self.group,
+            self.batch_size * self.max_in_flight,
+            self._cursor,
+            self.source,
+            None,
+            self.statuses,
+        )
+        if not events:
+            if next_cursor:
+                # A page of filtered-out or already acknowledged events
+                self._cursor = next_cursor
+                return True
+            return False
+
+        batches = [
+            events[start : start + self.batch_size]
+            for start in range(0, len(events), self.batch_size)
+        ]
+        results = await asyncio.gather(*(self._deliver(batch) for batch in batches))
+        prefix = 0
+        while prefix < len(batches) and results[prefix]:
+            prefix += 1
+        if prefix:
+            await asyncio.to_thread(
+                self.db.commit_group_checkpoint,
+                batches[prefix - 1][-1]["event_id"],
+                self.group,
+                self.statuses,
+                self.source,
+            )
+        acked = [
+            event
+            for batch, delivered in zip(batches[prefix:], results[prefix:])
+            if delivered
+            for event in batch
+        ]
+        if acked:
+            await asyncio.to_thread(
+                self.db.acknowledge_group_events, acked, self.group, self.statuses, self.source
+            )
+        if prefix < len(batches):
+            # Read again from the first failed batch; the acked ones after it are passed over
+            if prefix:
+                self._cursor = str(batches[prefix - 1][-1]["created_at"])
+            return False
+        self._cursor = next_cursor or str(events[-1]["created_at"])
+        return True
+
+    async def _deliver(self, batch: List[Dict[str, Any]]) -> bool:
+        """POST one batch, retrying with backoff; returns whether it was acknowledged."""
+        body = {"subscription_id": self.id, "events": [_event_body(event) for event in batch]}
+        async with self._slots:
+            for attempt in range(settings.webhook_max_attempts):
+                started = time.perf_counter()
+                response: Optional[httpx.Response] = None
+                try:
+                    response = await self.client.post(
+                        self.url, json=body, headers=tracing.outgoing_headers()
+                    )
+                except httpx.HTTPError as e:
+                    logger.debug(f"Webhook {self.id}: POST failed: {e}")
+                self.stats.record_attempt(
+                    response.status_code if response is not None else None,
+                    int((time.perf_counter() - started) * 1_000_000),
+                )
+                if response is not None and response.is_success:
+                    self.stats.record_delivery(batch)
+                    return True
+                if response is not None and response.status_code < 500 and (
+                    response.status_code not in (408, 429)
+                ):
+                    break
+                if attempt + 1 == settings.webhook_max_attempts:
+                    break
+                delay = backoff_delay(
+                    attempt,
+                    settings.webhook_backoff_base_seconds,
+                    settings.webhook_backoff_max_seconds,
+                    self._random,
+                )
+                retry_after = _retry_after(response)
+                if retry_after is not None:
+                    delay = max(delay, min(retry_after, settings.webhook_backoff_max_seconds))
+                self.stats.retries += 1
+                await asyncio.sleep(delay)
+        self.stats.failed += len(batch)
+        logger.warning(
+            f"Webhook {self.id}: {len(batch)} event(s) from {batch[0]['event_id']} not delivered "
+            f"(last status: {response.status_code if response is not None else 'no response'})"
+        )
+        return False
+
+
+class WebhookDispatcher:
+    """Run a SubscriberWorker task per registered subscription."""
+
+    def __init__(
+        self,
+        database: Optional[DynamoDBClient] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize dispatcher.
+
+        Args:
+            database: Client holding the registry (default: the global `db`)
+            transport: Optional httpx transport handed to every worker (for tests)
+        """
+        self.database = database
+        self.transport = transport
+        self.workers: Dict[str, Tuple[SubscriberWorker, "asyncio.Task[None]"]] = {}
+        self._refresher: Optional["asyncio.Task[None]"] = None
+
+    @property
+    def running(self) -> bool:
+        return self._refresher is not None
+
+    async def start(self) -> None:
+        """Start workers for the registered subscriptions and keep them in sync."""
+        if self.running:
+            return
+        await self.refresh()
+        self._refresher = asyncio.create_task(self._refresh_loop(), name="webhook-refresh")
+
+    async def stop(self) -> None:
+        """Stop every worker and close their connections."""
+        if self._refresher is not None:
+            self._refresher.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._refresher
+            self._refresher = None
+        for subscription_id in list(self.workers):
+            await self._stop_worker(subscription_id)
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.webhook_refresh_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Failed to refresh webhook subscriptions: {e}")
+
+    async def refresh(self) -> None:
+        """Re-read the registry, starting and stopping workers to match it."""
+        subscriptions = await asyncio.to_thread((self.database or db).list_subscriptions)
+        current = {subscription["subscription_id"]: subscription for subscription in subscriptions}
+        for subscription_id in list(self.workers):
+            if subscription_id not in current:
+                await self._stop_worker(subscription_id)
+        for subscription_id, subscription in current.items():
+            if subscription_id not in self.workers:
+                worker = SubscriberWorker(subscription, self.database, self.transport)
+                task = asyncio.create_task(worker.run(), name=f"webhook-{subscription_id}")
+                self.workers[subscription_id] = (worker, task)
+
+    async def _stop_worker(self, subscription_id: str) -> None:
+        worker, task = self.workers.pop(subscription_id)
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    def wake(self) -> None:
+        """Have idle workers read again now instead of after their poll interval."""
+        for worker, _ in self.workers.values():
+            worker.wake()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Delivery metrics of each subscription served by this process."""
+        return {
+            subscription_id: {**worker.stats.summary(), "leased": worker.leased}
+            for subscription_id, (worker, _) in self.workers.items()
+        }
+
+
+# Global dispatcher, started by the app when WEBHOOKS_ENABLED
+dispatcher = WebhookDispatcher()
@@ -6,9 +6,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from src.api.middleware.compression import CompressionMiddleware
+from src.api.middleware.profiling import ProfilingMiddleware
+from src.api.middleware.tracing import TracingMiddleware
 from src.core.config import settings
+from src.core.database import db
 from src.core.exceptions import APIException
-from src.api.routes import events
+from src.core import profiling, tracing
+from src.core.webhooks import dispatcher
+from src.api.routes import events, subscriptions
 from src.models.event import ErrorResponse
 
 # Configure logging
@@ -26,11 +32,15 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
     logger.info(f"DynamoDB table: {settings.dynamodb_table_name}")
     logger.info(f"AWS Region: {settings.aws_region}")
+    if settings.webhooks_enabled:
+        await dispatcher.start()
+        logger.info(f"Webhook dispatcher started ({len(dispatcher.workers)} subscriptions)")
 
     yield
 
     # Shutdown
     logger.info("Shutting down application")
+    await dispatcher.stop()
 
 
 # Create FastAPI app
@@ -50,6 +60,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Response compression
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        paths=settings.compression_paths_list,
+        minimum_size=settings.compression_minimum_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+        offload_size=settings.compression_offload_size,
+    )
+
 
 # Global exception handler
 @app.exception_handler(APIException)
@@ -58,6 +79,7 @@ async def api_exception_handler(request, exc: APIException):
     return JSONResponse(
         status_code=exc.status_code,
         content=exc.detail,
+        headers=exc.headers,
     )
 
 
@@ -87,8 +109,18 @@ async def health_check():
     }
 
 
+@app.get("/metrics", tags=["health"])
+async def metrics():
+    """In-process cache metrics (and webhook delivery metrics) for this worker."""
+    metrics = db.cache_metrics()
+    if dispatcher.running:
+        metrics["webhooks"] = dispatcher.metrics()
+    return metrics
+
+
 # Include routers
 app.include_router(events.router)
+app.include_router(subscriptions.router)
 
 # Add middleware to log all requests
 @app.middleware("http")
@@ -100,6 +132,25 @@ async def log_requests(request, call_next):
     return response
 
 
+# Tracing, wrapping the application middleware so the root span covers them
+if settings.tracing_enabled:
+    tracing.install_dynamodb_hooks(db.dynamodb.meta.client)
+    app.add_middleware(TracingMiddleware, tracer=tracing.tracer)
+
+# Request profiling, added last so it wraps every other middleware
+if settings.profiling_enabled:
+    profiling.install_dynamodb_hooks(db.dynamodb.meta.client)
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.profiling_dir,
+        mode=settings.profiling_mode,
+        sample_rate=settings.profiling_sample_rate,
+        header=settings.profiling_header,
+        token=settings.profiling_token,
+        interval_ms=settings.profiling_interval_ms,
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
 
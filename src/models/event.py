@@ -1,6 +1,6 @@
 """Pydantic models for events."""
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator
@@ -13,6 +13,19 @@ class EventRequest(BaseModel):
     source: Optional[str] = Field(None, description="Optional source identifier")
     tags: Optional[List[str]] = Field(None, description="Optional list of tags")
     metadata: Optional[Dict[str, Any]] = Field(None, description="Optional additional metadata")
+    group_key: Optional[str] = Field(
+        None,
+        min_length=1,
+        max_length=128,
+        description="Optional FIFO group; its events are received in order, one batch at a time",
+    )
+    priority: Literal["high", "normal", "low"] = Field(
+        "normal", description="Priority lane; the priority inbox drains higher lanes first"
+    )
+    deliver_after: Optional[datetime] = Field(
+        None,
+        description="Optional ISO 8601 time before which the event is kept out of the inbox",
+    )
 
     @field_validator("payload")
     @classmethod
@@ -34,7 +47,7 @@ class EventRequest(BaseModel):
 class EventResponse(BaseModel):
     """Response model for event creation."""
 
-    event_id: str = Field(..., description="Unique event identifier (UUID)")
+    event_id: str = Field(..., description="Unique event identifier (time-ordered UUIDv7)")
     status: str = Field(..., description="Event status")
     timestamp: str = Field(..., description="ISO 8601 timestamp")
     message: str = Field(..., description="Success message")
@@ -48,6 +61,8 @@ class EventItem(BaseModel):
     payload: Dict[str, Any] = Field(..., description="Event payload")
     source: Optional[str] = Field(None, description="Source identifier")
     tags: Optional[List[str]] = Field(None, description="Optional list of tags")
+    group_key: Optional[str] = Field(None, description="FIFO group, if any")
+    priority: Optional[str] = Field(None, description="Priority lane")
     status: str = Field(..., description="Event status")
 
 
@@ -58,6 +73,10 @@ class InboxResponse(BaseModel):
     total: int = Field(..., description="Total number of events")
     limit: int = Field(..., description="Limit applied")
     offset: int = Field(..., description="Offset applied")
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque token to pass as 'cursor' for the next page, if there may be one",
+    )
 
 
 class AcknowledgeResponse(BaseModel):
@@ -68,11 +87,123 @@ class AcknowledgeResponse(BaseModel):
     message: str = Field(..., description="Success message")
 
 
+class CheckpointRequest(BaseModel):
+    """Request model for committing a checkpoint."""
+
+    event_id: str = Field(
+        ..., description="Newest event to acknowledge; everything before it is acknowledged too"
+    )
+
+
+class CheckpointResponse(BaseModel):
+    """Response model for a checkpoint."""
+
+    event_id: str = Field(..., description="Newest acknowledged event")
+    timestamp: str = Field(..., description="ISO 8601 creation time of that event")
+    advanced: bool = Field(..., description="Whether this request moved the checkpoint forward")
+
+
+class ReceiveRequest(BaseModel):
+    """Request model for leasing events."""
+
+    max_events: int = Field(10, ge=1, le=100, description="Maximum number of events to lease")
+    visibility_timeout: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Seconds the events stay hidden from other receivers (default if omitted)",
+    )
+    source: Optional[str] = Field(None, description="Only lease events from this source")
+    mode: Literal["lease", "ack"] = Field(
+        "lease",
+        description=(
+            "'lease' (at-least-once: ack each event or let its lease expire) or "
+            "'ack' (at-most-once: events are acknowledged as they are returned)"
+        ),
+    )
+
+
+class LeasedEventItem(EventItem):
+    """Model for an event handed to a receiver."""
+
+    lease_id: Optional[str] = Field(
+        None, description="Lease ID; pass it to extend or release the lease (lease mode only)"
+    )
+    leased_until: Optional[str] = Field(
+        None, description="ISO 8601 time the lease expires (lease mode only)"
+    )
+    receive_count: int = Field(..., description="Number of times the event has been leased")
+
+
+class ReceiveResponse(BaseModel):
+    """Response model for leasing events."""
+
+    events: List[LeasedEventItem] = Field(..., description="Received events, oldest first")
+
+
+class LeaseRequest(BaseModel):
+    """Request model for extending or releasing a lease."""
+
+    lease_id: str = Field(..., description="Lease ID returned by receive")
+    visibility_timeout: int = Field(
+        ..., ge=0, description="New lease length in seconds from now; 0 releases the event"
+    )
+
+
+class LeaseResponse(BaseModel):
+    """Response model for a lease extension."""
+
+    event_id: str = Field(..., description="Event ID")
+    lease_id: str = Field(..., description="Lease ID")
+    leased_until: str = Field(..., description="ISO 8601 time the lease expires")
+
+
+class DeadLetterItem(EventItem):
+    """Model for a dead-lettered event."""
+
+    receive_count: int = Field(..., description="Number of times the event was leased")
+    dead_lettered_at: Optional[str] = Field(
+        None, description="ISO 8601 time the event was moved to the dead-letter partition"
+    )
+
+
+class DeadLetterResponse(BaseModel):
+    """Response model for listing dead-lettered events."""
+
+    events: List[DeadLetterItem] = Field(..., description="Dead-lettered events, oldest first")
+    limit: int = Field(..., description="Limit applied")
+    next_cursor: Optional[str] = Field(
+        None, description="Pass as `cursor` to fetch the next page; null on the last page"
+    )
+
+
+class RedriveRequest(BaseModel):
+    """Request model for moving dead-lettered events back to pending."""
+
+    event_ids: Optional[List[str]] = Field(
+        None, min_length=1, max_length=100, description="Events to redrive (default: the oldest)"
+    )
+    max_events: int = Field(
+        100, ge=1, le=1000, description="Maximum number of events to redrive without event_ids"
+    )
+    source: Optional[str] = Field(
+        None, description="Only redrive dead letters from this source (without event_ids)"
+    )
+
+
+class RedriveResponse(BaseModel):
+    """Response model for a dead-letter redrive."""
+
+    redriven: int = Field(..., description="Number of events moved back to pending")
+    event_ids: List[str] = Field(..., description="IDs of the events moved back to pending")
+
+
 class StatsResponse(BaseModel):
     """Response model for event statistics."""
 
     pending: int = Field(..., description="Number of pending events")
     acknowledged: int = Field(..., description="Number of acknowledged events")
+    scheduled: int = Field(0, description="Number of pending events not yet due for delivery")
+    dead_letter: int = Field(0, description="Number of dead-lettered events")
     total: int = Field(..., description="Total number of events")
 
 
@@ -0,0 +1,47 @@
+"""Pydantic models for webhook subscriptions."""
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class SubscriptionRequest(BaseModel):
+    """Request model for registering a webhook subscription."""
+
+    url: str = Field(
+        ..., pattern=r"^https?://", max_length=2048, description="Endpoint events are POSTed to"
+    )
+    source: Optional[str] = Field(None, description="Only push events from this source")
+    filter: Optional[Dict[str, Any]] = Field(
+        None,
+        description=(
+            "Only push events matching this pattern: lists of allowed values for source, tags, "
+            'priority, group_key and (nested) payload fields, e.g. {"tags": ["urgent"], '
+            '"payload": {"customer": {"tier": ["gold"]}}}'
+        ),
+    )
+    batch_size: int = Field(10, ge=1, le=100, description="Maximum events per POST")
+    max_in_flight: int = Field(
+        4, ge=1, le=32, description="Maximum concurrent POSTs (and pooled connections)"
+    )
+
+
+class SubscriptionResponse(BaseModel):
+    """Response model for a webhook subscription."""
+
+    subscription_id: str = Field(..., description="Subscription ID")
+    url: str = Field(..., description="Endpoint events are POSTed to")
+    source: Optional[str] = Field(None, description="Source filter, if any")
+    filter: Optional[Dict[str, Any]] = Field(None, description="Filter pattern, if any")
+    batch_size: int = Field(..., description="Maximum events per POST")
+    max_in_flight: int = Field(..., description="Maximum concurrent POSTs")
+    group: str = Field(..., description="Consumer group the subscription reads and acks through")
+    created_at: str = Field(..., description="ISO 8601 registration time")
+    delivery: Optional[Dict[str, Any]] = Field(
+        None, description="Delivery metrics, when this process runs the subscription's worker"
+    )
+
+
+class SubscriptionListResponse(BaseModel):
+    """Response model for listing webhook subscriptions."""
+
+    subscriptions: List[SubscriptionResponse] = Field(..., description="Subscriptions, oldest first")
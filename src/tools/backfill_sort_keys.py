@@ -0,0 +1,87 @@
+"""Rewrite events stored with unix-second `created_at` values to time-ordered sort keys.
+
+Events written before `created_at` became a millisecond sort key (see
+src.core.ids) sort below every newer event, so `since` filters, cursors and
+checkpoints skip them. Run once after upgrading:
+
+    python -m src.tools.backfill_sort_keys [--dry-run]
+
+Each rewrite is conditional on the old value, so the backfill is safe to run
+against a live table and to re-run after an interruption.
+"""
+import argparse
+import logging
+import sys
+from typing import Any, Dict, List, Optional
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from src.core.database import DynamoDBClient
+from src.core.ids import LEGACY_SORT_KEY_LIMIT, legacy_sort_key
+
+logger = logging.getLogger(__name__)
+
+
+def backfill(db: DynamoDBClient, dry_run: bool = False, page_size: int = 500) -> Dict[str, int]:
+    """
+    Rewrite the `created_at` of every legacy event item.
+
+    Returns:
+        Counts of `scanned`, `updated` and `skipped` (changed concurrently) items
+    """
+    counts = {"scanned": 0, "updated": 0, "skipped": 0}
+    kwargs: Dict[str, Any] = {
+        "FilterExpression": Attr("payload").exists() & Attr("created_at").lt(LEGACY_SORT_KEY_LIMIT),
+        "Limit": page_size,
+    }
+    while True:
+        response = db.table.scan(**kwargs)
+        for item in response.get("Items", []):
+            old = int(item["created_at"])
+            counts["scanned"] += 1
+            if dry_run:
+                continue
+            try:
+                db.table.update_item(
+                    Key={"event_id": item["event_id"]},
+                    UpdateExpression="SET created_at = :key",
+                    ConditionExpression="created_at = :old",
+                    ExpressionAttributeValues={
+                        ":key": legacy_sort_key(old, item["event_id"]),
+                        ":old": item["created_at"],
+                    },
+                )
+                counts["updated"] += 1
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                    raise
+                counts["skipped"] += 1
+        last_key = response.get("LastEvaluatedKey")
+        if not last_key:
+            return counts
+        kwargs["ExclusiveStartKey"] = last_key
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.backfill_sort_keys",
+        description="Rewrite legacy unix-second created_at values to time-ordered sort keys.",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Count legacy events without writing")
+    parser.add_argument("--page-size", type=int, default=500, help="Items requested per scan page")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    counts = backfill(DynamoDBClient(), dry_run=args.dry_run, page_size=args.page_size)
+    print(
+        f"{counts['scanned']} legacy events, {counts['updated']} updated, "
+        f"{counts['skipped']} changed concurrently",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1046 @@
+"""In-process DynamoDB stand-in for benchmarks and local runs.
+
+The fake answers DynamoDB calls inside botocore (on the `before-call` event),
+so the real `DynamoDBClient`, boto3 resource layer and botocore parameter
+validation and serialization all run unchanged; only the network round trip
+is replaced. Supported operations: PutItem, GetItem, UpdateItem, DeleteItem,
+Query (table or index), Scan, BatchWriteItem and BatchGetItem, including
+condition, filter, update, key condition and projection expressions.
+
+Latency and throttling can be injected, either randomly (seeded, so runs are
+repeatable) or for the next N calls of an operation.
+
+Known gaps: the 1 MB page limit, consumed capacity, transactions and the
+reserved word list are not modelled.
+"""
+import base64
+import bisect
+import copy
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from decimal import Decimal
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from boto3.dynamodb.types import DYNAMODB_CONTEXT, Binary, TypeSerializer
+from botocore.awsrequest import AWSResponse
+
+from src.core.config import settings
+
+# Global secondary indexes of the events table: name -> (hash key, range key)
+EVENTS_INDEXES: Dict[str, Tuple[str, Optional[str]]] = {
+    "status-created_at-index": ("status", "created_at"),
+    "lane-created_at-index": ("lane", "created_at"),
+}
+
+THROTTLE_ERROR = "ProvisionedThroughputExceededException"
+_MAX_BATCH_WRITE = 25
+_MAX_BATCH_GET = 100
+
+_MISSING = object()
+_serializer = TypeSerializer()
+
+
+class FakeDynamoDBError(Exception):
+    """An error returned to the caller as a DynamoDB error response."""
+
+    def __init__(self, code: str, message: str, item: Optional[Dict[str, Any]] = None):
+        """Initialize with the DynamoDB error code and message."""
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.item = item
+
+
+def _validation(message: str) -> FakeDynamoDBError:
+    return FakeDynamoDBError("ValidationException", message)
+
+
+# Wire format conversion -----------------------------------------------------
+
+
+def _from_wire(value: Dict[str, Any]) -> Any:
+    """Convert a wire-format attribute value to a Python value."""
+    (kind, data), = value.items()
+    if kind == "S":
+        return data
+    if kind == "N":
+        return DYNAMODB_CONTEXT.create_decimal(data)
+    if kind == "B":
+        return Binary(base64.b64decode(data))
+    if kind == "BOOL":
+        return data
+    if kind == "NULL":
+        return None
+    if kind == "M":
+        return {key: _from_wire(item) for key, item in data.items()}
+    if kind == "L":
+        return [_from_wire(item) for item in data]
+    if kind == "SS":
+        return set(data)
+    if kind == "NS":
+        return {DYNAMODB_CONTEXT.create_decimal(item) for item in data}
+    if kind == "BS":
+        return {Binary(base64.b64decode(item)) for item in data}
+    raise _validation(f"Unsupported attribute type {kind}")
+
+
+def _item_from_wire(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: _from_wire(value) for key, value in item.items()}
+
+
+def _item_to_wire(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: _serializer.serialize(value) for key, value in item.items()}
+
+
+# Expressions ----------------------------------------------------------------
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<name>#[A-Za-z0-9_]+)|(?P<value>:[A-Za-z0-9_]+)|(?P<ident>[A-Za-z_][A-Za-z0-9_]*)"
+    r"|(?P<number>\d+)|(?P<op><>|<=|>=|[=<>(),.\[\]+-]))"
+)
+_COMPARATORS = {"=", "<>", "<", "<=", ">", ">="}
+_CONDITION_FUNCTIONS = {"attribute_exists", "attribute_not_exists", "attribute_type", "begins_with", "contains"}
+_UPDATE_CLAUSES = {"SET", "REMOVE", "ADD", "DELETE"}
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise _validation(f"Invalid expression near '{text[position:position + 20]}'")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing tuple ASTs for DynamoDB expressions."""
+
+    def __init__(self, text: str, names: Dict[str, str], values: Dict[str, Any]):
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.names = names
+        self.values = values
+
+    def _peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def _next(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token[0] is None:
+            raise _validation("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def _accept(self, text: str) -> bool:
+        kind, value = self._peek()
+        if kind is not None and value.upper() == text.upper() and kind in ("op", "ident"):
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, text: str) -> None:
+        if not self._accept(text):
+            raise _validation(f"Expected '{text}' in expression, got '{self._peek()[1]}'")
+
+    def done(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    def _is_call(self, names: Any) -> bool:
+        kind, value = self._peek()
+        return kind == "ident" and value.lower() in names and self._peek(1)[1] == "("
+
+    # Paths and operands
+
+    def path(self) -> Tuple[Any, ...]:
+        elements: List[Any] = [self._name()]
+        while True:
+            if self._accept("."):
+                elements.append(self._name())
+            elif self._accept("["):
+                kind, value = self._next()
+                if kind != "number":
+                    raise _validation("List index must be a number")
+                elements.append(int(value))
+                self._expect("]")
+            else:
+                return tuple(elements)
+
+    def _name(self) -> str:
+        kind, value = self._next()
+        if kind == "name":
+            if value not in self.names:
+                raise _validation(f"Expression attribute name {value} is not defined")
+            return self.names[value]
+        if kind == "ident":
+            return value
+        raise _validation(f"Expected an attribute name, got '{value}'")
+
+    def operand(self) -> Tuple[Any, ...]:
+        kind, value = self._peek()
+        if kind == "value":
+            self.position += 1
+            if value not in self.values:
+                raise _validation(f"Expression attribute value {value} is not defined")
+            return ("value", self.values[value])
+        if self._is_call({"size"}):
+            self._next()
+            self._expect("(")
+            path = self.path()
+            self._expect(")")
+            return ("size", path)
+        return ("path", self.path())
+
+    # Conditions
+
+    def condition(self) -> Tuple[Any, ...]:
+        node = self._and()
+        while self._accept("OR"):
+            node = ("or", node, self._and())
+        return node
+
+    def _and(self) -> Tuple[Any, ...]:
+        node = self._not()
+        while self._accept("AND"):
+            node = ("and", node, self._not())
+        return node
+
+    def _not(self) -> Tuple[Any, ...]:
+        if self._accept("NOT"):
+            return ("not", self._not())
+        return self._primary()
+
+    def _primary(self) -> Tuple[Any, ...]:
+        if self._accept("("):
+            node = self.condition()
+            self._expect(")")
+            return node
+        if self._is_call(_CONDITION_FUNCTIONS):
+            name = self._next()[1].lower()
+            self._expect("(")
+            args = [self.operand()]
+            while self._accept(","):
+                args.append(self.operand())
+            self._expect(")")
+            return ("function", name, args)
+        left = self.operand()
+        if self._accept("BETWEEN"):
+            low = self.operand()
+            self._expect("AND")
+            return ("between", left, low, self.operand())
+        if self._accept("IN"):
+            self._expect("(")
+            options = [self.operand()]
+            while self._accept(","):
+                options.append(self.operand())
+            self._expect(")")
+            return ("in", left, options)
+        kind, op = self._next()
+        if op not in _COMPARATORS:
+            raise _validation(f"Expected a comparator, got '{op}'")
+        return ("compare", op, left, self.operand())
+
+    # Updates
+
+    def update(self) -> List[Tuple[Any, ...]]:
+        actions: List[Tuple[Any, ...]] = []
+        while not self.done():
+            kind, clause = self._next()
+            clause = clause.upper()
+            if kind != "ident" or clause not in _UPDATE_CLAUSES:
+                raise _validation(f"Expected SET, REMOVE, ADD or DELETE, got '{clause}'")
+            while True:
+                path = self.path()
+                if clause == "SET":
+                    self._expect("=")
+                    actions.append(("set", path, self._set_value()))
+                elif clause == "REMOVE":
+                    actions.append(("remove", path))
+                else:
+                    actions.append((clause.lower(), path, self.operand()))
+                if not self._accept(","):
+                    break
+        return actions
+
+    def _set_value(self) -> Tuple[Any, ...]:
+        left = self._set_operand()
+        for op in ("+", "-"):
+            if self._accept(op):
+                return ("arith", op, left, self._set_operand())
+        return left
+
+    def _set_operand(self) -> Tuple[Any, ...]:
+        if self._is_call({"if_not_exists", "list_append"}):
+            name = self._next()[1].lower()
+            self._expect("(")
+            first = self._set_operand()
+            self._expect(",")
+            second = self._set_operand()
+            self._expect(")")
+            return (name, first, second)
+        return self.operand()
+
+
+def _get_path(item: Any, path: Tuple[Any, ...]) -> Any:
+    for element in path:
+        if isinstance(element, int):
+            if not isinstance(item, list) or element >= len(item):
+                return _MISSING
+            item = item[element]
+        else:
+            if not isinstance(item, dict) or element not in item:
+                return _MISSING
+            item = item[element]
+    return item
+
+
+def _set_path(item: Dict[str, Any], path: Tuple[Any, ...], value: Any) -> None:
+    parent = _get_path(item, path[:-1])
+    if parent is _MISSING:
+        raise _validation("The document path provided in the update expression is invalid for update")
+    last = path[-1]
+    if isinstance(last, int):
+        if last < len(parent):
+            parent[last] = value
+        else:
+            parent.append(value)
+    else:
+        parent[last] = value
+
+
+def _remove_path(item: Dict[str, Any], path: Tuple[Any, ...]) -> None:
+    parent = _get_path(item, path[:-1])
+    last = path[-1]
+    if isinstance(last, int):
+        if isinstance(parent, list) and last < len(parent):
+            del parent[last]
+    elif isinstance(parent, dict):
+        parent.pop(last, None)
+
+
+def _type_of(value: Any) -> str:
+    if isinstance(value, bool):
+        return "BOOL"
+    if isinstance(value, (int, Decimal)):
+        return "N"
+    if isinstance(value, str):
+        return "S"
+    if isinstance(value, (bytes, Binary)):
+        return "B"
+    if value is None:
+        return "NULL"
+    if isinstance(value, dict):
+        return "M"
+    if isinstance(value, list):
+        return "L"
+    if isinstance(value, set) and value:
+        return {"N": "NS", "S": "SS", "B": "BS"}[_type_of(next(iter(value)))]
+    return "?"
+
+
+def _sortable(value: Any) -> Any:
+    return bytes(value) if isinstance(value, Binary) else value
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if left is _MISSING or right is _MISSING:
+        return op == "<>"
+    if op == "=":
+        return _type_of(left) == _type_of(right) and left == right
+    if op == "<>":
+        return _type_of(left) != _type_of(right) or left != right
+    if _type_of(left) != _type_of(right) or _type_of(left) not in ("N", "S", "B"):
+        return False
+    left, right = _sortable(left), _sortable(right)
+    if op == "<":
+        return left < right
+    if op == "<=":
+        return left <= right
+    if op == ">":
+        return left > right
+    return left >= right
+
+
+def _operand(node: Tuple[Any, ...], item: Dict[str, Any]) -> Any:
+    kind = node[0]
+    if kind == "value":
+        return node[1]
+    if kind == "path":
+        return _get_path(item, node[1])
+    if kind == "size":
+        value = _get_path(item, node[1])
+        if value is _MISSING or isinstance(value, (bool, int, Decimal)) or value is None:
+            return _MISSING
+        return Decimal(len(value))
+    if kind == "if_not_exists":
+        value = _operand(node[1], item)
+        return _operand(node[2], item) if value is _MISSING else value
+    if kind == "list_append":
+        first, second = _operand(node[1], item), _operand(node[2], item)
+        if not isinstance(first, list) or not isinstance(second, list):
+            raise _validation("Incorrect operand type for operator or function; operator or function: list_append")
+        return first + second
+    if kind == "arith":
+        left, right = _operand(node[2], item), _operand(node[3], item)
+        if _type_of(left) != "N" or _type_of(right) != "N":
+            raise _validation("An operand in the update expression has an incorrect data type")
+        return DYNAMODB_CONTEXT.add(left, right) if node[1] == "+" else DYNAMODB_CONTEXT.subtract(left, right)
+    raise _validation(f"Unsupported operand {kind}")
+
+
+def _evaluate(node: Tuple[Any, ...], item: Dict[str, Any]) -> bool:
+    kind = node[0]
+    if kind == "and":
+        return _evaluate(node[1], item) and _evaluate(node[2], item)
+    if kind == "or":
+        return _evaluate(node[1], item) or _evaluate(node[2], item)
+    if kind == "not":
+        return not _evaluate(node[1], item)
+    if kind == "compare":
+        return _compare(node[1], _operand(node[2], item), _operand(node[3], item))
+    if kind == "between":
+        value = _operand(node[1], item)
+        return _compare(">=", value, _operand(node[2], item)) and _compare("<=", value, _operand(node[3], item))
+    if kind == "in":
+        value = _operand(node[1], item)
+        return any(_compare("=", value, _operand(option, item)) for option in node[2])
+    if kind == "function":
+        name, args = node[1], node[2]
+        value = _operand(args[0], item)
+        if name == "attribute_exists":
+            return value is not _MISSING
+        if name == "attribute_not_exists":
+            return value is _MISSING
+        if name == "attribute_type":
+            return value is not _MISSING and _type_of(value) == _operand(args[1], item)
+        other = _operand(args[1], item)
+        if value is _MISSING or other is _MISSING:
+            return False
+        if name == "begins_with":
+            return _type_of(value) == _type_of(other) in ("S", "B") and _sortable(value).startswith(_sortable(other))
+        if isinstance(value, (set, list)):
+            return other in value
+        return _type_of(value) == _type_of(other) in ("S", "B") and _sortable(other) in _sortable(value)
+    raise _validation(f"Unsupported condition {kind}")
+
+
+# Tables -----------------------------------------------------------------------
+
+
+class _Index:
+    """Sorted (range value, table key) entries per hash value."""
+
+    def __init__(self, hash_key: str, range_key: Optional[str]):
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.partitions: Dict[Any, List[Tuple[Any, Tuple[Any, ...]]]] = {}
+
+    def entry(self, item: Dict[str, Any], table_key: Tuple[Any, ...]) -> Optional[Tuple[Any, ...]]:
+        """Return the (hash, sort entry) for an item, or None if the index is sparse for it."""
+        if self.hash_key not in item:
+            return None
+        if self.range_key is None:
+            return item[self.hash_key], (0, table_key)
+        if self.range_key not in item:
+            return None
+        return item[self.hash_key], (_sortable(item[self.range_key]), table_key)
+
+    def add(self, item: Dict[str, Any], table_key: Tuple[Any, ...]) -> None:
+        entry = self.entry(item, table_key)
+        if entry is not None:
+            bisect.insort(self.partitions.setdefault(entry[0], []), entry[1])
+
+    def remove(self, item: Dict[str, Any], table_key: Tuple[Any, ...]) -> None:
+        entry = self.entry(item, table_key)
+        if entry is None:
+            return
+        partition = self.partitions.get(entry[0], [])
+        position = bisect.bisect_left(partition, entry[1])
+        if position < len(partition) and partition[position] == entry[1]:
+            del partition[position]
+        if not partition:
+            self.partitions.pop(entry[0], None)
+
+
+def _segment_hash(table_key: Tuple[Any, ...]) -> int:
+    """Stable hash deciding scan order and parallel scan segment."""
+    return zlib.crc32(repr(table_key).encode())
+
+
+class _Table:
+    """Items keyed by primary key, plus the base and secondary indexes."""
+
+    def __init__(self, hash_key: str, range_key: Optional[str], indexes: Dict[str, Tuple[str, Optional[str]]]):
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.items: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        # "" is the table itself, so Query on the base table uses the same path
+        self.indexes = {"": _Index(hash_key, range_key)}
+        self.indexes.update({name: _Index(*keys) for name, keys in indexes.items()})
+        # (segment hash, table key) pairs, rebuilt after writes
+        self._scan_order: Optional[List[Tuple[int, Tuple[Any, ...]]]] = None
+
+    @property
+    def key_names(self) -> Tuple[str, ...]:
+        return (self.hash_key,) if self.range_key is None else (self.hash_key, self.range_key)
+
+    def key_of(self, key: Dict[str, Any]) -> Tuple[Any, ...]:
+        """Validate a primary key and return it as a tuple."""
+        if set(key) != set(self.key_names):
+            raise _validation("The provided key element does not match the schema")
+        return tuple(_sortable(key[name]) for name in self.key_names)
+
+    def get(self, table_key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        return self.items.get(table_key)
+
+    def put(self, table_key: Tuple[Any, ...], item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        old = self.delete(table_key)
+        self.items[table_key] = item
+        for index in self.indexes.values():
+            index.add(item, table_key)
+        self._scan_order = None
+        return old
+
+    def delete(self, table_key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        old = self.items.pop(table_key, None)
+        if old is not None:
+            for index in self.indexes.values():
+                index.remove(old, table_key)
+            self._scan_order = None
+        return old
+
+    def load(self, items: Iterable[Dict[str, Any]]) -> int:
+        """Write many items, sorting each touched index partition once instead of per item."""
+        loaded: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for item in items:
+            key = {name: item[name] for name in self.key_names if name in item}
+            loaded[self.key_of(key)] = item
+        for table_key in loaded:
+            self.delete(table_key)
+        touched: Dict[str, Set[Any]] = {name: set() for name in self.indexes}
+        for table_key, item in loaded.items():
+            self.items[table_key] = item
+            for name, index in self.indexes.items():
+                entry = index.entry(item, table_key)
+                if entry is not None:
+                    index.partitions.setdefault(entry[0], []).append(entry[1])
+                    touched[name].add(entry[0])
+        for name, hashes in touched.items():
+            for hash_value in hashes:
+                self.indexes[name].partitions[hash_value].sort()
+        self._scan_order = None
+        return len(loaded)
+
+    def scan_order(self) -> List[Tuple[int, Tuple[Any, ...]]]:
+        if self._scan_order is None:
+            self._scan_order = sorted((_segment_hash(key), key) for key in self.items)
+        return self._scan_order
+
+
+def _project(item: Dict[str, Any], paths: Optional[List[Tuple[Any, ...]]]) -> Dict[str, Any]:
+    if paths is None:
+        return item
+    projected: Dict[str, Any] = {}
+    for path in paths:
+        value = _get_path(item, path)
+        if value is _MISSING:
+            continue
+        target = projected
+        for element in path[:-1]:
+            target = target.setdefault(element, {})
+        target[path[-1]] = value
+    return projected
+
+
+class FakeDynamoDB:
+    """In-memory DynamoDB answering calls made through a botocore client."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        throttle_rate: float = 0.0,
+        unprocessed_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize fake.
+
+        Args:
+            latency: Seconds added to every call
+            jitter: Extra random seconds (0..jitter) added to every call
+            throttle_rate: Probability a call fails with ProvisionedThroughputExceededException
+            unprocessed_rate: Probability each BatchWriteItem request is returned unprocessed
+            seed: Seed for the random latency, throttling and unprocessed decisions
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.unprocessed_rate = unprocessed_rate
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self._random = random.Random(seed)
+        self._tables: Dict[str, _Table] = {}
+        self._failures: Dict[str, Deque[str]] = {}
+        self._lock = threading.RLock()
+        self._installed: List[Any] = []
+        self._operations: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "PutItem": self._put_item,
+            "GetItem": self._get_item,
+            "UpdateItem": self._update_item,
+            "DeleteItem": self._delete_item,
+            "Query": self._query,
+            "Scan": self._scan,
+            "BatchWriteItem": self._batch_write_item,
+            "BatchGetItem": self._batch_get_item,
+        }
+
+    # Setup
+
+    def create_table(
+        self,
+        name: str,
+        hash_key: str,
+        range_key: Optional[str] = None,
+        indexes: Optional[Dict[str, Tuple[str, Optional[str]]]] = None,
+    ) -> None:
+        """
+        Create an empty table.
+
+        Args:
+            name: Table name
+            hash_key: Partition key attribute
+            range_key: Optional sort key attribute
+            indexes: Global secondary indexes as name -> (hash key, range key)
+        """
+        with self._lock:
+            self._tables[name] = _Table(hash_key, range_key, indexes or {})
+
+    def create_events_table(self, name: Optional[str] = None) -> None:
+        """Create the events table with the same key schema and indexes as production."""
+        self.create_table(name or settings.dynamodb_table_name, "event_id", indexes=EVENTS_INDEXES)
+
+    def load(self, items: Iterable[Dict[str, Any]], table_name: Optional[str] = None) -> int:
+        """
+        Bulk-load items without going through the client, for seeding large tables.
+
+        Args:
+            items: Items as the resource layer writes them (numbers as Decimal)
+            table_name: Table to load; defaults to the events table
+
+        Returns:
+            Number of items loaded
+        """
+        with self._lock:
+            return self._table(table_name or settings.dynamodb_table_name).load(items)
+
+    def install(self, client: Any) -> None:
+        """Answer every DynamoDB call made through a botocore client."""
+        client.meta.events.register("before-call.dynamodb", self._handle, unique_id=f"fake-dynamodb-{id(self)}")
+        self._installed.append(client)
+
+    def uninstall(self) -> None:
+        """Stop answering calls; clients go back to the network."""
+        for client in self._installed:
+            client.meta.events.unregister("before-call.dynamodb", unique_id=f"fake-dynamodb-{id(self)}")
+        self._installed.clear()
+
+    def fail_next(self, operation: str, code: str = THROTTLE_ERROR, times: int = 1) -> None:
+        """
+        Fail the next calls of an operation.
+
+        Args:
+            operation: Operation name, such as "PutItem"
+            code: DynamoDB error code to return
+            times: Number of consecutive calls to fail
+        """
+        with self._lock:
+            self._failures.setdefault(operation, deque()).extend([code] * times)
+
+    def items(self, table_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return every item of a table as Python values."""
+        with self._lock:
+            return list(self._table(table_name or settings.dynamodb_table_name).items.values())
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return call and error counters by operation."""
+        with self._lock:
+            return {"calls": dict(self.calls), "errors": dict(self.errors)}
+
+    # Dispatch
+
+    def _handle(self, model: Any, params: Dict[str, Any], **kwargs: Any) -> Tuple[AWSResponse, Dict[str, Any]]:
+        """botocore before-call handler: answer the request without sending it."""
+        operation = model.name
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            with self._lock:
+                self.calls[operation] += 1
+                handler = self._operations.get(operation)
+                if handler is None:
+                    raise _validation(f"Operation {operation} is not supported by the fake")
+                failures = self._failures.get(operation)
+                if failures:
+                    code = failures.popleft()
+                    raise FakeDynamoDBError(code, f"Injected {code}")
+                if self.throttle_rate and self._random.random() < self.throttle_rate:
+                    raise FakeDynamoDBError(THROTTLE_ERROR, "The level of configured provisioned throughput for the table was exceeded")
+                parsed = handler(self._decode(params.get("body")))
+            parsed["ResponseMetadata"] = {"HTTPStatusCode": 200, "HTTPHeaders": {}, "RetryAttempts": 0}
+            return AWSResponse(None, 200, {}, None), parsed
+        except FakeDynamoDBError as e:
+            with self._lock:
+                self.errors[e.code] += 1
+            error: Dict[str, Any] = {
+                "Error": {"Code": e.code, "Message": e.message},
+                "ResponseMetadata": {"HTTPStatusCode": 400, "HTTPHeaders": {}, "RetryAttempts": 0},
+            }
+            if e.item is not None:
+                error["Item"] = _item_to_wire(e.item)
+            return AWSResponse(None, 400, {}, None), error
+
+    @staticmethod
+    def _decode(body: Any) -> Dict[str, Any]:
+        if not body:
+            return {}
+        return json.loads(body)
+
+    def _table(self, name: str) -> _Table:
+        table = self._tables.get(name)
+        if table is None:
+            raise FakeDynamoDBError("ResourceNotFoundException", "Requested resource not found")
+        return table
+
+    @staticmethod
+    def _expression_context(request: Dict[str, Any]) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        names = request.get("ExpressionAttributeNames") or {}
+        values = {key: _from_wire(value) for key, value in (request.get("ExpressionAttributeValues") or {}).items()}
+        return names, values
+
+    def _condition(self, request: Dict[str, Any], field: str) -> Optional[Tuple[Any, ...]]:
+        text = request.get(field)
+        if not text:
+            return None
+        parser = _Parser(text, *self._expression_context(request))
+        node = parser.condition()
+        if not parser.done():
+            raise _validation(f"Invalid {field}: unexpected token '{parser._peek()[1]}'")
+        return node
+
+    def _projection(self, request: Dict[str, Any]) -> Optional[List[Tuple[Any, ...]]]:
+        text = request.get("ProjectionExpression")
+        if not text:
+            return None
+        parser = _Parser(text, request.get("ExpressionAttributeNames") or {}, {})
+        paths = [parser.path()]
+        while parser._accept(","):
+            paths.append(parser.path())
+        return paths
+
+    def _check(self, request: Dict[str, Any], item: Optional[Dict[str, Any]]) -> None:
+        condition = self._condition(request, "ConditionExpression")
+        if condition is not None and not _evaluate(condition, item or {}):
+            returned = item if request.get("ReturnValuesOnConditionCheckFailure") == "ALL_OLD" else None
+            raise FakeDynamoDBError("ConditionalCheckFailedException", "The conditional request failed", returned)
+
+    # Single-item operations
+
+    def _put_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._table(request["TableName"])
+        item = _item_from_wire(request["Item"])
+        table_key = table.key_of({name: item.get(name) for name in table.key_names if name in item})
+        old = table.get(table_key)
+        self._check(request, old)
+        table.put(table_key, item)
+        if request.get("ReturnValues") == "ALL_OLD" and old is not None:
+            return {"Attributes": _item_to_wire(old)}
+        return {}
+
+    def _get_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._table(request["TableName"])
+        item = table.get(table.key_of(_item_from_wire(request["Key"])))
+        if item is None:
+            return {}
+        return {"Item": _item_to_wire(_project(item, self._projection(request)))}
+
+    def _delete_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._table(request["TableName"])
+        table_key = table.key_of(_item_from_wire(request["Key"]))
+        self._check(request, table.get(table_key))
+        old = table.delete(table_key)
+        if request.get("ReturnValues") == "ALL_OLD" and old is not None:
+            return {"Attributes": _item_to_wire(old)}
+        return {}
+
+    def _update_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._table(request["TableName"])
+        key = _item_from_wire(request["Key"])
+        table_key = table.key_of(key)
+        old = table.get(table_key)
+        self._check(request, old)
+
+        new = copy.deepcopy(old) if old is not None else dict(key)
+        actions = []
+        if request.get("UpdateExpression"):
+            parser = _Parser(request["UpdateExpression"], *self._expression_context(request))
+            actions = parser.update()
+        # Every operand reads the item as it was before the update
+        before = old or {}
+        updated = set()
+        for action in actions:
+            kind, path = action[0], action[1]
+            if path[0] in table.key_names:
+                raise _validation(f"Cannot update attribute {path[0]}. This attribute is part of the key")
+            updated.add(path[0])
+            if kind == "set":
+                _set_path(new, path, _operand(action[2], before))
+            elif kind == "remove":
+                _remove_path(new, path)
+            elif kind == "add":
+                value, current = _operand(action[2], before), _get_path(new, path)
+                if current is _MISSING:
+                    _set_path(new, path, value)
+                elif _type_of(current) == "N" and _type_of(value) == "N":
+                    _set_path(new, path, DYNAMODB_CONTEXT.add(current, value))
+                elif isinstance(current, set) and isinstance(value, set):
+                    _set_path(new, path, current | value)
+                else:
+                    raise _validation("An operand in the update expression has an incorrect data type")
+            elif kind == "delete":
+                value, current = _operand(action[2], before), _get_path(new, path)
+                if isinstance(current, set) and isinstance(value, set):
+                    remaining = current - value
+                    if remaining:
+                        _set_path(new, path, remaining)
+                    else:
+                        _remove_path(new, path)
+        table.put(table_key, new)
+
+        return_values = request.get("ReturnValues", "NONE")
+        if return_values == "ALL_NEW":
+            return {"Attributes": _item_to_wire(new)}
+        if return_values == "ALL_OLD" and old is not None:
+            return {"Attributes": _item_to_wire(old)}
+        if return_values == "UPDATED_NEW":
+            return {"Attributes": _item_to_wire({name: new[name] for name in updated if name in new})}
+        if return_values == "UPDATED_OLD" and old is not None:
+            return {"Attributes": _item_to_wire({name: old[name] for name in updated if name in old})}
+        return {}
+
+    # Reads
+
+    def _key_bounds(
+        self, node: Tuple[Any, ...], index: _Index
+    ) -> Tuple[Any, Optional[Tuple[Any, ...]]]:
+        """Split a key condition into the hash value and an optional range condition."""
+        conditions = []
+
+        def flatten(current: Tuple[Any, ...]) -> None:
+            if current[0] == "and":
+                flatten(current[1])
+                flatten(current[2])
+            else:
+                conditions.append(current)
+
+        flatten(node)
+        hash_value = _MISSING
+        range_condition = None
+        for condition in conditions:
+            attribute = None
+            if condition[0] in ("compare", "between"):
+                attribute = condition[2][1][0] if condition[0] == "compare" else condition[1][1][0]
+            elif condition[0] == "function" and condition[1] == "begins_with":
+                attribute = condition[2][0][1][0]
+            if condition[0] == "compare" and condition[1] == "=" and attribute == index.hash_key:
+                hash_value = condition[3][1]
+            elif attribute is not None and attribute == index.range_key and range_condition is None:
+                range_condition = condition
+            else:
+                raise _validation("Query key condition not supported")
+        if hash_value is _MISSING:
+            raise _validation("Query condition missed key schema element: " + index.hash_key)
+        values = [hash_value] + [node[1] for node in (range_condition or ())[2:] if isinstance(node, tuple) and node[0] == "value"]
+        if any(_type_of(value) not in ("S", "N", "B") for value in values):
+            raise _validation("One or more parameter values were invalid: Condition parameter type does not match schema type")
+        return hash_value, range_condition
+
+    @staticmethod
+    def _range_slice(
+        partition: List[Tuple[Any, Tuple[Any, ...]]], condition: Optional[Tuple[Any, ...]]
+    ) -> Tuple[int, int]:
+        """Return the [start, end) positions of entries matching a range condition."""
+        start, end = 0, len(partition)
+        if condition is None or condition[0] == "function":
+            return start, end
+        low = high = None
+        low_inclusive = high_inclusive = True
+        if condition[0] == "between":
+            low, high = condition[2][1], condition[3][1]
+        else:
+            op, value = condition[1], _sortable(condition[3][1])
+            if op == "=":
+                low = high = value
+            elif op in (">", ">="):
+                low, low_inclusive = value, op == ">="
+            elif op in ("<", "<="):
+                high, high_inclusive = value, op == "<="
+        if low is not None:
+            find = bisect.bisect_left if low_inclusive else bisect.bisect_right
+            start = find(partition, (_sortable(low),))
+            if not low_inclusive:
+                # Entries are (range, key) tuples; skip every entry whose range equals low
+                while start < len(partition) and partition[start][0] == _sortable(low):
+                    start += 1
+        if high is not None:
+            end = bisect.bisect_left(partition, (_sortable(high),))
+            if high_inclusive:
+                while end < len(partition) and partition[end][0] == _sortable(high):
+                    end += 1
+        return start, end
+
+    def _page(
+        self,
+        request: Dict[str, Any],
+        table: _Table,
+        candidates: Any,
+        last_key: Callable[[Tuple[Any, ...], Dict[str, Any]], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """Apply Limit, FilterExpression, projection and Select to candidate keys."""
+        limit = request.get("Limit")
+        filter_node = self._condition(request, "FilterExpression")
+        projection = self._projection(request)
+        items, scanned, last = [], 0, None
+        for table_key in candidates:
+            item = table.items[table_key]
+            scanned += 1
+            if filter_node is None or _evaluate(filter_node, item):
+                items.append(item)
+            if limit is not None and scanned >= limit:
+                last = last_key(table_key, item)
+                break
+        response: Dict[str, Any] = {"Count": len(items), "ScannedCount": scanned}
+        if request.get("Select") != "COUNT":
+            response["Items"] = [_item_to_wire(_project(item, projection)) for item in items]
+        if last is not None:
+            response["LastEvaluatedKey"] = _item_to_wire(last)
+        return response
+
+    def _query(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._table(request["TableName"])
+        index_name = request.get("IndexName") or ""
+        index = table.indexes.get(index_name)
+        if index is None:
+            raise _validation("The table does not have the specified index: " + index_name)
+        if index_name and request.get("ConsistentRead"):
+            raise _validation("Consistent reads are not supported on global secondary indexes")
+        key_node = self._condition(request, "KeyConditionExpression")
+        if key_node is None:
+            raise _validation("KeyConditionExpression is required")
+        hash_value, range_condition = self._key_bounds(key_node, index)
+        partition = index.partitions.get(_sortable(hash_value), [])
+        start, end = self._range_slice(partition, range_condition)
+        forward = request.get("ScanIndexForward", True)
+
+        exclusive = request.get("ExclusiveStartKey")
+        if exclusive:
+            exclusive = _item_from_wire(exclusive)
+            entry = index.entry(exclusive, table.key_of({name: exclusive[name] for name in table.key_names}))
+            if entry is None:
+                raise _validation("The provided starting key is invalid")
+            if forward:
+                start = max(start, bisect.bisect_right(partition, entry[1]))
+            else:
+                end = min(end, bisect.bisect_left(partition, entry[1]))
+
+        entries = partition[start:end] if forward else partition[start:end][::-1]
+        candidates = (table_key for _, table_key in entries)
+        if range_condition is not None and range_condition[0] == "function":
+            candidates = (key for key in candidates if _evaluate(range_condition, table.items[key]))
+
+        key_names = set(table.key_names) | {index.hash_key} | ({index.range_key} if index.range_key else set())
+        return self._page(
+            request,
+            table,
+            candidates,
+            lambda table_key, item: {name: item[name] for name in key_names},
+        )
+
+    def _scan(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        table = self._table(request["TableName"])
+        order = table.scan_order()
+        segment, total = request.get("Segment", 0), request.get("TotalSegments", 1)
+        start = 0
+        exclusive = request.get("ExclusiveStartKey")
+        if exclusive:
+            table_key = table.key_of(_item_from_wire(exclusive))
+            start = bisect.bisect_right(order, (_segment_hash(table_key), table_key))
+        candidates = (key for hashed, key in order[start:] if total <= 1 or hashed % total == segment)
+        return self._page(
+            request,
+            table,
+            candidates,
+            lambda table_key, item: {name: item[name] for name in table.key_names},
+        )
+
+    # Batches
+
+    def _batch_write_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        requests = request.get("RequestItems", {})
+        if sum(len(writes) for writes in requests.values()) > _MAX_BATCH_WRITE:
+            raise _validation("Too many items requested for the BatchWriteItem call")
+        unprocessed: Dict[str, List[Dict[str, Any]]] = {}
+        for table_name, writes in requests.items():
+            table = self._table(table_name)
+            for write in writes:
+                if self.unprocessed_rate and self._random.random() < self.unprocessed_rate:
+                    unprocessed.setdefault(table_name, []).append(write)
+                    continue
+                if "PutRequest" in write:
+                    item = _item_from_wire(write["PutRequest"]["Item"])
+                    table.put(table.key_of({name: item[name] for name in table.key_names if name in item}), item)
+                else:
+                    table.delete(table.key_of(_item_from_wire(write["DeleteRequest"]["Key"])))
+        return {"UnprocessedItems": unprocessed}
+
+    def _batch_get_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        requests = request.get("RequestItems", {})
+        if sum(len(read.get("Keys", [])) for read in requests.values()) > _MAX_BATCH_GET:
+            raise _validation("Too many items requested for the BatchGetItem call")
+        responses: Dict[str, List[Dict[str, Any]]] = {}
+        for table_name, read in requests.items():
+            table = self._table(table_name)
+            projection = self._projection(read)
+            found = responses.setdefault(table_name, [])
+            for key in read.get("Keys", []):
+                item = table.get(table.key_of(_item_from_wire(key)))
+                if item is not None:
+                    found.append(_item_to_wire(_project(item, projection)))
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+
+def attach(client: Any, **options: Any) -> FakeDynamoDB:
+    """
+    Back a DynamoDBClient with a fresh in-memory events table.
+
+    Args:
+        client: DynamoDBClient instance (such as the global `db`)
+        **options: FakeDynamoDB options (latency, jitter, throttle_rate, ...)
+
+    Returns:
+        The installed fake
+    """
+    fake = FakeDynamoDB(**options)
+    fake.create_events_table()
+    fake.install(client.dynamodb.meta.client)
+    return fake
@@ -0,0 +1,7 @@
+"""Bulk JSONL import command: python -m src.tools.import events.jsonl"""
+import sys
+
+from src.tools.importer import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+"""Bulk import of events from JSONL files."""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
+
+from botocore.exceptions import ClientError
+from pydantic import ValidationError
+
+from src.core.database import DynamoDBClient
+from src.models.event import EventRequest
+
+logger = logging.getLogger(__name__)
+
+# DynamoDB accepts at most 25 puts per BatchWriteItem call
+BATCH_SIZE = 25
+THROTTLE_ERRORS = {
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+}
+
+
+class AdaptiveBackoff:
+    """
+    Shared pacing delay for all writer threads.
+
+    Throttling doubles the delay (up to `max_delay`); each successful batch
+    shrinks it, so writers settle just below the table's capacity.
+    """
+
+    def __init__(self, base_delay: float = 0.05, max_delay: float = 5.0):
+        """Initialize with no delay."""
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.delay = 0.0
+        self.throttles = 0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Sleep for the current delay, with jitter."""
+        delay = self.delay
+        if delay > 0:
+            time.sleep(random.uniform(delay / 2, delay))
+
+    def throttled(self) -> None:
+        """Record a throttled or partially processed request."""
+        with self._lock:
+            self.throttles += 1
+            self.delay = min(self.max_delay, max(self.base_delay, self.delay * 2))
+
+    def succeeded(self) -> None:
+        """Record a fully processed request."""
+        with self._lock:
+            self.delay = self.delay * 0.9 if self.delay > self.base_delay else 0.0
+
+
+class Checkpoint:
+    """
+    Resumable import progress.
+
+    Batches finish out of order, so progress is recorded as the highest line
+    number below which everything is written, plus the line ranges of batches
+    that completed beyond it. Resuming skips both.
+
+    An import ID is kept too. Each line's dedup key combines it with the
+    line number and a hash of the line, so a batch written again after a
+    crash (it was written but not yet recorded) overwrites its events
+    instead of duplicating them (see DynamoDBClient.assign_import_ids).
+    """
+
+    def __init__(self, path: Optional[str], source_file: str):
+        """Load an existing checkpoint for `source_file`, if any."""
+        self.path = path
+        self.source_file = os.path.abspath(source_file)
+        self.line = 0
+        self.done: Set[Tuple[int, int]] = set()
+        self.import_id = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                state = json.load(f)
+            if state.get("file") == self.source_file:
+                self.line = state.get("line", 0)
+                self.done = {tuple(span) for span in state.get("done", [])}
+                self.import_id = state.get("import_id", self.import_id)
+
+    def is_done(self, line_number: int) -> bool:
+        """Check whether a line was written by a previous run."""
+        if line_number <= self.line:
+            return True
+        return any(start <= line_number <= end for start, end in self.done)
+
+    def complete(self, start: int, end: int) -> None:
+        """Mark the batch covering lines start..end (inclusive) as written."""
+        with self._lock:
+            self.done.add((start, end))
+            advanced = True
+            while advanced:
+                advanced = False
+                for span in list(self.done):
+                    if span[0] <= self.line + 1:
+                        self.line = max(self.line, span[1])
+                        self.done.discard(span)
+                        advanced = True
+
+    def skip(self, line_number: int) -> None:
+        """Mark a single line as handled without writing it (blank or rejected)."""
+        self.complete(line_number, line_number)
+
+    def save(self) -> None:
+        """Atomically persist the checkpoint."""
+        if not self.path:
+            return
+        with self._lock:
+            state = {
+                "file": self.source_file,
+                "line": self.line,
+                "done": sorted(list(span) for span in self.done),
+                "import_id": self.import_id,
+            }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+
+class Importer:
+    """Stream a JSONL file into DynamoDB with concurrent BatchWriteItem workers."""
+
+    def __init__(
+        self,
+        client: DynamoDBClient,
+        workers: int = 8,
+        status: str = "pending",
+        checkpoint: Optional[Checkpoint] = None,
+        max_retries: int = 10,
+        progress_interval: float = 2.0,
+        out: TextIO = sys.stderr,
+    ):
+        """
+        Initialize importer.
+
+        Args:
+            client: Database client used for writes
+            workers: Number of concurrent BatchWriteItem workers
+            status: Status given to imported events
+            checkpoint: Optional resumable checkpoint
+            max_retries: Attempts per batch before giving up
+            progress_interval: Seconds between progress lines
+            out: Stream for progress output
+        """
+        self.client = client
+        self.workers = workers
+        self.status = status
+        self.checkpoint = checkpoint
+        self.max_retries = max_retries
+        self.progress_interval = progress_interval
+        self.out = out
+        self.backoff = AdaptiveBackoff()
+        self.read = 0
+        self.written = 0
+        self.rejected = 0
+        self.failed = 0
+        self._counter_lock = threading.Lock()
+        # Bounds batches in memory: queued plus running
+        self._slots = threading.BoundedSemaphore(workers * 2)
+
+    def _write_batch(
+        self, start: int, end: int, items: List[Dict[str, Any]], keys: List[str]
+    ) -> None:
+        """Write one batch, retrying throttled requests and unprocessed items."""
+        try:
+            if self.checkpoint:
+                items = self.client.assign_import_ids(keys, items)
+            pending = items
+            for _ in range(self.max_retries):
+                self.backoff.wait()
+                try:
+                    pending = self.client.batch_put_events(pending)
+                except ClientError as e:
+                    if e.response.get("Error", {}).get("Code", "") not in THROTTLE_ERRORS:
+                        raise
+                    self.backoff.throttled()
+                    continue
+                written = len(items) if not pending else len(items) - len(pending)
+                if pending:
+                    self.backoff.throttled()
+                else:
+                    self.backoff.succeeded()
+                with self._counter_lock:
+                    self.written += written
+                items = pending
+                if not pending:
+                    if self.checkpoint:
+                        self.checkpoint.complete(start, end)
+                    return
+            raise RuntimeError(f"Gave up on lines {start}-{end} after {self.max_retries} attempts")
+        except Exception as e:
+            logger.error(f"Batch for lines {start}-{end} failed: {e}")
+            with self._counter_lock:
+                self.failed += len(items)
+        finally:
+            self._slots.release()
+
+    def _line_key(self, line_number: int, line: str) -> str:
+        """Dedup key of an input line: the import, its line number and a hash of its content."""
+        digest = hashlib.blake2b(line.strip().encode("utf-8"), digest_size=16).hexdigest()
+        return f"{self.checkpoint.import_id}#{line_number}#{digest}"
+
+    def _report(self, started: float, final: bool = False) -> None:
+        """Print a progress line."""
+        elapsed = max(time.monotonic() - started, 1e-9)
+        print(
+            f"{'done' if final else 'progress'}: read={self.read} written={self.written} "
+            f"rejected={self.rejected} failed={self.failed} throttles={self.backoff.throttles} "
+            f"rate={self.written / elapsed:.0f} events/s elapsed={elapsed:.1f}s",
+            file=self.out,
+            flush=True,
+        )
+
+    def run(self, lines: TextIO) -> Dict[str, int]:
+        """
+        Import every line of a JSONL stream.
+
+        Args:
+            lines: Open text stream with one EventRequest JSON object per line
+
+        Returns:
+            Counters for read, written, rejected and failed events
+        """
+        started = last_report = time.monotonic()
+        batch: List[Dict[str, Any]] = []
+        keys: List[str] = []
+        batch_start = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+
+            def submit(end: int) -> None:
+                self._slots.acquire()
+                pool.submit(self._write_batch, batch_start, end, list(batch), list(keys))
+
+            line_number = 0
+            for line_number, line in enumerate(lines, start=1):
+                if self.checkpoint and self.checkpoint.is_done(line_number):
+                    continue
+                if not line.strip():
+                    if self.checkpoint and not batch:
+                        self.checkpoint.skip(line_number)
+                    continue
+                self.read += 1
+                try:
+                    request = EventRequest.model_validate_json(line)
+                except ValidationError as e:
+                    self.rejected += 1
+                    logger.warning(f"Line {line_number} rejected: {e.errors()[0].get('msg')}")
+                    if self.checkpoint and not batch:
+                        self.checkpoint.skip(line_number)
+                    continue
+                try:
+                    event = self.client.build_event(
+                        payload=request.payload,
+                        source=request.source,
+                        tags=request.tags,
+                        metadata=request.metadata,
+                        status=self.status,
+                        group_key=request.group_key,
+                        priority=request.priority,
+                        deliver_after=request.deliver_after,
+                    )
+                except ValueError as e:
+                    self.rejected += 1
+                    logger.warning(f"Line {line_number} rejected: {e}")
+                    if self.checkpoint and not batch:
+                        self.checkpoint.skip(line_number)
+                    continue
+                if not batch:
+                    batch_start = line_number
+                batch.append(event)
+                if self.checkpoint:
+                    keys.append(self._line_key(line_number, line))
+                if len(batch) == BATCH_SIZE:
+                    submit(line_number)
+                    batch, keys = [], []
+
+                now = time.monotonic()
+                if now - last_report >= self.progress_interval:
+                    last_report = now
+                    self._report(started)
+                    if self.checkpoint:
+                        self.checkpoint.save()
+            if batch:
+                submit(line_number)
+                batch, keys = [], []
+
+        if self.checkpoint:
+            self.checkpoint.save()
+        # Imported events bypass the per-event write path; refresh caches once
+        self.client.notify_changed()
+        self._report(started, final=True)
+        return {
+            "read": self.read,
+            "written": self.written,
+            "rejected": self.rejected,
+            "failed": self.failed,
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.import",
+        description="Bulk import events from a JSONL file (one EventRequest per line).",
+    )
+    parser.add_argument("path", help="JSONL file to import")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent batch writers")
+    parser.add_argument(
+        "--status",
+        default="pending",
+        choices=["pending", "acknowledged"],
+        help="Status for imported events (use acknowledged for history that should not be delivered)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        help="Checkpoint file for resuming (default: <path>.checkpoint)",
+    )
+    parser.add_argument("--no-checkpoint", action="store_true", help="Do not record progress")
+    parser.add_argument("--progress-interval", type=float, default=2.0, help="Seconds between progress lines")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    checkpoint = None
+    if not args.no_checkpoint:
+        checkpoint = Checkpoint(args.checkpoint or f"{args.path}.checkpoint", args.path)
+        if checkpoint.line:
+            print(f"Resuming after line {checkpoint.line}", file=sys.stderr)
+
+    importer = Importer(
+        DynamoDBClient(),
+        workers=args.workers,
+        status=args.status,
+        checkpoint=checkpoint,
+        progress_interval=args.progress_interval,
+    )
+    with open(args.path, encoding="utf-8") as lines:
+        result = importer.run(lines)
+    return 1 if result["failed"] else 0
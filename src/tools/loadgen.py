@@ -0,0 +1,363 @@
+"""Asynchronous load generator for the events API."""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import sys
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, TextIO
+
+import httpx
+
+from src.core.histogram import LatencyHistogram
+
+OPERATIONS = ("create", "inbox", "ack")
+
+
+class OperationStats:
+    """Latency and outcome counters for one operation."""
+
+    def __init__(self):
+        """Initialize counters."""
+        self.latency = LatencyHistogram()
+        self.ok = 0
+        self.errors = 0
+        self.status_codes: Dict[int, int] = {}
+
+    def record(self, status_code: Optional[int], latency_us: int) -> None:
+        """Record one request outcome (status_code None for transport errors)."""
+        self.latency.record(latency_us)
+        if status_code is not None:
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+        if status_code is not None and status_code < 400:
+            self.ok += 1
+        else:
+            self.errors += 1
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse an operation mix such as "create=70,inbox=20,ack=10".
+
+    Raises:
+        ValueError: If an operation is unknown or no weight is positive
+    """
+    mix: Dict[str, float] = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation '{name}' (expected one of {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("Operation mix needs at least one positive weight")
+    return mix
+
+
+def load_trace(stream: TextIO) -> List[Dict[str, Any]]:
+    """Read event request bodies, one JSON object per line."""
+    return [json.loads(line) for line in stream if line.strip()]
+
+
+def synthetic_bodies(payload_bytes: int) -> Iterator[Dict[str, Any]]:
+    """Generate event request bodies with a payload of roughly `payload_bytes`."""
+    for n in itertools.count():
+        yield {
+            "payload": {"sequence": n, "data": "x" * max(0, payload_bytes)},
+            "source": "loadgen",
+            "tags": ["loadgen"],
+        }
+
+
+class LoadGenerator:
+    """Drive create, inbox and ack requests against the API."""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        mix: Dict[str, float],
+        bodies: Iterator[Dict[str, Any]],
+        api_prefix: str = "/v1",
+        inbox_limit: int = 50,
+        headers: Optional[Dict[str, str]] = None,
+        stop_on_rate_limit: bool = True,
+    ):
+        """
+        Initialize generator.
+
+        Args:
+            client: HTTP client (network or in-process ASGI transport)
+            mix: Relative weights of create, inbox and ack operations
+            bodies: Event request bodies to send on create
+            api_prefix: API version prefix
+            inbox_limit: Page size for inbox requests
+            headers: Extra headers (e.g. X-API-Key) for every request
+            stop_on_rate_limit: Abort the run at the first 429, whose latencies
+                would measure the rate limiter rather than the API
+        """
+        self.client = client
+        self.operations = list(mix)
+        self.weights = [mix[name] for name in self.operations]
+        self.bodies = bodies
+        self.prefix = f"{api_prefix}/events"
+        self.inbox_limit = inbox_limit
+        self.headers = headers or {}
+        self.stats: Dict[str, OperationStats] = {name: OperationStats() for name in OPERATIONS}
+        self.ack_candidates: Deque[str] = deque(maxlen=100_000)
+        self.random = random.Random()
+        self.stop_on_rate_limit = stop_on_rate_limit
+        # Why the run stopped early, if it did
+        self.aborted: Optional[str] = None
+
+    async def _create(self) -> httpx.Response:
+        response = await self.client.post(self.prefix, json=next(self.bodies), headers=self.headers)
+        if response.status_code == 201:
+            self.ack_candidates.append(response.json()["event_id"])
+        return response
+
+    async def _inbox(self) -> httpx.Response:
+        response = await self.client.get(
+            f"{self.prefix}/inbox", params={"limit": self.inbox_limit}, headers=self.headers
+        )
+        if response.status_code == 200 and not self.ack_candidates:
+            self.ack_candidates.extend(event["id"] for event in response.json().get("events", []))
+        return response
+
+    async def _ack(self) -> Optional[httpx.Response]:
+        if not self.ack_candidates:
+            # Nothing known to acknowledge yet: refill from the inbox instead
+            return None
+        event_id = self.ack_candidates.popleft()
+        return await self.client.post(f"{self.prefix}/{event_id}/ack", headers=self.headers)
+
+    async def request(self, scheduled: float) -> None:
+        """
+        Send one request of a randomly chosen operation.
+
+        Args:
+            scheduled: perf_counter time the request was meant to start; latency is
+                measured from it so queueing delay in open-loop runs is not hidden
+        """
+        operation = self.random.choices(self.operations, self.weights)[0]
+        handler = {"create": self._create, "inbox": self._inbox, "ack": self._ack}[operation]
+        status_code: Optional[int] = None
+        try:
+            response = await handler()
+            if response is None:
+                operation = "inbox"
+                response = await self._inbox()
+            status_code = response.status_code
+        except httpx.HTTPError:
+            status_code = None
+        latency_us = int((time.perf_counter() - scheduled) * 1_000_000)
+        self.stats[operation].record(status_code, latency_us)
+        if status_code == 429 and self.stop_on_rate_limit and not self.aborted:
+            self.aborted = (
+                "rate limited (429): raise RATE_LIMIT_PER_MINUTE or set RATE_LIMIT_ENABLED=false "
+                "on the target, or pass --allow-rate-limit to measure the limiter"
+            )
+
+    async def run_closed(self, concurrency: int, deadline: float, max_requests: Optional[int]) -> None:
+        """Run `concurrency` workers that each send the next request as soon as one completes."""
+        sent = itertools.count()
+
+        async def worker() -> None:
+            while time.perf_counter() < deadline and not self.aborted:
+                if max_requests is not None and next(sent) >= max_requests:
+                    return
+                await self.request(time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    async def run_open(
+        self, rate: float, concurrency: int, deadline: float, max_requests: Optional[int]
+    ) -> None:
+        """
+        Start requests at a fixed arrival rate regardless of how fast they complete.
+
+        At most `concurrency` requests are in flight; arrivals beyond that wait,
+        and that wait counts towards their latency.
+        """
+        slots = asyncio.Semaphore(concurrency)
+        tasks = set()
+        start = time.perf_counter()
+
+        async def fire(scheduled: float) -> None:
+            async with slots:
+                await self.request(scheduled)
+
+        for n in itertools.count():
+            if (max_requests is not None and n >= max_requests) or self.aborted:
+                break
+            scheduled = start + n / rate
+            if scheduled >= deadline:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            task = asyncio.create_task(fire(scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """Summarize throughput, errors and latency per operation and overall."""
+        overall = LatencyHistogram()
+        result: Dict[str, Any] = {"elapsed_s": round(elapsed, 3), "operations": {}}
+        total = errors = 0
+        for name, stats in self.stats.items():
+            count = stats.ok + stats.errors
+            if not count:
+                continue
+            overall.merge(stats.latency)
+            total += count
+            errors += stats.errors
+            result["operations"][name] = {
+                "requests": count,
+                "throughput_rps": round(count / elapsed, 1) if elapsed else 0.0,
+                "error_rate": round(stats.errors / count, 4),
+                "status_codes": stats.status_codes,
+                "latency": {key: round(value, 3) for key, value in stats.latency.summary().items()},
+            }
+        result["requests"] = total
+        result["throughput_rps"] = round(total / elapsed, 1) if elapsed else 0.0
+        result["error_rate"] = round(errors / total, 4) if total else 0.0
+        result["latency"] = {key: round(value, 3) for key, value in overall.summary().items()}
+        return result
+
+
+def print_report(report: Dict[str, Any], out: TextIO = sys.stdout) -> None:
+    """Print a human-readable report."""
+    print(
+        f"{report['requests']} requests in {report['elapsed_s']}s: "
+        f"{report['throughput_rps']} req/s, error rate {report['error_rate']:.2%}",
+        file=out,
+    )
+    header = f"{'operation':<10}{'reqs':>8}{'rps':>9}{'err%':>7}{'p50':>9}{'p99':>9}{'p999':>9}{'max':>9}"
+    print(header, file=out)
+    rows = list(report["operations"].items()) + [("all", report)]
+    for name, row in rows:
+        latency = row["latency"]
+        print(
+            f"{name:<10}{row['requests']:>8}{row['throughput_rps']:>9}{row['error_rate'] * 100:>6.1f}%"
+            f"{latency['p50_ms']:>8.1f}m{latency['p99_ms']:>8.1f}m{latency['p999_ms']:>8.1f}m"
+            f"{latency['max_ms']:>8.1f}m",
+            file=out,
+        )
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Build the client, run the configured load and return the report."""
+    if args.url:
+        transport = None
+        base_url = args.url.rstrip("/")
+    else:
+        from src.core.config import settings
+        from src.main import app
+
+        # In process the limiter would throttle the generator itself
+        if not args.allow_rate_limit:
+            settings.rate_limit_enabled = False
+        if args.fake_dynamodb:
+            from src.core.database import db
+            from src.tools.fake_dynamodb import attach
+
+            attach(db, latency=args.fake_latency_ms / 1000, throttle_rate=args.fake_throttle_rate, seed=0)
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadgen.local"
+
+    if args.trace:
+        with open(args.trace, encoding="utf-8") as f:
+            trace = load_trace(f)
+        if not trace:
+            raise SystemExit(f"Trace {args.trace} has no requests")
+        bodies: Iterator[Dict[str, Any]] = itertools.cycle(trace)
+    else:
+        bodies = synthetic_bodies(args.payload_bytes)
+
+    headers = {"X-API-Key": args.api_key} if args.api_key else {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, transport=transport, limits=limits, timeout=args.timeout
+    ) as client:
+        generator = LoadGenerator(
+            client,
+            parse_mix(args.mix),
+            bodies,
+            inbox_limit=args.inbox_limit,
+            headers=headers,
+            stop_on_rate_limit=not args.allow_rate_limit,
+        )
+        started = time.perf_counter()
+        deadline = started + args.duration if args.duration else float("inf")
+        if args.rate:
+            await generator.run_open(args.rate, args.concurrency, deadline, args.requests)
+        else:
+            await generator.run_closed(args.concurrency, deadline, args.requests)
+        report = generator.report(time.perf_counter() - started)
+        if generator.aborted:
+            report["aborted"] = generator.aborted
+        return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.loadgen",
+        description="Drive create/inbox/ack load against the events API and report latency percentiles.",
+    )
+    parser.add_argument("--url", help="Base URL of a running API (default: in-process against src.main:app)")
+    parser.add_argument("--mix", default="create=70,inbox=20,ack=10", help="Operation weights")
+    parser.add_argument("--concurrency", type=int, default=16, help="Maximum requests in flight")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        help="Open-loop arrival rate in requests/s (default: closed loop, as fast as responses allow)",
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run (0 for no limit)")
+    parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    parser.add_argument("--trace", help="JSONL file of event request bodies to replay on create")
+    parser.add_argument("--payload-bytes", type=int, default=256, help="Synthetic payload size")
+    parser.add_argument("--inbox-limit", type=int, default=50, help="Inbox page size")
+    parser.add_argument("--api-key", help="Value for the X-API-Key header")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument(
+        "--fake-dynamodb",
+        action="store_true",
+        help="In-process only: back the API with the in-memory DynamoDB fake instead of a real table",
+    )
+    parser.add_argument("--fake-latency-ms", type=float, default=0.0, help="Latency added to each fake DynamoDB call")
+    parser.add_argument(
+        "--fake-throttle-rate", type=float, default=0.0, help="Fraction of fake DynamoDB calls that are throttled"
+    )
+    parser.add_argument(
+        "--allow-rate-limit",
+        action="store_true",
+        help="Keep the API's rate limiter in-process and keep going on 429s (default: disable it "
+        "in-process and stop at the first 429)",
+    )
+    args = parser.parse_args(argv)
+    if not args.duration and not args.requests:
+        parser.error("set --duration or --requests")
+    if args.fake_dynamodb and args.url:
+        parser.error("--fake-dynamodb only applies to in-process runs (without --url)")
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if "aborted" in report:
+        print(f"Stopped early: {report['aborted']}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
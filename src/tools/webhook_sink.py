@@ -0,0 +1,223 @@
+"""Local HTTP stand-in for webhook subscribers, and an end-to-end push benchmark."""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+# Reason phrases for the statuses the sink answers with
+_REASONS = {200: "OK", 400: "Bad Request", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class WebhookSink:
+    """
+    Minimal HTTP/1.1 keep-alive server that accepts webhook POSTs.
+
+    Answers every request with `status` (after `delay_ms`), or with 503 for a
+    random `fail_rate` fraction of them, and counts requests, events and
+    connections so pooling and retries can be checked from the outside.
+    """
+
+    def __init__(
+        self,
+        status: int = 200,
+        fail_rate: float = 0.0,
+        delay_ms: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize sink.
+
+        Args:
+            status: Status code for successful requests
+            fail_rate: Fraction of requests answered with 503 instead
+            delay_ms: Time taken to answer each request
+            seed: Seed for the failure decisions
+        """
+        self.status = status
+        self.fail_rate = fail_rate
+        self.delay_ms = delay_ms
+        self.requests = 0
+        self.events = 0
+        self.connections = 0
+        self.status_codes: Dict[int, int] = {}
+        self.event_ids: List[str] = []
+        self._random = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start listening; returns the URL to subscribe."""
+        self._server = await asyncio.start_server(self._serve, host, port)
+        bound_port = self._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{bound_port}/hook"
+
+    async def close(self) -> None:
+        """Stop listening."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = {}
+                for line in head.decode("latin-1").split("\r\n")[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status = await self._handle(body)
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, 'Status')}\r\n"
+                    "Content-Type: application/json\r\nContent-Length: 2\r\n\r\n{}".encode()
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle(self, body: bytes) -> int:
+        self.requests += 1
+        if self.delay_ms:
+            await asyncio.sleep(self.delay_ms / 1000)
+        status = 503 if self._random.random() < self.fail_rate else self.status
+        self.status_codes[status] = self.status_codes.get(status, 0) + 1
+        if 200 <= status < 300:
+            events = json.loads(body).get("events", [])
+            self.events += len(events)
+            self.event_ids.extend(event["id"] for event in events)
+        return status
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """Push `args.events` events to a local sink through the dispatcher and report."""
+    from src.core.config import settings
+    from src.core.database import db
+    from src.core.webhooks import WebhookDispatcher
+    from src.tools.fake_dynamodb import attach
+
+    settings.webhook_poll_interval_seconds = args.poll_interval
+    settings.webhook_backoff_base_seconds = args.backoff_base
+    attach(db, latency=args.fake_latency_ms / 1000, seed=0)
+    sink = WebhookSink(fail_rate=args.fail_rate, delay_ms=args.delay_ms, seed=0)
+    url = await sink.start()
+    subscription = db.create_subscription(
+        url, batch_size=args.batch_size, max_in_flight=args.max_in_flight
+    )
+    dispatcher = WebhookDispatcher()
+
+    async def produce() -> None:
+        started = time.perf_counter()
+        for start in range(0, args.events, 25):
+            count = min(25, args.events - start)
+            batch = [db.build_event({"sequence": start + n}, source="push") for n in range(count)]
+            await asyncio.to_thread(db.batch_put_events, batch)
+            dispatcher.wake()
+            if args.rate:
+                delay = started + (start + count) / args.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+    await dispatcher.start()
+    worker, _ = dispatcher.workers[subscription["subscription_id"]]
+    started = time.perf_counter()
+    await produce()
+    deadline = started + args.timeout
+    while worker.stats.delivered + worker.stats.failed < args.events:
+        if time.perf_counter() > deadline:
+            break
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+    report = worker.stats.summary()
+    await dispatcher.stop()
+    await sink.close()
+    report.update(
+        {
+            "events": args.events,
+            "elapsed_s": round(elapsed, 3),
+            "events_per_second": round(report["delivered"] / elapsed, 1) if elapsed else 0.0,
+            "sink_requests": sink.requests,
+            "sink_connections": sink.connections,
+            "duplicates": len(sink.event_ids) - len(set(sink.event_ids)),
+        }
+    )
+    return report
+
+
+def print_report(report: Dict[str, Any], out: Any = sys.stdout) -> None:
+    """Print a human-readable report."""
+    print(
+        f"{report['delivered']}/{report['events']} events delivered in {report['elapsed_s']}s: "
+        f"{report['events_per_second']} events/s in {report['batches']} batches, "
+        f"{report['failed']} failed, {report['retries']} retries",
+        file=out,
+    )
+    print(
+        f"sink: {report['sink_requests']} requests over {report['sink_connections']} connections, "
+        f"{report['duplicates']} duplicate events, statuses {report['status_codes']}",
+        file=out,
+    )
+    for name in ("request_latency", "delivery_lag"):
+        latency = report[name]
+        print(
+            f"{name:<16} p50 {latency['p50_ms']:.1f}ms  p99 {latency['p99_ms']:.1f}ms  "
+            f"max {latency['max_ms']:.1f}ms",
+            file=out,
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.tools.webhook_sink",
+        description=(
+            "Run a local webhook sink, or (with --bench) push events to one through the "
+            "dispatcher against the in-memory DynamoDB fake and report latency and throughput."
+        ),
+    )
+    parser.add_argument("--bench", action="store_true", help="Run the end-to-end push benchmark")
+    parser.add_argument("--port", type=int, default=9000, help="Port to serve on (without --bench)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of POSTs answered 503")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Time the sink takes per POST")
+    parser.add_argument("--events", type=int, default=5000, help="Events to push")
+    parser.add_argument("--rate", type=float, default=0.0, help="Ingest rate in events/s (0 = all at once)")
+    parser.add_argument("--batch-size", type=int, default=10, help="Events per POST")
+    parser.add_argument("--max-in-flight", type=int, default=4, help="Concurrent POSTs")
+    parser.add_argument("--poll-interval", type=float, default=0.1, help="Idle worker poll interval")
+    parser.add_argument("--backoff-base", type=float, default=0.05, help="First retry wait cap")
+    parser.add_argument("--fake-latency-ms", type=float, default=0.0, help="Latency per DynamoDB call")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Give up after this many seconds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.bench:
+        async def serve() -> None:
+            sink = WebhookSink(fail_rate=args.fail_rate, delay_ms=args.delay_ms)
+            print(f"Listening on {await sink.start(port=args.port)}", flush=True)
+            while True:
+                await asyncio.sleep(5)
+                print(f"{sink.requests} requests, {sink.events} events", flush=True)
+
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0 if report["delivered"] == report["events"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
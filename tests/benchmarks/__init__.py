@@ -0,0 +1 @@
+"""Micro-benchmarks for the request hot paths."""
@@ -0,0 +1,57 @@
+"""Benchmark command line: python -m tests.benchmarks {run,compare,list}."""
+import argparse
+import sys
+
+from tests.benchmarks import harness
+
+
+def main(argv=None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this")
+    run_parser.add_argument("--save", help="Store results as a baseline (name or .json path)")
+    run_parser.add_argument("--compare", help="Compare against a stored baseline after running")
+    run_parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing repeat")
+    run_parser.add_argument("--repeats", type=int, default=5)
+    run_parser.add_argument("--threshold", type=float, default=0.10, help="Regression threshold (0.10 = 10%%)")
+
+    compare_parser = commands.add_parser("compare", help="Compare two stored baselines")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10)
+
+    commands.add_parser("list", help="List benchmark names")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name in harness.registry():
+            print(name)
+        return 0
+
+    if args.command == "run":
+        current = harness.run(args.pattern, min_time=args.min_time, repeats=args.repeats, out=sys.stdout)
+        if args.save:
+            print(f"Saved baseline to {harness.save(current, args.save)}")
+        if not args.compare:
+            return 0
+        baseline = harness.load(args.compare)
+    else:
+        baseline, current = harness.load(args.baseline), harness.load(args.current)
+
+    rows = harness.compare(baseline, current, threshold=args.threshold)
+    regressions = [row for row in rows if row["regression"]]
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['name']:<60}{row['baseline_ns'] / 1000:>10.2f} us{row['current_ns'] / 1000:>10.2f} us"
+            f"{row['change']:>+9.1%}  {flag}"
+        )
+    print(f"{len(regressions)} regression(s) over {args.threshold:.0%} in {len(rows)} benchmarks")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
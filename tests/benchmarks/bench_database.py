@@ -0,0 +1,143 @@
+"""Benchmarks for DynamoDBClient calls against the in-process DynamoDB fake."""
+import itertools
+import json
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from src.core.cache import TTLCache
+from src.core.database import SUBSCRIPTION_PREFIX, SUBSCRIPTION_STATUS, DynamoDBClient
+from src.core.ids import new_event_id, sort_key_at, sort_key_from_id, timestamp_from_id
+from src.tools.fake_dynamodb import FakeDynamoDB, attach
+from tests.benchmarks import corpus
+from tests.benchmarks.harness import benchmark
+
+
+def _client(pending: int = 0) -> DynamoDBClient:
+    """Return a client backed by a fresh fake, with read caches disabled."""
+    client = DynamoDBClient()
+    attach(client, seed=0)
+    client.inbox_cache = TTLCache(max_size=0, ttl_seconds=0)
+    for start in range(0, pending, 25):
+        batch = [client.build_event(corpus.payload("flat", "small", seed=n)) for n in range(start, min(pending, start + 25))]
+        client.batch_put_events(batch)
+    return client
+
+
+@benchmark("database.create_event", params=[("flat", "small"), ("nested", "medium")])
+def bench_create_event(case):
+    client = _client()
+    payload = corpus.payload(*case)
+    return lambda: client.create_event(payload, source="benchmark", tags=["bench"])
+
+
+@benchmark("database.create_event_idempotent[new-key]")
+def bench_create_event_idempotent():
+    client = _client()
+    payload = corpus.payload("flat", "small")
+    keys = (f"key:benchmark:{n}" for n in itertools.count())
+    return lambda: client.create_event_idempotent(next(keys), payload, source="benchmark")
+
+
+@benchmark("database.get_pending_events[limit=50]", params=[1000, 20000])
+def bench_get_pending_events(pending):
+    client = _client(pending)
+    return lambda: client.get_pending_events(limit=50)
+
+
+@benchmark("database.create_and_acknowledge")
+def bench_create_and_acknowledge():
+    client = _client()
+    payload = corpus.payload("flat", "small")
+    return lambda: client.acknowledge_event(client.create_event(payload)["event_id"])
+
+
+def _refilled(client: DynamoDBClient, batch: int):
+    """Write `batch` fresh pending events, so every consume call has work to do."""
+    payload = corpus.payload("flat", "small")
+    return lambda: client.batch_put_events([client.build_event(payload) for _ in range(batch)])
+
+
+@benchmark("database.read_then_ack", params=[1, 10])
+def bench_read_then_ack(batch):
+    client = _client()
+    refill = _refilled(client, batch)
+
+    def consume():
+        refill()
+        events, _, _ = client.get_pending_events(limit=batch)
+        for event in events:
+            client.acknowledge_event(event["event_id"])
+
+    return consume
+
+
+@benchmark("database.receive_and_acknowledge", params=[1, 10])
+def bench_receive_and_acknowledge(batch):
+    client = _client()
+    refill = _refilled(client, batch)
+
+    def consume():
+        refill()
+        client.receive_and_acknowledge(batch)
+
+    return consume
+
+
+def _scheduled_items(count: int):
+    """Yield `count` pending items scheduled over the next week, sharing one payload."""
+    payload = corpus.payload("flat", "small")
+    start = datetime.now(timezone.utc) + timedelta(hours=1)
+    for n in range(count):
+        event_id = new_event_id()
+        yield {
+            "event_id": event_id,
+            "timestamp": timestamp_from_id(event_id),
+            "payload": payload,
+            "status": "pending",
+            "created_at": Decimal(sort_key_at(start + timedelta(milliseconds=n * 600), event_id)),
+            "priority": "normal",
+            "lane": "normal",
+        }
+
+
+@benchmark("database.due_events[limit=50]", params=["scheduled=1000", "scheduled=1000000"])
+def bench_due_events(scheduled):
+    client = DynamoDBClient()
+    fake: FakeDynamoDB = attach(client, seed=0)
+    client.inbox_cache = TTLCache(max_size=0, ttl_seconds=0)
+    fake.load(_scheduled_items(int(scheduled.split("=")[1])))
+    payload = corpus.payload("flat", "small")
+    for _ in range(0, 200, 25):
+        client.batch_put_events([client.build_event(payload) for _ in range(25)])
+    return lambda: client.get_pending_events(limit=50)
+
+
+def _filtered_subscriptions(count: int):
+    """Yield `count` subscription items with filters from the filter corpus."""
+    for pattern in corpus.filter_rules(count):
+        subscription_id = new_event_id()
+        yield {
+            "event_id": f"{SUBSCRIPTION_PREFIX}{subscription_id}",
+            "subscription_id": subscription_id,
+            "status": SUBSCRIPTION_STATUS,
+            "created_at": Decimal(sort_key_from_id(subscription_id)),
+            "url": "http://127.0.0.1/hook",
+            "filter_pattern": json.dumps(pattern, sort_keys=True),
+        }
+
+
+@benchmark("database.create_event[filter_rules]", params=["rules=0", "rules=10000"])
+def bench_create_event_filtered(rules):
+    client = DynamoDBClient()
+    fake: FakeDynamoDB = attach(client, seed=0)
+    fake.load(_filtered_subscriptions(int(rules.split("=")[1])))
+    client.subscription_rules()
+    events = [corpus.filter_event(seed) for seed in range(64)]
+    state = {"next": 0}
+
+    def create():
+        state["next"] = (state["next"] + 1) % len(events)
+        payload, source, tags = events[state["next"]]
+        return client.create_event(payload, source=source, tags=tags)
+
+    return create
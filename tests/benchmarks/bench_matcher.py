@@ -0,0 +1,66 @@
+"""Benchmarks for subscription filter matching."""
+from typing import Any, Dict, FrozenSet, List, Tuple
+
+from src.core.database import DynamoDBClient
+from src.core.matcher import RuleIndex, compile_pattern, match_value
+from tests.benchmarks import corpus
+from tests.benchmarks.harness import benchmark
+
+
+def _stored_events(count: int) -> List[Dict[str, Any]]:
+    """Filter corpus events as build_event stores them."""
+    client = DynamoDBClient()
+    events = []
+    for seed in range(count):
+        payload, source, tags = corpus.filter_event(seed)
+        events.append(client.build_event(payload, source=source, tags=tags))
+    return events
+
+
+@benchmark("matcher.match", params=["rules=100", "rules=10000"])
+def bench_match(rules):
+    patterns = corpus.filter_rules(int(rules.split("=")[1]))
+    index = RuleIndex({str(n): compile_pattern(pattern) for n, pattern in enumerate(patterns)})
+    events = _stored_events(64)
+    state = {"next": 0}
+
+    def match():
+        state["next"] = (state["next"] + 1) % len(events)
+        return index.match(events[state["next"]])
+
+    return match
+
+
+def _scan_match(rules: List[Tuple[str, Dict[str, FrozenSet[str]]]], event: Dict[str, Any]):
+    """Evaluate every compiled rule against an event: the baseline RuleIndex avoids."""
+
+    def values(node: Any, parts: List[str]) -> List[str]:
+        if isinstance(node, list):
+            return [value for element in node for value in values(element, parts)]
+        if not parts:
+            return [] if isinstance(node, dict) else [match_value(node)]
+        if not isinstance(node, dict) or parts[0] not in node:
+            return []
+        return values(node[parts[0]], parts[1:])
+
+    return {
+        rule_id
+        for rule_id, fields in rules
+        if all(
+            not allowed.isdisjoint(values(event, path.split(".")))
+            for path, allowed in fields.items()
+        )
+    }
+
+
+@benchmark("matcher.scan[rules=10000]")
+def bench_scan():
+    rules = [(str(n), compile_pattern(p)) for n, p in enumerate(corpus.filter_rules(10000))]
+    events = _stored_events(64)
+    state = {"next": 0}
+
+    def match():
+        state["next"] = (state["next"] + 1) % len(events)
+        return _scan_match(rules, events[state["next"]])
+
+    return match
@@ -0,0 +1,67 @@
+"""Benchmarks for request validation and response construction."""
+import json
+
+from src.models.event import EventItem, EventRequest, InboxResponse
+from tests.benchmarks import corpus
+from tests.benchmarks.harness import benchmark
+
+
+@benchmark("event_request.model_validate", params=corpus.cases())
+def bench_validate(case):
+    body = corpus.request_body(*case)
+    return lambda: EventRequest.model_validate(body)
+
+
+@benchmark("event_request.model_validate_json", params=corpus.cases())
+def bench_validate_json(case):
+    raw = json.dumps(corpus.request_body(*case))
+    return lambda: EventRequest.model_validate_json(raw)
+
+
+def _stored_events(case, count):
+    shape, size = case
+    return [
+        {
+            "event_id": f"01a151fa-4554-75a5-9ca6-{n:012d}",
+            "timestamp": "2026-01-01T00:00:00.000000Z",
+            "payload": corpus.payload(shape, size, seed=n),
+            "source": "benchmark",
+            "tags": ["bench"],
+            "status": "pending",
+        }
+        for n in range(count)
+    ]
+
+
+@benchmark("event_item.construct", params=corpus.cases())
+def bench_event_item(case):
+    event = _stored_events(case, 1)[0]
+    return lambda: EventItem(
+        id=event["event_id"],
+        timestamp=event["timestamp"],
+        payload=event["payload"],
+        source=event.get("source"),
+        tags=event.get("tags"),
+        status=event["status"],
+    )
+
+
+@benchmark("inbox_response.build_and_dump[50]", params=[("flat", "small"), ("nested", "medium")])
+def bench_inbox_response(case):
+    events = _stored_events(case, 50)
+
+    def build():
+        items = [
+            EventItem(
+                id=event["event_id"],
+                timestamp=event["timestamp"],
+                payload=event["payload"],
+                source=event.get("source"),
+                tags=event.get("tags"),
+                status=event["status"],
+            )
+            for event in events
+        ]
+        return InboxResponse(events=items, total=len(items), limit=50, offset=0).model_dump_json()
+
+    return build
@@ -0,0 +1,47 @@
+"""Benchmarks for payload conversion, size checks and DynamoDB marshalling."""
+import json
+
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from src.core.database import convert_floats_to_strings
+from tests.benchmarks import corpus
+from tests.benchmarks.harness import benchmark
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+@benchmark("convert_floats_to_strings", params=corpus.cases())
+def bench_convert_floats(case):
+    payload = corpus.payload(*case)
+    return lambda: convert_floats_to_strings(payload)
+
+
+@benchmark("payload_size_check", params=corpus.cases())
+def bench_size_check(case):
+    payload = corpus.payload(*case)
+    return lambda: len(json.dumps(payload).encode("utf-8"))
+
+
+def _item(case):
+    return {
+        "event_id": "01a151fa-4554-75a5-9ca6-628c1fcab35c",
+        "timestamp": "2026-01-01T00:00:00.000000Z",
+        "payload": convert_floats_to_strings(corpus.payload(*case)),
+        "status": "pending",
+        "created_at": 33857038963812336560217361916539740,
+        "source": "benchmark",
+        "tags": ["bench"],
+    }
+
+
+@benchmark("dynamodb.marshal", params=corpus.cases())
+def bench_marshal(case):
+    item = _item(case)
+    return lambda: {key: _serializer.serialize(value) for key, value in item.items()}
+
+
+@benchmark("dynamodb.unmarshal", params=corpus.cases())
+def bench_unmarshal(case):
+    wire = {key: _serializer.serialize(value) for key, value in _item(case).items()}
+    return lambda: {key: _deserializer.deserialize(value) for key, value in wire.items()}
@@ -0,0 +1,108 @@
+"""Deterministic payload corpora for benchmarks."""
+import random
+import string
+from typing import Any, Dict, List, Tuple
+
+# Approximate serialized payload sizes, in bytes
+SIZES = {"small": 256, "medium": 4096, "large": 65536}
+SHAPES = ("flat", "nested", "numeric")
+
+
+def _text(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(string.ascii_letters + string.digits, k=length))
+
+
+def _flat(rng: random.Random, size: int) -> Dict[str, Any]:
+    """Many short string fields at one level."""
+    payload: Dict[str, Any] = {}
+    while sum(len(k) + len(str(v)) + 6 for k, v in payload.items()) < size:
+        payload[f"field_{len(payload)}"] = _text(rng, 24)
+    return payload
+
+
+def _nested(rng: random.Random, size: int) -> Dict[str, Any]:
+    """Objects and arrays several levels deep, like webhook bodies."""
+    payload: Dict[str, Any] = {"order": {"id": _text(rng, 12), "items": []}}
+    items: List[Dict[str, Any]] = payload["order"]["items"]
+    while len(items) * 120 < size:
+        items.append(
+            {
+                "sku": _text(rng, 10),
+                "quantity": rng.randint(1, 20),
+                "attributes": {"color": _text(rng, 6), "tags": [_text(rng, 5) for _ in range(3)]},
+            }
+        )
+    return payload
+
+
+def _numeric(rng: random.Random, size: int) -> Dict[str, Any]:
+    """Float-heavy metrics, the worst case for float conversion."""
+    count = max(1, size // 24)
+    return {
+        "metrics": [
+            {"value": rng.random() * 1000, "ts": 1_700_000_000 + i} for i in range(count // 2)
+        ],
+        "ratio": rng.random(),
+    }
+
+
+_BUILDERS = {"flat": _flat, "nested": _nested, "numeric": _numeric}
+
+
+def payload(shape: str, size: str, seed: int = 0) -> Dict[str, Any]:
+    """Build one payload of a given shape and size class."""
+    rng = random.Random(f"{shape}:{size}:{seed}")
+    return _BUILDERS[shape](rng, SIZES[size])
+
+
+def request_body(shape: str, size: str, seed: int = 0) -> Dict[str, Any]:
+    """Build a full POST /v1/events body."""
+    return {
+        "payload": payload(shape, size, seed),
+        "source": "benchmark",
+        "tags": ["bench", shape, size],
+        "metadata": {"region": "us-east-1", "attempt": 1},
+    }
+
+
+def cases() -> List[Tuple[str, str]]:
+    """Return every (shape, size) combination."""
+    return [(shape, size) for shape in SHAPES for size in SIZES]
+
+
+# Vocabulary of the subscription filter corpus: which values rules and events draw from
+RULE_SOURCES = [f"app-{n}" for n in range(20)]
+RULE_TYPES = [f"type.{n}" for n in range(100)]
+RULE_TIERS = ["free", "silver", "gold", "platinum"]
+RULE_TAGS = [f"tag-{n}" for n in range(30)]
+
+
+def filter_rules(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Build `count` subscription filter patterns.
+
+    Each names a source and one to three payload types; some also require a
+    customer tier or a tag, so an event matches a handful of rules per 10k.
+    """
+    rng = random.Random(f"rules:{seed}")
+    rules = []
+    for _ in range(count):
+        rule: Dict[str, Any] = {
+            "source": [rng.choice(RULE_SOURCES)],
+            "payload": {"type": rng.sample(RULE_TYPES, rng.randint(1, 3))},
+        }
+        if rng.random() < 0.5:
+            rule["payload"]["customer"] = {"tier": rng.sample(RULE_TIERS, 2)}
+        if rng.random() < 0.3:
+            rule["tags"] = [rng.choice(RULE_TAGS)]
+        rules.append(rule)
+    return rules
+
+
+def filter_event(seed: int = 0) -> Tuple[Dict[str, Any], str, List[str]]:
+    """Build a (payload, source, tags) event for the filter corpus, with a nested body."""
+    rng = random.Random(f"rule-event:{seed}")
+    body = payload("nested", "medium", seed)
+    body["type"] = rng.choice(RULE_TYPES)
+    body["customer"] = {"id": _text(rng, 8), "tier": rng.choice(RULE_TIERS)}
+    return body, rng.choice(RULE_SOURCES), rng.sample(RULE_TAGS, 2)
@@ -0,0 +1,143 @@
+"""Benchmark registry, timing and baseline comparison."""
+import json
+import os
+import platform
+import statistics
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# name -> factory returning the zero-argument callable to time
+_REGISTRY: Dict[str, Callable[[], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str, params: Optional[Iterable[Any]] = None):
+    """
+    Register a benchmark factory.
+
+    The decorated function receives one parameter (when `params` is given) and
+    returns the zero-argument callable to time; setup work done in the factory
+    is not measured.
+    """
+
+    def register(factory: Callable[..., Callable[[], Any]]):
+        if params is None:
+            _REGISTRY[name] = factory
+        else:
+            for param in params:
+                label = "-".join(param) if isinstance(param, tuple) else str(param)
+                _REGISTRY[f"{name}[{label}]"] = lambda param=param: factory(param)
+        return factory
+
+    return register
+
+
+def registry() -> Dict[str, Callable[[], Callable[[], Any]]]:
+    """Return all registered benchmarks, importing the bench modules first."""
+    from tests.benchmarks import (  # noqa: F401
+        bench_database,
+        bench_matcher,
+        bench_models,
+        bench_serialization,
+    )
+
+    return dict(sorted(_REGISTRY.items()))
+
+
+def time_callable(fn: Callable[[], Any], min_time: float = 0.2, repeats: int = 5) -> Dict[str, float]:
+    """
+    Time a callable.
+
+    The loop count is calibrated so one repeat takes at least `min_time`
+    seconds; the median of the repeats is the headline figure.
+
+    Returns:
+        Nanoseconds per call (median, min) and the loop count used
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed < min_time / 10 else max(2, int(min_time / max(elapsed, 1e-9)) + 1)
+
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops * 1e9)
+    return {
+        "median_ns": statistics.median(samples),
+        "min_ns": min(samples),
+        "loops": loops,
+    }
+
+
+def run(pattern: Optional[str] = None, min_time: float = 0.2, repeats: int = 5, out=None) -> Dict[str, Any]:
+    """Run benchmarks whose name contains `pattern` and return the results document."""
+    results: Dict[str, Any] = {}
+    for name, factory in registry().items():
+        if pattern and pattern not in name:
+            continue
+        results[name] = time_callable(factory(), min_time=min_time, repeats=repeats)
+        if out is not None:
+            print(f"{name:<60}{results[name]['median_ns'] / 1000:>12.2f} us", file=out, flush=True)
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": results,
+    }
+
+
+def baseline_path(name: str) -> str:
+    """Resolve a baseline name or path to a file path."""
+    if name.endswith(".json") or os.sep in name:
+        return name
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save(document: Dict[str, Any], name: str) -> str:
+    """Write a results document as a baseline and return its path."""
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+    return path
+
+
+def load(name: str) -> Dict[str, Any]:
+    """Read a baseline."""
+    with open(baseline_path(name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compare two results documents.
+
+    Returns:
+        One row per benchmark present in both, with the relative change in
+        median time and whether it exceeds `threshold` (a regression)
+    """
+    rows = []
+    for name, result in sorted(current["results"].items()):
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = result["median_ns"] / before["median_ns"] - 1.0
+        rows.append(
+            {
+                "name": name,
+                "baseline_ns": before["median_ns"],
+                "current_ns": result["median_ns"],
+                "change": change,
+                "regression": change > threshold,
+            }
+        )
+    return rows
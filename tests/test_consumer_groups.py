@@ -0,0 +1,168 @@
+"""Consumer group poll / ack loops against the in-memory DynamoDB fake."""
+from typing import List
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.database import DynamoDBClient, db, group_ack_status, group_consumer
+from src.main import app
+from src.tools.fake_dynamodb import attach
+
+
+@pytest.fixture
+def client() -> DynamoDBClient:
+    """A DynamoDBClient backed by a fresh fake table."""
+    client = DynamoDBClient()
+    attach(client, seed=0)
+    return client
+
+
+def create(client: DynamoDBClient, count: int, source: str = "test") -> List[str]:
+    """Create `count` events numbered by their `n` payload field; returns their IDs."""
+    return [client.create_event({"n": n}, source=source)["event_id"] for n in range(count)]
+
+
+def poll(client: DynamoDBClient, group: str, limit: int, **kwargs) -> List[int]:
+    """The `n` of each event the group inbox returns."""
+    events, _ = client.get_group_events(group, limit, **kwargs)
+    return [int(event["payload"]["n"]) for event in events]
+
+
+def ack_records(client: DynamoDBClient, group: str) -> int:
+    """Number of ack records the group has left."""
+    response = client.table.query(
+        IndexName="status-created_at-index",
+        KeyConditionExpression="#status = :status",
+        ExpressionAttributeNames={"#status": "status"},
+        ExpressionAttributeValues={":status": group_ack_status(group)},
+    )
+    return response["Count"]
+
+
+def checkpoint_id(client: DynamoDBClient, group: str):
+    """ID of the event the group's checkpoint is at, or None."""
+    checkpoint = client.get_checkpoint(group_consumer(group))
+    return checkpoint and checkpoint["checkpoint_event_id"]
+
+
+def test_poll_ack_poll_drains_the_group(client):
+    ids = create(client, 10)
+    seen = []
+    for _ in range(10):
+        page, _ = client.get_group_events("billing", 3)
+        if not page:
+            break
+        seen.extend(int(event["payload"]["n"]) for event in page)
+        for event in page:
+            client.acknowledge_group_event(event["event_id"], "billing")
+
+    assert seen == list(range(10))
+    assert checkpoint_id(client, "billing") == ids[-1]
+    assert ack_records(client, "billing") == 0
+
+
+def test_out_of_order_acks_advance_the_checkpoint_once_the_gap_is_filled(client):
+    ids = create(client, 6)
+    client.acknowledge_group_event(ids[1], "billing")
+    client.acknowledge_group_event(ids[2], "billing")
+
+    assert checkpoint_id(client, "billing") is None
+    assert poll(client, "billing", 3) == [0, 3, 4]
+
+    client.acknowledge_group_event(ids[0], "billing")
+
+    assert checkpoint_id(client, "billing") == ids[2]
+    assert ack_records(client, "billing") == 0
+    assert poll(client, "billing", 3) == [3, 4, 5]
+
+
+def test_poll_reads_past_a_run_of_acked_events_longer_than_the_limit(client):
+    ids = create(client, 10)
+    for event_id in ids[1:7]:
+        client.acknowledge_group_event(event_id, "billing")
+
+    events, next_cursor = client.get_group_events("billing", 3)
+
+    assert [int(event["payload"]["n"]) for event in events] == [0, 7, 8]
+    assert poll(client, "billing", 3, after=next_cursor) == [9]
+
+
+def test_events_of_other_sources_do_not_hold_a_source_group_back(client):
+    shop, crm = [], []
+    for n in range(4):
+        shop.append(client.create_event({"n": n}, source="shop")["event_id"])
+        crm.append(client.create_event({"n": n}, source="crm")["event_id"])
+
+    for event_id in shop:
+        client.acknowledge_group_event(event_id, "webhook.shop", source="shop")
+
+    assert checkpoint_id(client, "webhook.shop") == crm[-1]
+    assert ack_records(client, "webhook.shop") == 0
+    assert poll(client, "webhook.shop", 10, source="shop") == []
+
+
+def test_acking_twice_is_rejected(client):
+    ids = create(client, 2)
+    client.acknowledge_group_event(ids[1], "billing")
+
+    with pytest.raises(ValueError, match="already acknowledged"):
+        client.acknowledge_group_event(ids[1], "billing")
+
+    client.acknowledge_group_event(ids[0], "billing")
+    with pytest.raises(ValueError, match="already acknowledged"):
+        client.acknowledge_group_event(ids[0], "billing")
+
+
+def test_batch_ack_fills_the_gap_and_advances_once(client):
+    ids = create(client, 6)
+    events, _ = client.get_group_events("billing", 6)
+    client.acknowledge_group_event(ids[0], "billing")
+
+    assert client.acknowledge_group_events(events[2:], "billing") == 4
+    assert checkpoint_id(client, "billing") == ids[0]
+    assert poll(client, "billing", 3) == [1]
+
+    assert client.acknowledge_group_events(events[:2], "billing") == 1
+    assert checkpoint_id(client, "billing") == ids[-1]
+    assert ack_records(client, "billing") == 0
+
+
+def test_checkpoint_commit_moves_over_later_acks(client):
+    ids = create(client, 5)
+    client.acknowledge_group_event(ids[3], "billing")
+
+    client.commit_group_checkpoint(ids[2], "billing")
+
+    assert checkpoint_id(client, "billing") == ids[3]
+    assert ack_records(client, "billing") == 0
+    assert poll(client, "billing", 3) == [4]
+
+
+def test_checkpoint_commit_clears_acks_it_moves_past(client):
+    create(client, 6)
+    events, _ = client.get_group_events("billing", 6)
+    client.acknowledge_group_events(events[3:], "billing")
+    later = create(client, 2)
+
+    client.commit_group_checkpoint(later[-1], "billing")
+
+    assert checkpoint_id(client, "billing") == later[-1]
+    assert ack_records(client, "billing") == 0
+
+
+def test_checkpoint_route_moves_over_later_acks():
+    attach(db, seed=0)
+    ids = create(db, 6)
+    api = TestClient(app)
+    for event_id in (ids[1], ids[4]):
+        response = api.post(f"/v1/events/{event_id}/ack", params={"group": "billing"})
+        assert response.status_code == 200
+
+    response = api.post(
+        "/v1/events/checkpoint", params={"group": "billing"}, json={"event_id": ids[3]}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["event_id"] == ids[4]
+    assert ack_records(db, "billing") == 0
+    assert poll(db, "billing", 3) == [5]
@@ -0,0 +1,72 @@
+"""Dead-lettering and redrive against the in-memory DynamoDB fake."""
+import time
+from typing import List
+
+import pytest
+
+from src.core.config import settings
+from src.core.database import DEAD_LETTER_STATUS, DynamoDBClient
+from src.tools.fake_dynamodb import attach
+
+
+@pytest.fixture
+def client(monkeypatch) -> DynamoDBClient:
+    """A DynamoDBClient backed by a fresh fake table, dead-lettering after two receives."""
+    monkeypatch.setattr(settings, "max_receive_count", 2)
+    client = DynamoDBClient()
+    attach(client, seed=0)
+    return client
+
+
+def exhaust(client: DynamoDBClient, count: int) -> List[str]:
+    """Receive `count` events and let their leases expire as often as allowed; returns IDs."""
+    ids = [client.create_event({"n": n})["event_id"] for n in range(count)]
+    for _ in range(settings.max_receive_count):
+        assert len(client.receive_events(count, visibility_timeout=0)) == count
+        time.sleep(0.002)
+    return ids
+
+
+def dead_letters(client: DynamoDBClient) -> List[str]:
+    events, _ = client.get_dead_letters(limit=100)
+    return [event["event_id"] for event in events]
+
+
+def test_events_are_dead_lettered_after_max_receives(client):
+    ids = exhaust(client, 3)
+
+    assert client.receive_events(10, visibility_timeout=30) == []
+    assert dead_letters(client) == ids
+    assert client.get_event(ids[0])["status"] == DEAD_LETTER_STATUS
+    assert client.get_event_stats()["dead_letter"] == 3
+
+
+def test_redrive_returns_dead_letters_to_pending_with_a_fresh_count(client):
+    ids = exhaust(client, 3)
+    client.receive_events(10, visibility_timeout=30)
+
+    assert client.redrive_dead_letters() == ids
+    assert dead_letters(client) == []
+    received = client.receive_events(10, visibility_timeout=30)
+    assert sorted(event["event_id"] for event in received) == ids
+    assert all(int(event["receive_count"]) == 1 for event in received)
+
+
+def test_redrive_by_id_skips_events_that_are_not_dead_lettered(client):
+    ids = exhaust(client, 2)
+    client.receive_events(10, visibility_timeout=30)
+    live = client.create_event({"n": 9})["event_id"]
+
+    assert client.redrive_dead_letters([ids[1], live]) == [ids[1]]
+    assert dead_letters(client) == ids[:1]
+
+
+def test_zero_max_receive_count_never_dead_letters(client, monkeypatch):
+    monkeypatch.setattr(settings, "max_receive_count", 0)
+    ids = [client.create_event({"n": n})["event_id"] for n in range(2)]
+    for _ in range(4):
+        client.receive_events(2, visibility_timeout=0)
+        time.sleep(0.002)
+
+    assert dead_letters(client) == []
+    assert sorted(e["event_id"] for e in client.receive_events(10, 30)) == ids
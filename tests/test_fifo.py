@@ -0,0 +1,90 @@
+"""FIFO group locks on leased receives against the in-memory DynamoDB fake."""
+import time
+from typing import List
+
+import pytest
+
+from src.core.database import FIFO_PREFIX, DynamoDBClient
+from src.tools.fake_dynamodb import attach
+
+
+@pytest.fixture
+def client() -> DynamoDBClient:
+    """A DynamoDBClient backed by a fresh fake table."""
+    client = DynamoDBClient()
+    attach(client, seed=0)
+    return client
+
+
+def create(client: DynamoDBClient, count: int, group_key: str) -> List[str]:
+    """Create `count` events in one FIFO group; returns their IDs."""
+    return [
+        client.create_event({"n": n}, group_key=group_key)["event_id"] for n in range(count)
+    ]
+
+
+def lock(client: DynamoDBClient, group_key: str):
+    """The group's lock item, or None."""
+    return client.table.get_item(Key={"event_id": f"{FIFO_PREFIX}{group_key}"}).get("Item")
+
+
+def received(client: DynamoDBClient, max_events: int, visibility_timeout: int = 30) -> List[str]:
+    return [event["event_id"] for event in client.receive_events(max_events, visibility_timeout)]
+
+
+def test_a_group_is_received_in_order_one_batch_at_a_time(client):
+    ids = create(client, 4, "order-1")
+
+    assert received(client, 2) == ids[:2]
+    assert received(client, 10) == []
+    assert lock(client, "order-1")["in_flight"] == 2
+
+
+def test_acking_the_batch_releases_the_lock(client):
+    ids = create(client, 4, "order-1")
+    first = client.receive_events(2, visibility_timeout=30)
+
+    client.acknowledge_event(first[0]["event_id"])
+    assert received(client, 10) == []
+    client.acknowledge_event(first[1]["event_id"])
+
+    assert lock(client, "order-1") is None
+    assert received(client, 10) == ids[2:]
+
+
+def test_releasing_the_batch_releases_the_lock(client):
+    ids = create(client, 2, "order-1")
+    (event,) = client.receive_events(1, visibility_timeout=30)
+
+    client.extend_lease(event["event_id"], event["lease_id"], 0)
+    time.sleep(0.002)
+
+    assert received(client, 10) == ids
+
+
+def test_an_expired_lock_is_taken_over(client):
+    ids = create(client, 2, "order-1")
+    assert received(client, 1, visibility_timeout=0) == ids[:1]
+    stale = lock(client, "order-1")["lease_id"]
+    time.sleep(0.002)
+
+    assert received(client, 10) == ids
+    assert lock(client, "order-1")["lease_id"] != stale
+
+
+def test_groups_do_not_block_each_other(client):
+    first = create(client, 2, "order-1")
+    second = create(client, 2, "order-2")
+
+    (event_id,) = received(client, 1)
+    other = second if event_id == first[0] else first
+
+    assert received(client, 10) == other
+
+
+def test_receive_and_acknowledge_drops_the_lock(client):
+    ids = create(client, 3, "order-1")
+
+    assert [event["event_id"] for event in client.receive_and_acknowledge(2)] == ids[:2]
+    assert lock(client, "order-1") is None
+    assert [event["event_id"] for event in client.receive_and_acknowledge(10)] == ids[2:]
@@ -0,0 +1,64 @@
+"""Idempotent event creation against the in-memory DynamoDB fake."""
+import pytest
+
+from src.core.config import settings
+from src.core.database import DynamoDBClient
+from src.core.idempotency import resolve_idempotency_key
+from src.tools.fake_dynamodb import attach
+
+
+@pytest.fixture
+def client() -> DynamoDBClient:
+    """A DynamoDBClient backed by a fresh fake table."""
+    client = DynamoDBClient()
+    attach(client, seed=0)
+    return client
+
+
+def test_replay_returns_the_original_event(client):
+    event, created = client.create_event_idempotent("key:a", {"n": 1})
+    replay, replayed_created = client.create_event_idempotent("key:a", {"n": 2})
+
+    assert created and not replayed_created
+    assert replay["event_id"] == event["event_id"]
+    assert replay["timestamp"] == event["timestamp"]
+    assert client.get_event(event["event_id"])["payload"] == {"n": 1}
+
+
+def test_replay_is_answered_from_the_table_without_the_in_process_cache(client):
+    event, _ = client.create_event_idempotent("key:a", {"n": 1})
+    client.idempotency_cache.clear()
+
+    replay, created = client.create_event_idempotent("key:a", {"n": 1})
+
+    assert not created
+    assert replay["event_id"] == event["event_id"]
+
+
+def test_distinct_keys_create_distinct_events(client):
+    first, _ = client.create_event_idempotent("key:a", {"n": 1})
+    second, created = client.create_event_idempotent("key:b", {"n": 1})
+
+    assert created
+    assert second["event_id"] != first["event_id"]
+
+
+def test_expired_key_is_claimed_again(client, monkeypatch):
+    monkeypatch.setattr(settings, "idempotency_ttl_seconds", -1)
+    first, _ = client.create_event_idempotent("key:a", {"n": 1})
+
+    second, created = client.create_event_idempotent("key:a", {"n": 1})
+
+    assert created
+    assert second["event_id"] != first["event_id"]
+
+
+def test_keys_are_scoped_to_the_caller_and_source():
+    keys = {
+        resolve_idempotency_key("k", {"n": 1}, source="shop", api_key="tenant-a"),
+        resolve_idempotency_key("k", {"n": 1}, source="shop", api_key="tenant-b"),
+        resolve_idempotency_key("k", {"n": 1}, source="crm", api_key="tenant-a"),
+    }
+
+    assert len(keys) == 3
+    assert "tenant-a" not in "".join(keys)
@@ -0,0 +1,82 @@
+"""Time-ordered event IDs, their sort keys and cursors."""
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from src.core import ids
+from src.core.database import DynamoDBClient
+from src.core.ids import (
+    LEGACY_SORT_KEY_LIMIT,
+    UUIDv7Generator,
+    legacy_sort_key,
+    sort_key_ceiling,
+    sort_key_floor,
+    sort_key_from_id,
+    timestamp_from_id,
+)
+from src.tools.fake_dynamodb import attach
+
+
+def frozen_clock(monkeypatch, values):
+    """Make `ids` read its wall clock from `values`, in nanoseconds."""
+    clock = iter(values)
+    monkeypatch.setattr(ids.time, "time_ns", lambda: next(clock))
+
+
+def assert_increasing(event_ids):
+    keys = [sort_key_from_id(event_id) for event_id in event_ids]
+    assert keys == sorted(set(keys))
+    assert event_ids == sorted(event_ids)
+
+
+def test_ids_and_sort_keys_increase():
+    generator = UUIDv7Generator()
+
+    assert_increasing([generator.new() for _ in range(1000)])
+
+
+def test_ids_keep_increasing_when_the_counter_overflows(monkeypatch):
+    frozen_clock(monkeypatch, [1_700_000_000_000_000_000] * 5000)
+    generator = UUIDv7Generator()
+
+    assert_increasing([generator.new() for _ in range(5000)])
+
+
+def test_ids_keep_increasing_when_the_clock_steps_back(monkeypatch):
+    frozen_clock(monkeypatch, [1_700_000_000_500_000_000, 1_700_000_000_000_000_000] * 50)
+    generator = UUIDv7Generator()
+
+    assert_increasing([generator.new() for _ in range(100)])
+
+
+def test_sort_key_bounds_hold_the_ids_of_their_millisecond():
+    event_id = ids.new_event_id()
+    moment = datetime.fromisoformat(timestamp_from_id(event_id)[:-1]).replace(tzinfo=timezone.utc)
+
+    assert sort_key_floor(moment) <= sort_key_from_id(event_id) <= sort_key_ceiling(moment)
+
+
+def test_legacy_sort_keys_sort_by_second_and_below_new_ones():
+    old = legacy_sort_key(1_600_000_000, str(uuid.uuid4()))
+    later = legacy_sort_key(1_600_000_001, str(uuid.uuid4()))
+
+    assert LEGACY_SORT_KEY_LIMIT <= old < later < sort_key_from_id(ids.new_event_id())
+
+
+def test_non_v7_ids_have_no_sort_key():
+    with pytest.raises(ValueError, match="not time-ordered"):
+        sort_key_from_id(str(uuid.uuid4()))
+
+
+def test_cursors_resolve_to_stored_sort_keys():
+    client = DynamoDBClient()
+    attach(client, seed=0)
+    event = client.create_event({"n": 1})
+
+    assert client.cursor_key(event["event_id"]) == int(event["created_at"])
+    assert client.cursor_key(str(int(event["created_at"]))) == int(event["created_at"])
+    with pytest.raises(ValueError, match="not a cursor"):
+        client.cursor_key("bad")
+    with pytest.raises(ValueError, match="not found"):
+        client.cursor_key(str(uuid.uuid4()))
@@ -0,0 +1,58 @@
+"""Bulk import against the in-memory DynamoDB fake."""
+import io
+import json
+
+import pytest
+
+from src.core.database import DynamoDBClient
+from src.tools.fake_dynamodb import attach
+from src.tools.importer import Checkpoint, Importer
+
+
+@pytest.fixture
+def client() -> DynamoDBClient:
+    """A DynamoDBClient backed by a fresh fake table."""
+    client = DynamoDBClient()
+    attach(client, seed=0)
+    return client
+
+
+def lines(count: int) -> str:
+    return "".join(json.dumps({"source": "import", "payload": {"n": n}}) + "\n" for n in range(count))
+
+
+def run(client: DynamoDBClient, text: str, checkpoint: Checkpoint) -> dict:
+    return Importer(client, workers=2, checkpoint=checkpoint, out=io.StringIO()).run(io.StringIO(text))
+
+
+def stored(client: DynamoDBClient) -> list:
+    return sorted(int(event["payload"]["n"]) for event in client.iter_events("pending"))
+
+
+def test_replayed_batches_overwrite_their_events(client, tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text(lines(60))
+    checkpoint = Checkpoint(str(tmp_path / "events.checkpoint"), str(path))
+    run(client, path.read_text(), checkpoint)
+
+    # As if the import stopped after writing everything but before recording it
+    resumed = Checkpoint(str(tmp_path / "events.checkpoint"), str(path))
+    resumed.line, resumed.done = 0, set()
+    result = run(client, path.read_text(), resumed)
+
+    assert result["written"] == 60
+    assert stored(client) == list(range(60))
+
+
+def test_imported_events_sort_after_committed_checkpoints(client, tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_text(lines(30))
+    checkpoint = Checkpoint(str(tmp_path / "events.checkpoint"), str(path))
+    checkpoint.save()
+    marker = client.create_event({"n": -1})
+    client.commit_checkpoint(marker["event_id"])
+
+    run(client, path.read_text(), Checkpoint(str(tmp_path / "events.checkpoint"), str(path)))
+
+    events, _, _ = client.get_pending_events(limit=100)
+    assert sorted(int(event["payload"]["n"]) for event in events) == list(range(30))
@@ -0,0 +1,98 @@
+"""Leased receives against the in-memory DynamoDB fake."""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from src.core.database import DynamoDBClient, LeaseError
+from src.tools.fake_dynamodb import attach
+
+
+@pytest.fixture
+def client() -> DynamoDBClient:
+    """A DynamoDBClient backed by a fresh fake table."""
+    client = DynamoDBClient()
+    attach(client, seed=0)
+    return client
+
+
+def create(client: DynamoDBClient, count: int) -> List[str]:
+    """Create `count` events numbered by their `n` payload field; returns their IDs."""
+    return [client.create_event({"n": n})["event_id"] for n in range(count)]
+
+
+def test_leased_events_are_hidden_from_other_receivers(client):
+    ids = create(client, 4)
+
+    first = client.receive_events(2, visibility_timeout=30)
+    second = client.receive_events(10, visibility_timeout=30)
+
+    assert len(first) == 2
+    assert sorted(event["event_id"] for event in first + second) == ids
+    assert all(event["lease_id"] for event in first + second)
+    assert client.receive_events(10, visibility_timeout=30) == []
+
+
+def test_concurrent_receives_never_lease_the_same_event(client):
+    ids = create(client, 60)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        batches = list(pool.map(lambda _: client.receive_events(5, 30), range(16)))
+
+    leased = [event["event_id"] for batch in batches for event in batch]
+    assert len(leased) == len(set(leased))
+    assert sorted(leased) == ids
+
+
+def test_extend_keeps_the_event_leased(client):
+    create(client, 1)
+    (event,) = client.receive_events(1, visibility_timeout=30)
+
+    extended = client.extend_lease(event["event_id"], event["lease_id"], 120)
+
+    assert int(extended["leased_until"]) > int(event["leased_until"])
+    assert client.receive_events(1, visibility_timeout=30) == []
+
+
+def test_release_makes_the_event_receivable_again(client):
+    create(client, 1)
+    (event,) = client.receive_events(1, visibility_timeout=30)
+
+    client.extend_lease(event["event_id"], event["lease_id"], 0)
+    time.sleep(0.002)
+    (again,) = client.receive_events(1, visibility_timeout=30)
+
+    assert again["event_id"] == event["event_id"]
+    assert again["lease_id"] != event["lease_id"]
+
+
+def test_expired_lease_cannot_be_extended_and_is_received_again(client):
+    create(client, 1)
+    (event,) = client.receive_events(1, visibility_timeout=0)
+    time.sleep(0.002)
+
+    with pytest.raises(LeaseError, match="expired"):
+        client.extend_lease(event["event_id"], event["lease_id"], 30)
+    (again,) = client.receive_events(1, visibility_timeout=30)
+    assert again["event_id"] == event["event_id"]
+
+
+def test_another_receivers_lease_cannot_be_extended(client):
+    create(client, 1)
+    (event,) = client.receive_events(1, visibility_timeout=30)
+
+    with pytest.raises(LeaseError, match="another receiver"):
+        client.extend_lease(event["event_id"], "not-my-lease", 30)
+
+
+def test_acknowledged_events_are_not_received(client):
+    ids = create(client, 2)
+    (event,) = client.receive_events(1, visibility_timeout=30)
+    client.acknowledge_event(event["event_id"])
+
+    with pytest.raises(ValueError, match="not pending"):
+        client.extend_lease(event["event_id"], event["lease_id"], 30)
+    assert [e["event_id"] for e in client.receive_events(10, 30)] == [
+        event_id for event_id in ids if event_id != event["event_id"]
+    ]
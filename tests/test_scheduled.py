@@ -0,0 +1,57 @@
+"""Scheduled events against the in-memory DynamoDB fake."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.database import DynamoDBClient, db
+from src.main import app
+from src.tools.fake_dynamodb import attach
+
+
+@pytest.fixture
+def client() -> DynamoDBClient:
+    """A DynamoDBClient backed by a fresh fake table."""
+    client = DynamoDBClient()
+    attach(client, seed=0)
+    return client
+
+
+def schedule(client: DynamoDBClient, delay: timedelta) -> str:
+    """Create an event delivered after `delay` from now; returns its ID."""
+    deliver_after = datetime.now(timezone.utc) + delay
+    return client.create_event({"n": 1}, deliver_after=deliver_after)["event_id"]
+
+
+def test_events_that_are_not_due_cannot_be_acknowledged(client):
+    event_id = schedule(client, timedelta(hours=1))
+
+    with pytest.raises(ValueError, match="not yet due"):
+        client.acknowledge_event(event_id)
+    with pytest.raises(ValueError, match="not yet due"):
+        client.acknowledge_group_event(event_id, "billing")
+    with pytest.raises(ValueError, match="not yet due"):
+        client.commit_checkpoint(event_id)
+    assert client.get_event(event_id)["status"] == "pending"
+
+
+def test_due_events_can_be_acknowledged(client):
+    event_id = schedule(client, timedelta(hours=-1))
+
+    assert client.acknowledge_event(event_id)["status"] == "acknowledged"
+    with pytest.raises(ValueError, match="not pending"):
+        client.acknowledge_event(event_id)
+
+
+def test_ack_route_acknowledges_due_events_only():
+    attach(db, seed=0)
+    due, scheduled = schedule(db, timedelta(hours=-1)), schedule(db, timedelta(hours=1))
+    api = TestClient(app)
+
+    response = api.post(f"/v1/events/{due}/ack")
+    assert response.status_code == 200
+    assert response.json()["status"] == "acknowledged"
+
+    response = api.post(f"/v1/events/{scheduled}/ack")
+    assert response.status_code == 400
+    assert response.json()["detail"]["error"] == "validation_error"
@@ -0,0 +1,94 @@
+"""Webhook dispatch leases against the in-memory DynamoDB fake."""
+import asyncio
+import json
+import time
+from collections import Counter
+
+import httpx
+import pytest
+
+from src.core.config import settings
+from src.core.database import DynamoDBClient, group_ack_status, group_consumer
+from src.core.webhooks import SubscriberWorker
+from src.tools.fake_dynamodb import attach
+
+
+@pytest.fixture
+def client() -> DynamoDBClient:
+    """A DynamoDBClient backed by a fresh fake table."""
+    client = DynamoDBClient()
+    attach(client, seed=0)
+    return client
+
+
+def test_one_owner_holds_a_dispatch_lease_until_it_lapses(client):
+    assert client.hold_dispatch_lease("sub", "a", 0.05)
+    assert client.hold_dispatch_lease("sub", "a", 0.05)
+    assert not client.hold_dispatch_lease("sub", "b", 30)
+
+    time.sleep(0.06)
+    assert client.hold_dispatch_lease("sub", "b", 30)
+
+    client.release_dispatch_lease("sub", "a")
+    assert not client.hold_dispatch_lease("sub", "a", 30)
+    client.release_dispatch_lease("sub", "b")
+    assert client.hold_dispatch_lease("sub", "a", 30)
+
+
+def test_only_the_lease_holder_delivers(client, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_poll_interval_seconds", 0.01)
+    monkeypatch.setattr(settings, "webhook_lease_seconds", 0.3)
+    subscription = client.create_subscription("http://sink.test/hook", batch_size=5)
+    ids = [client.create_event({"n": n})["event_id"] for n in range(20)]
+    posted = Counter()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        posted.update(event["id"] for event in json.loads(request.content)["events"])
+        return httpx.Response(200)
+
+    async def run_two_workers():
+        transport = httpx.MockTransport(handler)
+        workers = [SubscriberWorker(subscription, client, transport) for _ in range(2)]
+        tasks = [asyncio.create_task(worker.run()) for worker in workers]
+        await asyncio.sleep(0.5)
+        leased = [worker.leased for worker in workers]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return leased
+
+    leased = asyncio.run(run_two_workers())
+
+    assert sorted(leased) == [False, True]
+    assert sorted(posted) == ids
+    assert set(posted.values()) == {1}
+
+
+def test_redelivering_a_failed_batch_clears_the_acks_after_it(client, monkeypatch):
+    monkeypatch.setattr(settings, "webhook_max_attempts", 1)
+    subscription = client.create_subscription("http://sink.test/hook", batch_size=2)
+    ids = [client.create_event({"n": n})["event_id"] for n in range(6)]
+    failing = {ids[2]}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        events = json.loads(request.content)["events"]
+        return httpx.Response(503 if failing & {event["id"] for event in events} else 200)
+
+    async def deliver_twice():
+        worker = SubscriberWorker(subscription, client, httpx.MockTransport(handler))
+        assert await worker.deliver_page() is False
+        failing.clear()
+        await worker.deliver_page()
+        await worker.client.aclose()
+        return worker.group
+
+    group = asyncio.run(deliver_twice())
+
+    assert client.get_checkpoint(group_consumer(group))["checkpoint_event_id"] == ids[-1]
+    records = client.table.query(
+        IndexName="status-created_at-index",
+        KeyConditionExpression="#status = :status",
+        ExpressionAttributeNames={"#status": "status"},
+        ExpressionAttributeValues={":status": group_ack_status(group)},
+    )
+    assert records["Count"] == 0